@@ -0,0 +1,377 @@
+"""
+Benchmarks for the service-layer hot paths.
+
+The benchmarks run the services against the in-memory DynamoDB engine
+(``backend.localdb``), so results are reproducible and need no AWS account.
+Each scenario is measured at every data size (registrations per event) and
+reported with throughput, latency percentiles and DynamoDB calls per
+operation. Run from the command line with:
+
+    python -m backend.benchmarks --sizes 10,1000,100000 --output results.json
+    python -m backend.benchmarks --baseline results.json
+
+Scenarios:
+
+- ``register_user``: register a new user for an event that already has
+  ``size`` registrations and free seats
+- ``unregister_user``: unregister a registered user from a full event with a
+  waitlist, promoting the head of the waitlist
+- ``get_event_registrations``: read the counts and the first roster page of
+  an event with ``size`` registrations
+- ``list_events``: read one page of 50 events
+- ``user_registrations``: ``GET /users/{user_id}/registrations`` for a user
+  registered for ``min(size, 1000)`` events
+- ``serialize_default`` / ``serialize_fast``: turn ``size`` events into the
+  JSON body of ``GET /users/{user_id}/registrations``, revalidated against
+  the response model as FastAPI does and with ``FAST_RESPONSES``
+- ``decode_validated`` / ``decode_trusted``: turn ``size`` event items as
+  read from the table into models, with full pydantic validation and with
+  the trusted row decoder of the repositories
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, UTC
+from typing import Any, Callable, Dict, List, Optional
+
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+SCENARIOS = (
+    'register_user', 'unregister_user', 'get_event_registrations', 'list_events', 'user_registrations',
+    'serialize_default', 'serialize_fast', 'decode_validated', 'decode_trusted'
+)
+
+# Registrations written per register_users call while seeding
+SEED_CHUNK = 1000
+
+# Events a user is registered for in the user_registrations scenario
+MAX_USER_EVENTS = 1000
+
+# Every measurement takes at least this many iterations, even past its time budget
+MIN_ITERATIONS = 5
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of pre-sorted values."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Benchmark:
+    """Seeds data and measures scenarios against one local engine."""
+
+    def __init__(self, iterations: int, max_seconds: float):
+        """
+        Initialize Benchmark.
+
+        Switches the process to the local DynamoDB backend.
+
+        Args:
+            iterations: Operations to measure per scenario and size
+            max_seconds: Time budget per scenario and size
+        """
+        from .core.config import get_config, reset_dynamodb_registry
+
+        os.environ['DYNAMODB_BACKEND'] = 'local'
+        os.environ.pop('LOCAL_DYNAMODB_PATH', None)
+        reset_dynamodb_registry()
+        self.config = get_config()
+        self.table = self.config.get_table()
+        self.engine = self.config.dynamodb_resource
+        self.iterations = iterations
+        self.max_seconds = max_seconds
+        self.loop = asyncio.new_event_loop()
+
+    def run(self, coroutine: Any) -> Any:
+        """Run a coroutine to completion on the benchmark's event loop."""
+        return self.loop.run_until_complete(coroutine)
+
+    # Seeding
+
+    def create_users(self, user_ids: List[str]) -> None:
+        """Write user items directly with batched writes."""
+        with self.table.batch_writer() as writer:
+            for user_id in user_ids:
+                writer.put_item(Item={
+                    'PK': f"USER#{user_id}",
+                    'SK': f"USER#{user_id}",
+                    'userId': user_id,
+                    'name': f"Benchmark {user_id}"
+                })
+
+    def create_event(self, event_id: str, capacity: int, has_waitlist: bool = True) -> None:
+        """Create an event through the repository."""
+        from .events.repository import EventRepository
+
+        EventRepository(self.config).create({
+            'eventId': event_id,
+            'title': f"Benchmark {event_id}",
+            'description': 'Benchmark event',
+            'date': '2030-01-01',
+            'location': 'Benchmark City',
+            'capacity': capacity,
+            'organizer': 'Benchmarks',
+            'status': 'active',
+            'hasWaitlist': has_waitlist
+        })
+
+    def register(self, event_id: str, user_ids: List[str]) -> None:
+        """Register users in bulk through the registration service."""
+        from .registrations.api import get_registration_service
+
+        for start in range(0, len(user_ids), SEED_CHUNK):
+            self.run(get_registration_service().register_users(user_ids[start:start + SEED_CHUNK], event_id))
+
+    # Measurement
+
+    def measure(self, scenario: str, size: int, operation: Callable[[int], Any], iterations: int) -> Dict[str, Any]:
+        """
+        Time an operation and count its DynamoDB calls.
+
+        Args:
+            scenario: Scenario name
+            size: Data size
+            operation: Callable taking the iteration number
+            iterations: Maximum iterations
+
+        Returns:
+            Result dictionary
+        """
+        latencies = []
+        calls: collections.Counter = collections.Counter()
+        deadline = time.perf_counter() + self.max_seconds
+        for iteration in range(iterations):
+            before = collections.Counter(self.engine.operation_counts)
+            start = time.perf_counter()
+            operation(iteration)
+            latencies.append(time.perf_counter() - start)
+            calls.update(self.engine.operation_counts - before)
+            if len(latencies) >= MIN_ITERATIONS and time.perf_counter() > deadline:
+                break
+        measured = len(latencies)
+        total = sum(latencies)
+        ordered = sorted(latencies)
+        return {
+            'scenario': scenario,
+            'size': size,
+            'iterations': measured,
+            'throughput': measured / total if total else None,
+            'latency_ms': {
+                'mean': 1000 * total / measured,
+                'p50': 1000 * _percentile(ordered, 0.50),
+                'p90': 1000 * _percentile(ordered, 0.90),
+                'p99': 1000 * _percentile(ordered, 0.99),
+                'max': 1000 * ordered[-1],
+            },
+            'dynamodb_calls': {operation: count / measured for operation, count in sorted(calls.items())},
+            'dynamodb_calls_total': sum(calls.values()) / measured,
+        }
+
+    @staticmethod
+    def default_response(events: List[Any]) -> Any:
+        """
+        Build the body FastAPI makes of events returned by GET /users/{user_id}/registrations.
+
+        Like a route with a ``response_model``, the events are dumped,
+        validated against ``List[Event]`` again and only then serialized.
+        """
+        from fastapi import Response
+        from pydantic import TypeAdapter
+        from .models.event import Event
+
+        adapter = TypeAdapter(List[Event])
+        content = adapter.validate_python(adapter.dump_python(events))
+        return Response(content=adapter.dump_json(content), media_type='application/json')
+
+    def run_size(self, size: int, scenarios: List[str]) -> List[Dict[str, Any]]:
+        """
+        Seed the data for one size and run the selected scenarios.
+
+        Args:
+            size: Registrations per event
+            scenarios: Scenario names
+
+        Returns:
+            One result per scenario
+        """
+        from .core.responses import json_response
+        from .core.rows import from_row
+        from .events.api import get_event_service
+        from .models.event import Event
+        from .registrations.api import get_registration_service
+        from .users.api import get_user_registrations
+
+        iterations = self.iterations
+        results = []
+        registered = [f"b{size}-reg-{i}" for i in range(size)]
+        newcomers = [f"b{size}-new-{i}" for i in range(iterations)]
+        waitlisted = [f"b{size}-wait-{i}" for i in range(iterations)]
+        self.create_users(registered + newcomers + waitlisted)
+
+        # An event with `size` registrations and a free seat for every newcomer
+        open_event = f"bench-open-{size}"
+        self.create_event(open_event, capacity=size + iterations)
+        self.register(open_event, registered)
+
+        if 'get_event_registrations' in scenarios:
+            results.append(self.measure(
+                'get_event_registrations', size,
+                lambda i: self.run(get_registration_service().get_event_registrations(open_event)),
+                iterations
+            ))
+        if 'register_user' in scenarios:
+            results.append(self.measure(
+                'register_user', size,
+                lambda i: self.run(get_registration_service().register_user(newcomers[i], open_event)),
+                iterations
+            ))
+        if 'unregister_user' in scenarios:
+            # A full event whose waitlist is long enough for every iteration
+            full_event = f"bench-full-{size}"
+            self.create_event(full_event, capacity=size)
+            self.register(full_event, registered + waitlisted)
+            results.append(self.measure(
+                'unregister_user', size,
+                lambda i: self.run(get_registration_service().unregister_user(registered[i % size], full_event)),
+                min(iterations, size)
+            ))
+        if 'list_events' in scenarios or 'user_registrations' in scenarios:
+            user_id = f"b{size}-attendee"
+            self.create_users([user_id])
+            for i in range(min(size, MAX_USER_EVENTS)):
+                event_id = f"bench-user-{size}-{i}"
+                self.create_event(event_id, capacity=10)
+                self.register(event_id, [user_id])
+            if 'list_events' in scenarios:
+                results.append(self.measure(
+                    'list_events', size,
+                    lambda i: self.run(get_event_service().list_events(limit=50)),
+                    iterations
+                ))
+            if 'user_registrations' in scenarios:
+                results.append(self.measure(
+                    'user_registrations', size,
+                    lambda i: self.run(get_user_registrations(user_id)),
+                    iterations
+                ))
+        if {'decode_validated', 'decode_trusted', 'serialize_default', 'serialize_fast'} & set(scenarios):
+            # Copies of a stored event item, numbers as Decimal like every read
+            item = self.table.get_item(Key={'PK': f"EVENT#{open_event}", 'SK': f"EVENT#{open_event}"})['Item']
+            rows = [dict(item, eventId=f"{open_event}-{i}") for i in range(size)]
+            if 'decode_validated' in scenarios:
+                results.append(self.measure(
+                    'decode_validated', size,
+                    lambda i: [Event(**row) for row in rows],
+                    iterations
+                ))
+            if 'decode_trusted' in scenarios:
+                results.append(self.measure(
+                    'decode_trusted', size,
+                    lambda i: [from_row(Event, row) for row in rows],
+                    iterations
+                ))
+            if 'serialize_default' in scenarios or 'serialize_fast' in scenarios:
+                events = [from_row(Event, row) for row in rows]
+                if 'serialize_default' in scenarios:
+                    results.append(self.measure(
+                        'serialize_default', size,
+                        lambda i: self.default_response(events),
+                        iterations
+                    ))
+                if 'serialize_fast' in scenarios:
+                    results.append(self.measure(
+                        'serialize_fast', size,
+                        lambda i: json_response(events, List[Event]),
+                        iterations
+                    ))
+        return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> None:
+    """
+    Print throughput and median latency changes against a previous run.
+
+    Args:
+        results: Results of this run
+        baseline: Parsed JSON output of a previous run
+    """
+    previous = {(result['scenario'], result['size']): result for result in baseline.get('results', [])}
+    print(f"\n{'scenario':<26}{'size':>8}{'throughput':>14}{'p50':>10}{'calls':>10}")
+    for result in results:
+        old = previous.get((result['scenario'], result['size']))
+        if not old or not old['throughput']:
+            continue
+        throughput = 100 * (result['throughput'] / old['throughput'] - 1)
+        p50 = 100 * (result['latency_ms']['p50'] / old['latency_ms']['p50'] - 1)
+        calls = result['dynamodb_calls_total'] - old['dynamodb_calls_total']
+        print(f"{result['scenario']:<26}{result['size']:>8}{throughput:>+13.1f}%{p50:>+9.1f}%{calls:>+10.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Events API service layer against the local engine")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated registrations per event")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated scenarios out of {', '.join(SCENARIOS)}")
+    parser.add_argument('--iterations', type=int, default=200, help="Operations per scenario and size")
+    parser.add_argument('--max-seconds', type=float, default=5.0, help="Time budget per scenario and size")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Compare against the JSON output of a previous run")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    scenarios = args.scenarios.split(',')
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    benchmark = Benchmark(args.iterations, args.max_seconds)
+    results = []
+    print(f"{'scenario':<26}{'size':>8}{'ops/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'calls/op':>10}")
+    for size in sizes:
+        for result in benchmark.run_size(size, scenarios):
+            results.append(result)
+            latency = result['latency_ms']
+            print(
+                f"{result['scenario']:<26}{result['size']:>8}{result['throughput']:>10.1f}"
+                f"{latency['p50']:>10.3f}{latency['p90']:>10.3f}{latency['p99']:>10.3f}"
+                f"{result['dynamodb_calls_total']:>10.2f}"
+            )
+
+    report = {
+        'metadata': {
+            'timestamp': datetime.now(UTC).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'iterations': args.iterations,
+            'max_seconds': args.max_seconds,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Async access to the synchronous repositories.
+
+boto3 is blocking, so calling repositories directly from ``async def``
+handlers stalls the event loop for the whole DynamoDB round trip.
+``AsyncRepository`` exposes every repository method as a coroutine that runs
+on a bounded, process-wide thread pool, which lets independent lookups run
+concurrently with ``asyncio.gather``.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from .config import Config
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor(config: Config) -> ThreadPoolExecutor:
+    """
+    Get the process-wide executor for repository calls.
+
+    The pool is sized to the botocore connection pool so that worker
+    threads never queue on HTTP connections.
+
+    Args:
+        config: Application configuration (read on first use only)
+
+    Returns:
+        Shared ThreadPoolExecutor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.max_pool_connections,
+                    thread_name_prefix='dynamodb'
+                )
+    return _executor
+
+
+class AsyncRepository:
+    """Async facade over a synchronous repository."""
+
+    def __init__(self, repository: Any, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Initialize AsyncRepository.
+
+        Args:
+            repository: Synchronous repository instance (must have a ``config``)
+            executor: Executor to run calls on; defaults to the shared one
+        """
+        self.repository = repository
+        self.executor = executor or get_executor(repository.config)
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Get a repository attribute, wrapping methods as coroutines.
+
+        Args:
+            name: Attribute name
+
+        Returns:
+            An async function for methods, the plain attribute otherwise
+        """
+        attribute = getattr(self.repository, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            # Run in a copy of the current context so context variables
+            # (e.g. per-request state) are visible to the repository
+            context = contextvars.copy_context()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor,
+                functools.partial(context.run, attribute, *args, **kwargs)
+            )
+
+        return call
@@ -0,0 +1,137 @@
+"""
+Batch operation helpers for DynamoDB.
+
+BatchGetItem and BatchWriteItem accept a bounded number of keys per call and
+may hand back part of the work as unprocessed when the table is throttled.
+These helpers split the work into chunks and retry the unprocessed part with
+exponential backoff.
+"""
+
+import random
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+from .exceptions import UnprocessedItemsError
+
+
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+
+T = TypeVar('T')
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """
+    Split a sequence into consecutive chunks.
+
+    Args:
+        items: Sequence to split
+        size: Maximum chunk size
+
+    Yields:
+        Chunks of at most ``size`` elements
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def sleep_with_backoff(attempt: int, base_delay: float, max_delay: float) -> None:
+    """Sleep with full-jitter exponential backoff."""
+    time.sleep(random.uniform(0, min(max_delay, base_delay * (2 ** attempt))))
+
+
+def batch_get_items(
+    resource,
+    table_name: str,
+    keys: Iterable[Dict[str, Any]],
+    projection_expression: Optional[str] = None,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
+    max_attempts: int = 8,
+    base_delay: float = 0.05,
+    max_delay: float = 2.0
+) -> List[Dict[str, Any]]:
+    """
+    Fetch items by key with BatchGetItem.
+
+    Keys are sent in chunks of 100 and unprocessed keys are retried with
+    backoff. The order of the returned items is not defined.
+
+    Args:
+        resource: boto3 DynamoDB resource
+        table_name: DynamoDB table name
+        keys: Primary keys to fetch (must not contain duplicates)
+        projection_expression: Optional ProjectionExpression to fetch only some attributes
+        expression_attribute_names: Attribute name placeholders used in the projection
+        max_attempts: Maximum calls per chunk, including the first
+        base_delay: Initial backoff delay in seconds
+        max_delay: Maximum backoff delay in seconds
+
+    Returns:
+        Items that were found
+
+    Raises:
+        UnprocessedItemsError: If keys are still unprocessed after all attempts
+    """
+    items: List[Dict[str, Any]] = []
+    for chunk in chunked(list(keys), BATCH_GET_LIMIT):
+        table_request: Dict[str, Any] = {'Keys': list(chunk)}
+        if projection_expression:
+            table_request['ProjectionExpression'] = projection_expression
+        if expression_attribute_names:
+            table_request['ExpressionAttributeNames'] = expression_attribute_names
+        request_items = {table_name: table_request}
+        for attempt in range(max_attempts):
+            response = resource.batch_get_item(RequestItems=request_items)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            request_items = response.get('UnprocessedKeys') or {}
+            if not request_items:
+                break
+            if attempt + 1 < max_attempts:
+                sleep_with_backoff(attempt, base_delay, max_delay)
+        if request_items:
+            raise UnprocessedItemsError('BatchGetItem', len(request_items[table_name]['Keys']))
+    return items
+
+
+def batch_delete_items(
+    resource,
+    table_name: str,
+    keys: Iterable[Dict[str, Any]],
+    max_attempts: int = 8,
+    base_delay: float = 0.05,
+    max_delay: float = 2.0
+) -> int:
+    """
+    Delete items by key with BatchWriteItem.
+
+    Keys are sent in chunks of 25 and unprocessed requests are retried with
+    backoff. Deleting a key that does not exist is not an error.
+
+    Args:
+        resource: boto3 DynamoDB resource
+        table_name: DynamoDB table name
+        keys: Primary keys to delete (must not contain duplicates)
+        max_attempts: Maximum calls per chunk, including the first
+        base_delay: Initial backoff delay in seconds
+        max_delay: Maximum backoff delay in seconds
+
+    Returns:
+        Number of keys deleted
+
+    Raises:
+        UnprocessedItemsError: If requests are still unprocessed after all attempts
+    """
+    deleted = 0
+    for chunk in chunked(list(keys), BATCH_WRITE_LIMIT):
+        request_items = {table_name: [{'DeleteRequest': {'Key': key}} for key in chunk]}
+        for attempt in range(max_attempts):
+            response = resource.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems') or {}
+            if not request_items:
+                break
+            if attempt + 1 < max_attempts:
+                sleep_with_backoff(attempt, base_delay, max_delay)
+        if request_items:
+            raise UnprocessedItemsError('BatchWriteItem', len(request_items[table_name]))
+        deleted += len(chunk)
+    return deleted
@@ -0,0 +1,114 @@
+"""
+In-process caching for the Events API.
+
+``TTLCache`` is a small thread-safe LRU cache whose entries also expire
+after a fixed time-to-live. Instances are meant to be process-wide, so they
+survive across warm Lambda invocations.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry expiry and hit/miss counters."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 5.0):
+        """
+        Initialize TTLCache.
+
+        Args:
+            max_size: Maximum number of entries; the least recently used
+                entry is evicted beyond this
+            ttl_seconds: Lifetime of an entry in seconds; 0 disables caching
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (found, value); cached None values are reported as found
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, hits, misses, evictions and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hitRatio': self.hits / lookups if lookups else None,
+            }
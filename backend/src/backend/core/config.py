@@ -2,43 +2,281 @@
 Configuration module for the Events API.
 
 This module provides centralized configuration management for the application.
+
+DynamoDB resources and table handles are kept in a process-wide registry so
+that credential resolution, endpoint loading and the HTTP connection pool are
+paid once per process (i.e. once per warm Lambda container) instead of once
+per request.
+
+boto3 and botocore are imported on first use rather than at module load, so
+importing the application does not pay for them until the first DynamoDB
+access (they dominate Lambda cold-start import time).
 """
 
 import os
-import boto3
-from typing import Optional
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Tuple, Any
+
+if TYPE_CHECKING:
+    from botocore.config import Config as BotoConfig
+
+
+# Supported values of DYNAMODB_BACKEND
+DYNAMODB_BACKENDS = ('aws', 'local')
+
+_registry_lock = threading.Lock()
+_resources: Dict[Tuple[Any, ...], Any] = {}
+_tables: Dict[Tuple[Any, ...], Any] = {}
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to a default."""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to a default."""
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable, falling back to a default."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
 
 
 class Config:
     """Application configuration."""
-    
-    def __init__(self, table_name: Optional[str] = None):
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        max_pool_connections: Optional[int] = None,
+        tcp_keepalive: Optional[bool] = None,
+        max_attempts: Optional[int] = None,
+        retry_mode: Optional[str] = None
+    ):
         """
         Initialize configuration.
-        
+
         Args:
             table_name: DynamoDB table name. If None, reads from EVENTS_TABLE_NAME env var.
+            max_pool_connections: Size of the botocore HTTP connection pool.
+                If None, reads from DYNAMODB_MAX_POOL_CONNECTIONS (default 10).
+            tcp_keepalive: Enable TCP keep-alive on pooled connections.
+                If None, reads from DYNAMODB_TCP_KEEPALIVE (default true).
+            max_attempts: Maximum attempts per call, including the first one.
+                If None, reads from DYNAMODB_MAX_ATTEMPTS (default 3).
+            retry_mode: botocore retry mode ("legacy", "standard" or "adaptive").
+                If None, reads from DYNAMODB_RETRY_MODE (default "standard").
+
+        The cache settings, LAZY_ROUTERS, DYNAMODB_METRICS and the backend
+        selection (DYNAMODB_BACKEND, LOCAL_DYNAMODB_PATH) are always read
+        from the environment.
         """
         self.table_name = table_name or os.environ.get('EVENTS_TABLE_NAME', 'Events')
-        self._dynamodb_resource: Optional[boto3.resource] = None
-    
+        self.max_pool_connections = (
+            max_pool_connections
+            if max_pool_connections is not None
+            else _env_int('DYNAMODB_MAX_POOL_CONNECTIONS', 10)
+        )
+        self.tcp_keepalive = (
+            tcp_keepalive
+            if tcp_keepalive is not None
+            else _env_bool('DYNAMODB_TCP_KEEPALIVE', True)
+        )
+        self.max_attempts = (
+            max_attempts
+            if max_attempts is not None
+            else _env_int('DYNAMODB_MAX_ATTEMPTS', 3)
+        )
+        self.retry_mode = retry_mode or os.environ.get('DYNAMODB_RETRY_MODE', 'standard')
+        self.event_cache_ttl_seconds = _env_float('EVENT_CACHE_TTL_SECONDS', 5.0)
+        self.event_cache_max_size = _env_int('EVENT_CACHE_MAX_SIZE', 1024)
+        self.lazy_routers = _env_bool('LAZY_ROUTERS', False)
+        self.dynamodb_backend = os.environ.get('DYNAMODB_BACKEND', 'aws').strip().lower()
+        if self.dynamodb_backend not in DYNAMODB_BACKENDS:
+            raise ValueError(
+                f"DYNAMODB_BACKEND must be one of {', '.join(DYNAMODB_BACKENDS)}, got {self.dynamodb_backend!r}"
+            )
+        self.local_dynamodb_path = os.environ.get('LOCAL_DYNAMODB_PATH') or None
+        self.dynamodb_metrics = _env_bool('DYNAMODB_METRICS', False)
+        self.fast_responses = _env_bool('FAST_RESPONSES', False)
+        self._dynamodb_resource: Optional[Any] = None
+
     @property
-    def dynamodb_resource(self) -> boto3.resource:
+    def client_settings(self) -> Tuple[Any, ...]:
+        """
+        Get the settings that identify a shared DynamoDB resource.
+
+        Returns:
+            Hashable tuple of connection settings
+        """
+        return (
+            self.dynamodb_backend,
+            self.local_dynamodb_path,
+            self.dynamodb_metrics,
+            self.max_pool_connections,
+            self.tcp_keepalive,
+            self.max_attempts,
+            self.retry_mode
+        )
+
+    def botocore_config(self) -> "BotoConfig":
+        """
+        Build the botocore client configuration.
+
+        Returns:
+            botocore Config with pool size, keep-alive and retry policy applied
+        """
+        from botocore.config import Config as BotoConfig
+
+        return BotoConfig(
+            max_pool_connections=self.max_pool_connections,
+            tcp_keepalive=self.tcp_keepalive,
+            retries={'max_attempts': self.max_attempts, 'mode': self.retry_mode}
+        )
+
+    @property
+    def dynamodb_resource(self) -> Any:
         """
         Get DynamoDB resource, creating it if necessary.
-        
+
+        The resource is shared by every Config with the same connection
+        settings for the lifetime of the process.
+
         Returns:
-            boto3 DynamoDB resource
+            boto3 DynamoDB resource (or the local engine)
         """
         if self._dynamodb_resource is None:
-            self._dynamodb_resource = boto3.resource('dynamodb')
+            self._dynamodb_resource = get_dynamodb_resource(self)
         return self._dynamodb_resource
-    
+
     def get_table(self):
         """
         Get DynamoDB table.
-        
+
+        With DYNAMODB_METRICS enabled the handle records its calls in the
+        current request's metrics (see ``core.metrics``).
+
         Returns:
             DynamoDB Table resource
         """
-        return self.dynamodb_resource.Table(self.table_name)
+        key = self.client_settings + (self.table_name,)
+        table = _tables.get(key)
+        if table is None:
+            resource = self.dynamodb_resource
+            with _registry_lock:
+                table = _tables.get(key)
+                if table is None:
+                    if self.dynamodb_backend == 'local':
+                        # The local engine starts empty, so create the table on first use
+                        table = resource.ensure_table(**table_definition(self.table_name))
+                    else:
+                        table = resource.Table(self.table_name)
+                    if self.dynamodb_metrics:
+                        from .metrics import instrument_table
+
+                        table = instrument_table(table)
+                    _tables[key] = table
+        return table
+
+
+def table_definition(table_name: str) -> Dict[str, Any]:
+    """
+    Get the CreateTable definition of the Events table.
+
+    Mirrors the deployed table: PK/SK primary key plus the GSI1 listing
+    index and the sparse GSI2 user index (see the README). Used to create
+    the table in the local backend.
+
+    Args:
+        table_name: Table name
+
+    Returns:
+        CreateTable arguments
+    """
+    def index(name: str) -> Dict[str, Any]:
+        return {
+            'IndexName': name,
+            'KeySchema': [
+                {'AttributeName': f"{name}PK", 'KeyType': 'HASH'},
+                {'AttributeName': f"{name}SK", 'KeyType': 'RANGE'},
+            ],
+            'Projection': {'ProjectionType': 'ALL'},
+        }
+
+    return {
+        'TableName': table_name,
+        'KeySchema': [
+            {'AttributeName': 'PK', 'KeyType': 'HASH'},
+            {'AttributeName': 'SK', 'KeyType': 'RANGE'},
+        ],
+        'AttributeDefinitions': [
+            {'AttributeName': name, 'AttributeType': 'S'}
+            for name in ('PK', 'SK', 'GSI1PK', 'GSI1SK', 'GSI2PK', 'GSI2SK')
+        ],
+        'GlobalSecondaryIndexes': [index('GSI1'), index('GSI2')],
+        'BillingMode': 'PAY_PER_REQUEST',
+    }
+
+
+def get_dynamodb_resource(config: Config):
+    """
+    Get the process-wide DynamoDB resource for the given connection settings.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        boto3 DynamoDB resource, or a LocalDynamoDB for the local backend;
+        instrumented when DYNAMODB_METRICS is enabled
+    """
+    key = config.client_settings
+    resource = _resources.get(key)
+    if resource is None:
+        with _registry_lock:
+            resource = _resources.get(key)
+            if resource is None:
+                if config.dynamodb_backend == 'local':
+                    from ..localdb import LocalDynamoDB
+
+                    resource = LocalDynamoDB(config.local_dynamodb_path)
+                else:
+                    import boto3
+
+                    resource = boto3.resource('dynamodb', config=config.botocore_config())
+                if config.dynamodb_metrics:
+                    from .metrics import instrument_resource
+
+                    resource = instrument_resource(resource)
+                _resources[key] = resource
+    return resource
+
+
+def reset_dynamodb_registry() -> None:
+    """
+    Drop all shared DynamoDB resources and table handles.
+
+    Intended for tests and for re-reading configuration at runtime.
+    """
+    with _registry_lock:
+        _resources.clear()
+        _tables.clear()
+    get_config.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Get the process-wide application configuration.
+
+    Returns:
+        Shared Config instance
+    """
+    return Config()
@@ -5,6 +5,8 @@ This module defines the exception hierarchy used throughout the application
 to represent domain-specific error conditions.
 """
 
+from typing import Any, Dict, List, Optional
+
 
 class DomainException(Exception):
     """Base exception for all domain errors."""
@@ -43,6 +45,146 @@ class EntityAlreadyExistsError(DomainException):
         super().__init__(f"{entity_type} with ID {entity_id} already exists")
 
 
+class TransactionCanceledError(DomainException):
+    """Raised when a DynamoDB transaction is cancelled."""
+    
+    def __init__(self, reasons: List[Dict[str, Any]]):
+        """
+        Initialize TransactionCanceledError.
+        
+        Args:
+            reasons: One entry per transaction action, each with a "Code"
+                (e.g. "None", "ConditionalCheckFailed") and the deserialized
+                old "Item" when it was requested
+        """
+        self.reasons = reasons
+        codes = ", ".join(reason['Code'] for reason in reasons)
+        super().__init__(f"Transaction cancelled [{codes}]")
+    
+    def failed(self, index: int) -> bool:
+        """
+        Check whether the condition of a given action failed.
+        
+        Args:
+            index: Position of the action in the transaction
+            
+        Returns:
+            True if that action's condition check failed
+        """
+        return index < len(self.reasons) and self.reasons[index]['Code'] == 'ConditionalCheckFailed'
+    
+    def item(self, index: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the old item returned for a failed action.
+        
+        Args:
+            index: Position of the action in the transaction
+            
+        Returns:
+            The item as it was when the condition failed, or None
+        """
+        return self.reasons[index].get('Item') if index < len(self.reasons) else None
+    
+    def is_conflict(self) -> bool:
+        """
+        Check whether the transaction failed only because of concurrent transactions.
+        
+        Returns:
+            True if every failing action reported a TransactionConflict
+        """
+        codes = {reason['Code'] for reason in self.reasons} - {'None'}
+        return codes == {'TransactionConflict'}
+
+
+class InvalidCursorError(DomainException):
+    """Raised when a pagination cursor cannot be decoded."""
+    
+    def __init__(self, token: str):
+        """
+        Initialize InvalidCursorError.
+        
+        Args:
+            token: The pagination token that was rejected
+        """
+        self.token = token
+        super().__init__("Invalid pagination token")
+
+
+class UnprocessedItemsError(DomainException):
+    """Raised when a batch operation still has unprocessed items after all retries."""
+    
+    def __init__(self, operation: str, remaining: int):
+        """
+        Initialize UnprocessedItemsError.
+        
+        Args:
+            operation: The batch operation name (e.g., "BatchGetItem")
+            remaining: Number of keys or requests left unprocessed
+        """
+        self.operation = operation
+        self.remaining = remaining
+        super().__init__(f"{operation} left {remaining} items unprocessed after retries")
+
+
+class VersionConflictError(DomainException):
+    """Raised when a conditional write expected a version the entity no longer has."""
+    
+    def __init__(self, entity_type: str, entity_id: str, expected: int, current: int):
+        """
+        Initialize VersionConflictError.
+        
+        Args:
+            entity_type: The type of entity (e.g., "Event")
+            entity_id: The ID of the entity
+            expected: Version the write was conditioned on
+            current: Version the entity has
+        """
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.expected = expected
+        self.current = current
+        super().__init__(f"{entity_type} {entity_id} is at version {current}, not {expected}")
+
+
+class ConcurrentUpdateError(DomainException):
+    """Raised when a conditional write keeps losing to concurrent writes."""
+    
+    def __init__(self, entity_type: str, entity_id: str, attempts: int):
+        """
+        Initialize ConcurrentUpdateError.
+        
+        Args:
+            entity_type: The type of entity (e.g., "Event")
+            entity_id: The ID of the entity
+            attempts: Number of attempts made
+        """
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.attempts = attempts
+        super().__init__(
+            f"{entity_type} {entity_id} changed concurrently {attempts} times, please retry"
+        )
+
+
+class DeletionInProgressError(DomainException):
+    """Raised when an event ID is reused while the cleanup of its deletion is unfinished."""
+    
+    def __init__(self, event_id: str, status: str):
+        """
+        Initialize DeletionInProgressError.
+        
+        Args:
+            event_id: The ID of the deleted event
+            status: Status of its deletion ("running" or "failed")
+        """
+        self.event_id = event_id
+        self.status = status
+        super().__init__(
+            f"Event {event_id} is still being deleted (deletion {status}); "
+            f"retry once its deletion has completed"
+        )
+
+
 class BusinessRuleViolationError(DomainException):
     """Raised when a business rule is violated."""
     pass
@@ -62,6 +204,26 @@ class CapacityExceededError(BusinessRuleViolationError):
         super().__init__(f"Event {event_id} is full and has no waitlist")
 
 
+class CapacityBelowRegisteredError(BusinessRuleViolationError):
+    """Raised when an event's capacity would drop below its registered count."""
+    
+    def __init__(self, event_id: str, capacity: int, registered_count: int):
+        """
+        Initialize CapacityBelowRegisteredError.
+        
+        Args:
+            event_id: The ID of the event
+            capacity: The requested capacity
+            registered_count: The number of registered users
+        """
+        self.event_id = event_id
+        self.capacity = capacity
+        self.registered_count = registered_count
+        super().__init__(
+            f"Capacity {capacity} of event {event_id} is below its {registered_count} registered users"
+        )
+
+
 class AlreadyRegisteredError(BusinessRuleViolationError):
     """Raised when a user is already registered for an event."""
     
@@ -0,0 +1,267 @@
+"""
+DynamoDB call accounting per request.
+
+With ``DYNAMODB_METRICS`` enabled, ``Config`` hands out instrumented proxies
+of the table and resource handles. Every DynamoDB call made while a request
+is being served is counted, timed and sent with
+``ReturnConsumedCapacity=TOTAL``, and the consumed units are added to the
+request's ``RequestMetrics``. ``MetricsMiddleware`` creates those metrics per
+request, reports them in a ``Server-Timing`` response header and writes one
+JSON log line per invocation.
+
+The metrics live in a context variable. ``AsyncRepository`` runs repository
+calls in a copy of the caller's context, so calls made on worker threads are
+attributed to the right request.
+
+With the setting disabled neither the proxies nor the middleware are
+installed, so the call path is the plain boto3 one.
+"""
+
+import collections
+import contextvars
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Operation names by method, for each kind of handle
+TABLE_OPERATIONS = {
+    'get_item': 'GetItem',
+    'put_item': 'PutItem',
+    'update_item': 'UpdateItem',
+    'delete_item': 'DeleteItem',
+    'query': 'Query',
+    'scan': 'Scan',
+}
+RESOURCE_OPERATIONS = {
+    'batch_get_item': 'BatchGetItem',
+    'batch_write_item': 'BatchWriteItem',
+}
+CLIENT_OPERATIONS = {
+    'transact_write_items': 'TransactWriteItems',
+}
+
+# Operations whose consumed capacity is read capacity
+READ_OPERATIONS = frozenset({'GetItem', 'Query', 'Scan', 'BatchGetItem'})
+
+_current_metrics: contextvars.ContextVar[Optional['RequestMetrics']] = contextvars.ContextVar(
+    'dynamodb_request_metrics', default=None
+)
+
+
+def _capacity_units(consumed: Any) -> float:
+    """Sum the CapacityUnits of a ConsumedCapacity entry or list of entries."""
+    if not consumed:
+        return 0.0
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return sum(float(entry.get('CapacityUnits', 0)) for entry in consumed)
+
+
+class RequestMetrics:
+    """DynamoDB calls, latency and consumed capacity of one request."""
+
+    def __init__(self):
+        """Initialize empty RequestMetrics."""
+        self.counts: collections.Counter = collections.Counter()
+        self.seconds: Dict[str, float] = collections.defaultdict(float)
+        self.read_units = 0.0
+        self.write_units = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: float, consumed: Any) -> None:
+        """
+        Record one DynamoDB call.
+
+        Args:
+            operation: DynamoDB operation name, e.g. ``GetItem``
+            seconds: Call latency
+            consumed: ConsumedCapacity from the response, if any
+        """
+        units = _capacity_units(consumed)
+        with self._lock:
+            self.counts[operation] += 1
+            self.seconds[operation] += seconds
+            if operation in READ_OPERATIONS:
+                self.read_units += units
+            else:
+                self.write_units += units
+
+    @property
+    def calls(self) -> int:
+        """Total number of DynamoDB calls."""
+        return sum(self.counts.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the metrics for logging.
+
+        Returns:
+            JSON-serializable summary
+        """
+        with self._lock:
+            return {
+                'calls': sum(self.counts.values()),
+                'duration_ms': round(1000 * sum(self.seconds.values()), 3),
+                'read_capacity_units': self.read_units,
+                'write_capacity_units': self.write_units,
+                'operations': {
+                    operation: {'count': count, 'duration_ms': round(1000 * self.seconds[operation], 3)}
+                    for operation, count in sorted(self.counts.items())
+                },
+            }
+
+    def server_timing(self, total_seconds: float) -> str:
+        """
+        Format the metrics as a Server-Timing header value.
+
+        Args:
+            total_seconds: Time spent on the request so far
+
+        Returns:
+            Header value with one entry for the request, one for DynamoDB
+            overall and one per operation
+        """
+        with self._lock:
+            entries = [
+                f'app;dur={1000 * total_seconds:.3f}',
+                f'dynamodb;dur={1000 * sum(self.seconds.values()):.3f};'
+                f'desc="{sum(self.counts.values())} calls, {self.read_units:g} RCU, {self.write_units:g} WCU"',
+            ]
+            entries.extend(
+                f'ddb-{operation};dur={1000 * self.seconds[operation]:.3f};desc="{count} calls"'
+                for operation, count in sorted(self.counts.items())
+            )
+        return ', '.join(entries)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """
+    Get the metrics of the request being served.
+
+    Returns:
+        RequestMetrics, or None outside an instrumented request
+    """
+    return _current_metrics.get()
+
+
+def _instrument(method: Callable[..., Any], operation: str) -> Callable[..., Any]:
+    """Wrap a boto3 method so that calls are recorded in the current request's metrics."""
+    def call(*args: Any, **kwargs: Any) -> Any:
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return method(*args, **kwargs)
+        kwargs.setdefault('ReturnConsumedCapacity', 'TOTAL')
+        start = time.perf_counter()
+        try:
+            response = method(*args, **kwargs)
+        except Exception:
+            # Failed calls (e.g. conditional check failures) still count as calls
+            metrics.record(operation, time.perf_counter() - start, None)
+            raise
+        metrics.record(operation, time.perf_counter() - start, response.get('ConsumedCapacity'))
+        return response
+
+    return call
+
+
+class InstrumentedHandle:
+    """Proxy of a boto3 handle whose DynamoDB operations are recorded."""
+
+    def __init__(self, target: Any, operations: Dict[str, str]):
+        """
+        Initialize InstrumentedHandle.
+
+        Args:
+            target: Table, resource or client to wrap
+            operations: Operation names by method name
+        """
+        self._target = target
+        for name, operation in operations.items():
+            setattr(self, name, _instrument(getattr(target, name), operation))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+
+def instrument_table(table: Any) -> InstrumentedHandle:
+    """
+    Wrap a Table handle.
+
+    Args:
+        table: boto3 Table resource (or the local engine's table)
+
+    Returns:
+        Instrumented proxy
+    """
+    return InstrumentedHandle(table, TABLE_OPERATIONS)
+
+
+def instrument_resource(resource: Any) -> InstrumentedHandle:
+    """
+    Wrap a DynamoDB resource, including the transaction calls on ``meta.client``.
+
+    Args:
+        resource: boto3 DynamoDB resource (or the local engine)
+
+    Returns:
+        Instrumented proxy
+    """
+    instrumented = InstrumentedHandle(resource, RESOURCE_OPERATIONS)
+    instrumented.meta = InstrumentedHandle(resource.meta, {})
+    instrumented.meta.client = InstrumentedHandle(resource.meta.client, CLIENT_OPERATIONS)
+    return instrumented
+
+
+class MetricsMiddleware:
+    """ASGI middleware that collects and reports DynamoDB metrics per request."""
+
+    def __init__(self, app):
+        """
+        Initialize MetricsMiddleware.
+
+        Args:
+            app: Next ASGI application in the middleware stack
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        start = time.perf_counter()
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = metrics.server_timing(time.perf_counter() - start)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_metrics.reset(token)
+            record = {
+                'message': 'request',
+                'method': scope.get("method"),
+                'path': scope.get("path"),
+                'status': status,
+                'duration_ms': round(1000 * (time.perf_counter() - start), 3),
+                'dynamodb': metrics.to_dict(),
+            }
+            context = scope.get("aws.context")
+            if context is not None:
+                record['aws_request_id'] = getattr(context, 'aws_request_id', None)
+            logger.info(json.dumps(record))
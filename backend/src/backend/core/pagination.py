@@ -0,0 +1,122 @@
+"""
+Pagination helpers for the Events API.
+
+DynamoDB pagination state (``LastEvaluatedKey``) is exposed to clients as an
+opaque, URL-safe token so the key schema never leaks into the public API.
+"""
+
+import base64
+import binascii
+import json
+from typing import Optional, Dict, Any, List, Sequence, Union
+
+from .exceptions import InvalidCursorError
+
+
+# Position of a finished segment in a segmented scan cursor
+SEGMENT_DONE = 'done'
+
+SegmentPosition = Union[None, str, Dict[str, Any]]
+
+
+def _encode_token(value: Any) -> str:
+    """Encode a JSON value as a URL-safe token."""
+    raw = json.dumps(value, separators=(',', ':'), sort_keys=True, default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_token(token: str) -> Any:
+    """Decode a token produced by _encode_token."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise InvalidCursorError(token)
+
+
+def _is_key(value: Any) -> bool:
+    """Check that a decoded value looks like a LastEvaluatedKey."""
+    return isinstance(value, dict) and bool(value) and all(isinstance(v, str) for v in value.values())
+
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Encode a DynamoDB LastEvaluatedKey as an opaque pagination token.
+    
+    Args:
+        last_evaluated_key: LastEvaluatedKey from a Query or Scan response
+        
+    Returns:
+        URL-safe token, or None if there are no more pages
+    """
+    if not last_evaluated_key:
+        return None
+    return _encode_token(last_evaluated_key)
+
+
+def decode_cursor(
+    token: Optional[str],
+    key_attributes: Optional[Sequence[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Decode a pagination token back into a DynamoDB ExclusiveStartKey.
+    
+    Args:
+        token: Token previously returned by encode_cursor
+        key_attributes: Attributes the key must consist of, if known (the
+            table key plus the key of the index queried)
+        
+    Returns:
+        ExclusiveStartKey dictionary, or None if no token was given
+        
+    Raises:
+        InvalidCursorError: If the token is malformed or has other attributes
+    """
+    if not token:
+        return None
+    key = _decode_token(token)
+    if not _is_key(key):
+        raise InvalidCursorError(token)
+    if key_attributes is not None and set(key) != set(key_attributes):
+        raise InvalidCursorError(token)
+    return key
+
+
+def encode_segment_cursor(positions: List[SegmentPosition]) -> str:
+    """
+    Encode the progress of a segmented (parallel) scan as a resumable token.
+    
+    Args:
+        positions: Per segment, None if not started, the LastEvaluatedKey
+            of its last consumed page, or SEGMENT_DONE once finished
+        
+    Returns:
+        URL-safe token
+    """
+    return _encode_token(positions)
+
+
+def decode_segment_cursor(token: str, max_segments: Optional[int] = None) -> List[SegmentPosition]:
+    """
+    Decode a token produced by encode_segment_cursor.
+    
+    Args:
+        token: Segmented scan token
+        max_segments: Largest number of segments to accept, if limited
+            (each segment is scanned by its own worker)
+        
+    Returns:
+        Per-segment positions; the number of segments is their length
+        
+    Raises:
+        InvalidCursorError: If the token is malformed or has too many segments
+    """
+    positions = _decode_token(token)
+    if not isinstance(positions, list) or not positions:
+        raise InvalidCursorError(token)
+    if max_segments is not None and len(positions) > max_segments:
+        raise InvalidCursorError(token)
+    for position in positions:
+        if position is not None and position != SEGMENT_DONE and not _is_key(position):
+            raise InvalidCursorError(token)
+    return positions
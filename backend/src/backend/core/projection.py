@@ -0,0 +1,59 @@
+"""
+Projection helpers for repository reads.
+
+Repository read methods accept ``fields`` to fetch only some attributes of
+an item. The fields are checked against the model, mapped to a
+ProjectionExpression (every name goes through a placeholder, so reserved
+words such as ``status`` and ``date`` need no special care), and the
+projected items are turned into partial models without validation: only
+the requested fields (plus those with defaults) are set.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Sequence, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .rows import from_row
+
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+
+def projection(model: Type[BaseModel], fields: Iterable[str], required: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    Build the projection parameters of a read.
+
+    Args:
+        model: Model the items are read into
+        fields: Model fields to read
+        required: Fields the repository itself needs, always read
+
+    Returns:
+        ProjectionExpression and ExpressionAttributeNames parameters
+
+    Raises:
+        ValueError: If a field is not a field of the model
+    """
+    names = list(dict.fromkeys([*required, *fields]))
+    unknown = [name for name in names if name not in model.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown {model.__name__} fields: {', '.join(unknown)}")
+    return {
+        'ProjectionExpression': ', '.join(f"#{name}" for name in names),
+        'ExpressionAttributeNames': {f"#{name}": name for name in names},
+    }
+
+
+def to_model(model: Type[ModelT], item: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> ModelT:
+    """
+    Build a model from an item read from the table, without validation.
+
+    Args:
+        model: Model class
+        item: Item as returned by DynamoDB
+        fields: Fields the item was projected to, or None for a full item
+
+    Returns:
+        Model instance, partial for a projected item
+    """
+    return from_row(model, item, partial=fields is not None)
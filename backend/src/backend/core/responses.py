@@ -0,0 +1,144 @@
+"""
+Fast JSON responses and conditional GETs.
+
+When a route returns models, FastAPI dumps them to Python objects,
+validates those against the route's ``response_model``, and encodes the
+result again with ``jsonable_encoder`` and ``json.dumps``. For listings of
+hundreds of events built from table items moments earlier, this round trip
+dominates the CPU time of the request.
+
+With ``FAST_RESPONSES=true`` the list endpoints serialize their models
+straight to JSON bytes with pydantic-core's serializer and return them as a
+ready ``Response``, which FastAPI passes through untouched. The route keeps
+its ``response_model`` for the OpenAPI schema, and the bytes are the same
+apart from whitespace: field exclusions such as ``waitlistSeq`` still apply.
+
+Events carry a ``version`` that every change to the event or its
+registrations increments. It is sent as the ``ETag`` of the event and of
+its registration status, and a request whose ``If-None-Match`` lists the
+current tag is answered with ``304 Not Modified`` and no body. Writes take
+the tag back in ``If-Match`` to update only the version the client saw.
+"""
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    """Type adapter of a response annotation, built once per type."""
+    return TypeAdapter(annotation)
+
+
+def fast_responses_enabled() -> bool:
+    """
+    Check whether list endpoints use fast JSON responses.
+
+    Returns:
+        Value of the FAST_RESPONSES setting
+    """
+    from .config import get_config
+
+    return get_config().fast_responses
+
+
+def json_response(
+    content: Any,
+    annotation: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Serialize content to a JSON response without validating it.
+
+    Args:
+        content: Response content, instances of ``annotation``
+        annotation: Type of the content, for example ``List[Event]``
+        status_code: HTTP status code
+        headers: Extra response headers
+
+    Returns:
+        Response with the serialized body
+    """
+    return Response(
+        content=_adapter(annotation).dump_json(content),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE
+    )
+
+
+def entity_tag(version: int) -> str:
+    """
+    Build the ETag of a versioned resource.
+
+    Args:
+        version: Version of the event
+
+    Returns:
+        Quoted strong entity tag
+    """
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag.
+
+    Weak tags compare equal to the strong tag with the same value, as
+    If-None-Match uses the weak comparison.
+
+    Args:
+        if_none_match: Header value, None if absent
+        etag: Current entity tag
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return etag in (tag[2:] if tag.startswith('W/') else tag for tag in tags)
+
+
+def if_match_version(if_match: str) -> Optional[int]:
+    """
+    Parse an If-Match header into the version a write expects.
+
+    Args:
+        if_match: Header value
+
+    Returns:
+        The version of the listed entity tag, or None for ``*`` (any version)
+
+    Raises:
+        ValueError: If the header is not ``*`` or a single strong entity tag
+            of a version (weak tags never match in If-Match)
+    """
+    value = if_match.strip()
+    if value == '*':
+        return None
+    if len(value) < 3 or value[0] != '"' or value[-1] != '"' or not value[1:-1].isdigit():
+        raise ValueError(f"If-Match must be * or a single ETag of this API, got {value}")
+    return int(value[1:-1])
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build a 304 Not Modified response.
+
+    Args:
+        etag: Current entity tag
+
+    Returns:
+        Response without body
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
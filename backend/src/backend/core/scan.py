@@ -0,0 +1,144 @@
+"""
+Parallel scans of a DynamoDB table.
+
+A Scan request reads one segment of the table sequentially, a page at a
+time. Splitting the scan into ``TotalSegments`` segments lets each one be
+read by its own worker, so full-table scans for exports, migrations and
+reports scale with the number of workers instead of being bound by the
+latency of a single page chain.
+
+``parallel_scan`` streams pages as workers produce them; at most one page
+per worker is buffered, so memory does not grow with the table size.
+``scan_items`` merges all pages into a list for small scans.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from .pagination import SEGMENT_DONE, SegmentPosition
+
+
+# Seconds a worker waits for room in the page queue before re-checking for cancellation
+_PUT_TIMEOUT = 0.1
+
+
+class ScanPage(NamedTuple):
+    """
+    One page of a parallel scan.
+
+    ``last_evaluated_key`` resumes the segment after this page and is None
+    on the segment's last page.
+    """
+
+    segment: int
+    items: List[Dict[str, Any]]
+    last_evaluated_key: Optional[Dict[str, Any]]
+
+
+def _put(pages: queue.Queue, value: Any, stop: threading.Event) -> bool:
+    """Put a value on a bounded queue unless the scan is cancelled first."""
+    while not stop.is_set():
+        try:
+            pages.put(value, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def parallel_scan(
+    table,
+    total_segments: int,
+    max_workers: Optional[int] = None,
+    start_keys: Optional[Sequence[SegmentPosition]] = None,
+    **scan_kwargs: Any
+) -> Iterator[ScanPage]:
+    """
+    Scan a table in parallel segments, yielding pages as they arrive.
+
+    Each segment is read by a worker thread that follows LastEvaluatedKey
+    to the end of the segment. Pages of different segments interleave;
+    pages of one segment arrive in order. Closing the iterator early stops
+    the workers after their current page.
+
+    Args:
+        table: DynamoDB Table resource
+        total_segments: Number of segments (TotalSegments)
+        max_workers: Worker threads; defaults to one per segment
+        start_keys: Per segment, None to scan from the start, an
+            ExclusiveStartKey to resume from, or SEGMENT_DONE to skip it
+        **scan_kwargs: Further Scan parameters (FilterExpression, Limit, ...)
+
+    Yields:
+        ScanPage per page read
+
+    Raises:
+        ValueError: If total_segments or start_keys are inconsistent
+        botocore.exceptions.ClientError: If a Scan call fails
+    """
+    if total_segments < 1:
+        raise ValueError("total_segments must be at least 1")
+    if start_keys is None:
+        start_keys = [None] * total_segments
+    elif len(start_keys) != total_segments:
+        raise ValueError("start_keys must have one entry per segment")
+    pending = [segment for segment, start_key in enumerate(start_keys) if start_key != SEGMENT_DONE]
+    if not pending:
+        return
+
+    workers = min(max_workers or len(pending), len(pending))
+    pages: queue.Queue = queue.Queue(maxsize=workers)
+    stop = threading.Event()
+
+    def scan(segment: int) -> None:
+        kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=total_segments)
+        if start_keys[segment]:
+            kwargs['ExclusiveStartKey'] = start_keys[segment]
+        try:
+            while not stop.is_set():
+                response = table.scan(**kwargs)
+                last_key = response.get('LastEvaluatedKey')
+                if not _put(pages, (ScanPage(segment, response.get('Items', []), last_key), None), stop):
+                    return
+                if not last_key:
+                    return
+                kwargs['ExclusiveStartKey'] = last_key
+        except Exception as e:
+            _put(pages, (None, e), stop)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scan') as executor:
+        try:
+            for segment in pending:
+                executor.submit(scan, segment)
+            remaining = len(pending)
+            while remaining:
+                page, error = pages.get()
+                if error is not None:
+                    raise error
+                if not page.last_evaluated_key:
+                    remaining -= 1
+                yield page
+        finally:
+            # Also runs when the consumer stops early, so the workers exit
+            stop.set()
+
+
+def scan_items(table, total_segments: int, max_workers: Optional[int] = None, **scan_kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    Scan a table in parallel segments and merge the results.
+
+    Args:
+        table: DynamoDB Table resource
+        total_segments: Number of segments (TotalSegments)
+        max_workers: Worker threads; defaults to one per segment
+        **scan_kwargs: Further Scan parameters (FilterExpression, Limit, ...)
+
+    Returns:
+        All scanned items, in no particular order
+    """
+    items: List[Dict[str, Any]] = []
+    for page in parallel_scan(table, total_segments, max_workers, **scan_kwargs):
+        items.extend(page.items)
+    return items
@@ -0,0 +1,86 @@
+"""
+Transaction helpers for DynamoDB.
+
+TransactWriteItems is only available on the low-level client, which expects
+typed attribute values. ``transact_write`` accepts the same plain Python
+values the Table resource does and takes care of (de)serialization, so
+repositories can describe transactions in the style of their other calls.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+from .batch import sleep_with_backoff
+from .exceptions import TransactionCanceledError
+
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+_SERIALIZED_FIELDS = ('Item', 'Key', 'ExpressionAttributeValues')
+
+
+def _serialize_action(action: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Serialize the plain values of one TransactItems entry."""
+    serialized = {}
+    for operation, params in action.items():
+        params = dict(params)
+        for field in _SERIALIZED_FIELDS:
+            if field in params:
+                params[field] = {k: _serializer.serialize(v) for k, v in params[field].items()}
+        serialized[operation] = params
+    return serialized
+
+
+def _deserialize_item(item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Deserialize a typed item returned in a cancellation reason."""
+    if not item:
+        return None
+    return {k: _deserializer.deserialize(v) for k, v in item.items()}
+
+
+def transact_write(
+    resource,
+    actions: List[Dict[str, Dict[str, Any]]],
+    max_attempts: int = 3,
+    base_delay: float = 0.02,
+    max_delay: float = 0.5
+) -> None:
+    """
+    Execute a TransactWriteItems call.
+
+    Each action is a single-key dictionary (``Put``, ``Update``, ``Delete`` or
+    ``ConditionCheck``) whose parameters use plain Python values, exactly as
+    for the corresponding Table method plus ``TableName``. Transactions that
+    are cancelled only because of conflicting concurrent transactions are
+    retried with backoff.
+
+    Args:
+        resource: boto3 DynamoDB resource
+        actions: Transaction actions (at most 100)
+        max_attempts: Maximum calls, including the first
+        base_delay: Initial backoff delay in seconds
+        max_delay: Maximum backoff delay in seconds
+
+    Raises:
+        TransactionCanceledError: If the transaction was cancelled, e.g.
+            because a condition failed
+    """
+    transact_items = [_serialize_action(action) for action in actions]
+    for attempt in range(max_attempts):
+        try:
+            resource.meta.client.transact_write_items(TransactItems=transact_items)
+            return
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TransactionCanceledException':
+                raise
+            reasons = [
+                {'Code': reason.get('Code', 'None'), 'Item': _deserialize_item(reason.get('Item'))}
+                for reason in e.response.get('CancellationReasons', [])
+            ]
+            error = TransactionCanceledError(reasons)
+            if not error.is_conflict() or attempt + 1 >= max_attempts:
+                raise error
+            sleep_with_backoff(attempt, base_delay, max_delay)
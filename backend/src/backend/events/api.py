@@ -1,41 +1,89 @@
 """Event API handlers."""
 
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+import logging
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Header, Query, Depends, Response
+from fastapi.responses import JSONResponse
 from typing import List, Optional
 
 from .service import EventService
-from ..models.event import Event, EventCreate, EventUpdate
+from ..models.event import Event, EventCreate, EventDeletion, EventUpdate
+from ..core.responses import (
+    entity_tag,
+    etag_matches,
+    fast_responses_enabled,
+    if_match_version,
+    json_response,
+    not_modified
+)
 from ..core.exceptions import (
+    CapacityBelowRegisteredError,
+    ConcurrentUpdateError,
+    DeletionInProgressError,
     EntityNotFoundError,
     EntityAlreadyExistsError,
+    InvalidCursorError,
+    VersionConflictError,
     DomainException
 )
 
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+logger = logging.getLogger(__name__)
+
+# Response header carrying the pagination token for the next page of events
+NEXT_TOKEN_HEADER = "X-Next-Token"
+
 
 def get_event_service() -> EventService:
     """Dependency to get EventService instance."""
-    from ..core.config import Config
-    from .repository import EventRepository
+    from ..core.async_repository import AsyncRepository
+    from ..core.config import get_config
+    from ..registrations.repository import RegistrationRepository
+    from .repository import CachedEventRepository
     
-    config = Config()
-    repository = EventRepository(config)
-    return EventService(repository)
+    config = get_config()
+    repository = AsyncRepository(CachedEventRepository(config))
+    return EventService(repository, AsyncRepository(RegistrationRepository(config)))
+
+
+async def _purge_event(service: EventService, deletion: EventDeletion) -> None:
+    """Remove a deleted event's registrations after the response was sent."""
+    try:
+        await service.purge_event(deletion)
+    except Exception:
+        # The failure is recorded on the deletion; deleting again resumes it
+        logger.exception("Cleanup of deleted event %s failed", deletion.eventId)
 
 
 @router.get("", response_model=List[Event], status_code=status.HTTP_200_OK)
 async def list_events(
+    response: Response,
     status_filter: Optional[str] = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=100),
+    next_token: Optional[str] = Query(None),
     service: EventService = Depends(get_event_service)
 ):
     """
-    List all events, optionally filtered by status.
+    List one page of events, optionally filtered by status.
+    
+    When more events are available, the token for the next page is returned
+    in the X-Next-Token response header; pass it back as ``next_token``.
     """
     try:
-        events = service.list_events(status_filter)
-        return events
+        page = await service.list_events(status_filter, limit, next_token)
+        headers = {NEXT_TOKEN_HEADER: page.nextToken} if page.nextToken else None
+        if fast_responses_enabled():
+            return json_response(page.items, List[Event], headers=headers)
+        if headers:
+            response.headers.update(headers)
+        return page.items
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -46,13 +94,23 @@ async def list_events(
 @router.get("/{event_id}", response_model=Event, status_code=status.HTTP_200_OK)
 async def get_event(
     event_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     service: EventService = Depends(get_event_service)
 ):
     """
     Get a specific event by ID.
+    
+    The response carries the event version as ETag; with a matching
+    ``If-None-Match`` only the version is read and 304 is returned.
     """
     try:
-        event = service.get_event(event_id)
+        if if_none_match:
+            etag = entity_tag(await service.get_event_version(event_id))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        event = await service.get_event(event_id)
+        response.headers["ETag"] = entity_tag(event.version)
         return event
     except EntityNotFoundError as e:
         raise HTTPException(
@@ -73,12 +131,15 @@ async def create_event(
 ):
     """
     Create a new event.
+    
+    Reusing the ID of a deleted event is rejected with 409 until the
+    cleanup of that deletion has completed.
     """
     try:
         event_data = event.model_dump()
-        created_event = service.create_event(event_data)
+        created_event = await service.create_event(event_data)
         return created_event
-    except EntityAlreadyExistsError as e:
+    except (EntityAlreadyExistsError, DeletionInProgressError) as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
@@ -94,20 +155,51 @@ async def create_event(
 async def update_event(
     event_id: str,
     event: EventUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     service: EventService = Depends(get_event_service)
 ):
     """
     Update an existing event.
+    
+    Send the event's ETag as ``If-Match`` to update it only if nobody
+    changed it since it was read; otherwise 412 is returned. A capacity
+    below the number of registered users is rejected with 422; a higher
+    capacity promotes waitlisted users into the new seats. An update that
+    keeps losing to concurrent writes returns 409 and can be retried.
     """
+    try:
+        expected_version = if_match_version(if_match) if if_match else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e)
+        )
     try:
         update_data = event.model_dump(exclude_unset=True)
-        updated_event = service.update_event(event_id, update_data)
+        updated_event = await service.update_event(event_id, update_data, expected_version)
+        response.headers["ETag"] = entity_tag(updated_event.version)
         return updated_event
     except EntityNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e)
+        )
+    except CapacityBelowRegisteredError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ConcurrentUpdateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -118,14 +210,34 @@ async def update_event(
 @router.delete("/{event_id}", status_code=status.HTTP_200_OK)
 async def delete_event(
     event_id: str,
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False),
     service: EventService = Depends(get_event_service)
 ):
     """
-    Delete an event.
+    Delete an event together with its registrations and waitlist.
+    
+    With ``background=true`` the registrations are removed after the
+    response is sent (202 Accepted); follow the progress with
+    ``GET /events/{event_id}/deletion``. Deleting again resumes a cleanup
+    that failed. This only helps on a long-running server: behind Mangum
+    on Lambda the response is returned once background tasks finish, so
+    the 202 arrives after the cleanup, which the function timeout can cut
+    short. A cut-off cleanup stays "running" and deleting again resumes it.
     """
     try:
-        service.delete_event(event_id)
-        return {"message": f"Event {event_id} deleted successfully"}
+        deletion = await service.delete_event(event_id)
+        if background:
+            background_tasks.add_task(_purge_event, service, deletion)
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={
+                    "message": f"Event {event_id} deleted, removing its registrations",
+                    "deletion": deletion.model_dump(mode="json")
+                }
+            )
+        deletion = await service.purge_event(deletion)
+        return {"message": f"Event {event_id} deleted successfully", "deletedItems": deletion.deletedItems}
     except EntityNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -136,3 +248,26 @@ async def delete_event(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete event: {str(e)}"
         )
+
+
+@router.get("/{event_id}/deletion", response_model=EventDeletion, status_code=status.HTTP_200_OK)
+async def get_event_deletion(
+    event_id: str,
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Get the progress of an event deletion.
+    """
+    try:
+        return await service.get_deletion(event_id)
+    except EntityNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve event deletion: {str(e)}"
+        )
+
@@ -1,16 +1,101 @@
 """Event repository for database operations."""
 
-from typing import List, Optional, Dict, Any
+import threading
+from datetime import datetime, UTC
+from typing import List, Optional, Dict, Any, Sequence
 from botocore.exceptions import ClientError
 
+from ..core.batch import batch_delete_items, batch_get_items
+from ..core.cache import TTLCache
 from ..core.config import Config
-from ..core.exceptions import EntityNotFoundError, EntityAlreadyExistsError
-from ..models.event import Event
+from ..core.exceptions import (
+    CapacityBelowRegisteredError,
+    ConcurrentUpdateError,
+    DeletionInProgressError,
+    EntityNotFoundError,
+    EntityAlreadyExistsError,
+    InvalidCursorError,
+    TransactionCanceledError,
+    VersionConflictError
+)
+from ..core.pagination import encode_cursor, decode_cursor
+from ..core.projection import projection, to_model
+from ..core.transactions import transact_write
+from ..models.event import Event, EventDeletion, EventPage
+
+
+# Global secondary index used for event listing. Every event item carries
+# GSI1PK = "EVENT" and GSI1SK = "<status>#<date>#<eventId>", so listing is a
+# Query over one partition sorted by status then date, and a status filter is
+# a begins_with on the sort key.
+EVENT_INDEX_NAME = 'GSI1'
+EVENT_INDEX_PARTITION = 'EVENT'
+
+# Keys read per Query while deleting an event's partition; each page is
+# deleted in BatchWriteItem calls of 25 and then recorded as progress
+DELETE_PAGE_SIZE = 500
+
+
+def event_index_sort_key(status: str, date: str, event_id: str) -> str:
+    """
+    Build the listing index sort key for an event.
+    
+    Args:
+        status: Event status
+        date: Event date (YYYY-MM-DD)
+        event_id: Event ID
+        
+    Returns:
+        GSI1SK value
+    """
+    return f"{status}#{date}#{event_id}"
+
+
+def versioned(update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add the version increment to an update of an event item.
+    
+    Every write that changes an event or its registrations goes through
+    the event item and increments its ``version``, which is exposed as the
+    ETag of the event and of its registration status. Items written before
+    versions existed start from 0.
+    
+    Args:
+        update: UpdateItem parameters (or a transaction Update action's),
+            with at least UpdateExpression
+        
+    Returns:
+        The parameters with ``ADD version :version_step`` appended
+    """
+    return {
+        **update,
+        'UpdateExpression': f"{update['UpdateExpression']} ADD version :version_step",
+        'ExpressionAttributeValues': {**update.get('ExpressionAttributeValues', {}), ':version_step': 1}
+    }
+
+
+def deletion_key(event_id: str) -> Dict[str, str]:
+    """
+    Build the key of the item recording an event deletion.
+    
+    The record lives outside the event's partition, so it survives the
+    cleanup of that partition.
+    
+    Args:
+        event_id: Event ID
+        
+    Returns:
+        Primary key of the deletion record
+    """
+    return {'PK': f"DELETION#{event_id}", 'SK': f"DELETION#{event_id}"}
 
 
 class EventRepository:
     """Repository for Event entity database operations."""
     
+    # Conditional update attempts before giving up on a moving target
+    MAX_UPDATE_ATTEMPTS = 3
+    
     def __init__(self, config: Config):
         """
         Initialize EventRepository.
@@ -25,6 +110,10 @@ class EventRepository:
         """
         Create a new event.
         
+        The put is checked in the same transaction against the deletion
+        record of the ID, so an event is never created in a partition whose
+        cleanup is still running (it would be purged along with it).
+        
         Args:
             event_data: Event data dictionary
             
@@ -33,135 +122,586 @@ class EventRepository:
             
         Raises:
             EntityAlreadyExistsError: If event with same ID already exists
+            DeletionInProgressError: If a deletion of the same ID is unfinished
         """
+        event_id = event_data['eventId']
         try:
             # Add PK/SK for single-table design
             event_data['PK'] = f"EVENT#{event_data['eventId']}"
             event_data['SK'] = f"EVENT#{event_data['eventId']}"
-            
-            self.table.put_item(
-                Item=event_data,
-                ConditionExpression='attribute_not_exists(PK)'
+            event_data['GSI1PK'] = EVENT_INDEX_PARTITION
+            event_data['GSI1SK'] = event_index_sort_key(
+                event_data['status'], event_data['date'], event_data['eventId']
             )
+            # Materialized counters, maintained transactionally by registrations
+            event_data['registeredCount'] = 0
+            event_data['waitlistCount'] = 0
+            event_data['version'] = 1
+            
+            transact_write(self.config.dynamodb_resource, [
+                {'Put': {
+                    'TableName': self.config.table_name,
+                    'Item': event_data,
+                    'ConditionExpression': 'attribute_not_exists(PK)'
+                }},
+                {'ConditionCheck': {
+                    'TableName': self.config.table_name,
+                    'Key': deletion_key(event_id),
+                    'ConditionExpression': 'attribute_not_exists(PK) OR #status = :completed',
+                    'ExpressionAttributeNames': {'#status': 'status'},
+                    'ExpressionAttributeValues': {':completed': 'completed'},
+                    'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+                }}
+            ])
             return Event(**event_data)
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
-                raise EntityAlreadyExistsError("Event", event_data['eventId'])
+        except TransactionCanceledError as e:
+            if e.failed(0):
+                raise EntityAlreadyExistsError("Event", event_id)
+            if e.failed(1):
+                raise DeletionInProgressError(event_id, (e.item(1) or {}).get('status', 'running'))
             raise
     
-    def get_by_id(self, event_id: str) -> Optional[Event]:
+    def get_by_id(
+        self,
+        event_id: str,
+        consistent_read: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Event]:
         """
         Get a single event by ID.
         
         Args:
             event_id: Event ID
+            consistent_read: Use a strongly consistent read
+            fields: Only read these Event fields (partial model)
             
         Returns:
             Event object if found, None otherwise
         """
+        # The key is always projected: an event without any of the fields
+        # would otherwise read as an empty item, indistinguishable from none
+        get_kwargs: Dict[str, Any] = projection(Event, fields, required=('eventId',)) if fields else {}
         try:
             response = self.table.get_item(
                 Key={
                     'PK': f"EVENT#{event_id}",
                     'SK': f"EVENT#{event_id}"
-                }
+                },
+                ConsistentRead=consistent_read,
+                **get_kwargs
             )
             item = response.get('Item')
-            return Event(**item) if item else None
+            return to_model(Event, item, fields) if item is not None else None
         except ClientError:
             return None
     
-    def list_all(self, status_filter: Optional[str] = None) -> List[Event]:
+    def get_many(self, event_ids: List[str], fields: Optional[Sequence[str]] = None) -> List[Event]:
         """
-        List all events, optionally filtered by status.
+        Get several events by ID with batched reads.
+        
+        Uses BatchGetItem in chunks of 100, so fetching n events costs
+        O(n/100) round trips instead of n.
         
         Args:
-            status_filter: Optional status to filter by
+            event_ids: Event IDs (duplicates are allowed)
+            fields: Only read these Event fields (partial models)
             
         Returns:
-            List of Event objects
+            Found Event objects in the order of event_ids; missing events
+            are skipped
+            
+        Raises:
+            UnprocessedItemsError: If DynamoDB keeps throttling the batch
         """
-        try:
-            if status_filter:
-                response = self.table.scan(
-                    FilterExpression='begins_with(PK, :pk) AND begins_with(SK, :sk) AND #status = :status',
-                    ExpressionAttributeNames={'#status': 'status'},
-                    ExpressionAttributeValues={
-                        ':pk': 'EVENT#',
-                        ':sk': 'EVENT#',
-                        ':status': status_filter
-                    }
-                )
-            else:
-                response = self.table.scan(
-                    FilterExpression='begins_with(PK, :pk) AND begins_with(SK, :sk)',
-                    ExpressionAttributeValues={
-                        ':pk': 'EVENT#',
-                        ':sk': 'EVENT#'
-                    }
-                )
-            items = response.get('Items', [])
-            return [Event(**item) for item in items]
-        except ClientError:
+        unique_ids = list(dict.fromkeys(event_ids))
+        if not unique_ids:
             return []
+        keys = [{'PK': f"EVENT#{event_id}", 'SK': f"EVENT#{event_id}"} for event_id in unique_ids]
+        batch_kwargs: Dict[str, Any] = {}
+        if fields:
+            params = projection(Event, fields, required=('eventId',))
+            batch_kwargs = {
+                'projection_expression': params['ProjectionExpression'],
+                'expression_attribute_names': params['ExpressionAttributeNames'],
+            }
+        items = batch_get_items(self.config.dynamodb_resource, self.config.table_name, keys, **batch_kwargs)
+        events_by_id = {item['eventId']: to_model(Event, item, fields) for item in items}
+        return [events_by_id[event_id] for event_id in event_ids if event_id in events_by_id]
+    
+    def list_all(
+        self,
+        status_filter: Optional[str] = None,
+        limit: int = 50,
+        next_token: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> EventPage:
+        """
+        List one page of events, optionally filtered by status.
+        
+        Reads the listing index, so the cost is proportional to the page
+        size rather than to the size of the table.
+        
+        Args:
+            status_filter: Optional status to filter by
+            limit: Maximum number of events to return
+            next_token: Pagination token from a previous page
+            fields: Only read these Event fields (partial models)
+            
+        Returns:
+            EventPage with the events and the token for the next page
+            
+        Raises:
+            InvalidCursorError: If next_token is malformed
+            ClientError: If the query fails
+        """
+        query_kwargs: Dict[str, Any] = {
+            'IndexName': EVENT_INDEX_NAME,
+            'Limit': limit,
+        }
+        if status_filter:
+            query_kwargs['KeyConditionExpression'] = 'GSI1PK = :pk AND begins_with(GSI1SK, :sk)'
+            query_kwargs['ExpressionAttributeValues'] = {
+                ':pk': EVENT_INDEX_PARTITION,
+                ':sk': f"{status_filter}#"
+            }
+        else:
+            query_kwargs['KeyConditionExpression'] = 'GSI1PK = :pk'
+            query_kwargs['ExpressionAttributeValues'] = {':pk': EVENT_INDEX_PARTITION}
+        
+        if fields:
+            query_kwargs.update(projection(Event, fields))
+        
+        exclusive_start_key = decode_cursor(next_token, ('PK', 'SK', 'GSI1PK', 'GSI1SK'))
+        if exclusive_start_key:
+            # A key outside the queried range would fail the query itself
+            if (
+                exclusive_start_key['GSI1PK'] != EVENT_INDEX_PARTITION
+                or not exclusive_start_key['GSI1SK'].startswith(f"{status_filter}#" if status_filter else '')
+            ):
+                raise InvalidCursorError(next_token)
+            query_kwargs['ExclusiveStartKey'] = exclusive_start_key
+        
+        # Errors propagate: a failed read must not look like an empty listing
+        response = self.table.query(**query_kwargs)
+        return EventPage(
+            items=[to_model(Event, item, fields) for item in response.get('Items', [])],
+            nextToken=encode_cursor(response.get('LastEvaluatedKey'))
+        )
     
-    def update(self, event_id: str, update_data: Dict[str, Any]) -> Optional[Event]:
+    def update(
+        self,
+        event_id: str,
+        update_data: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[Event]:
         """
         Update an existing event.
         
+        The write is conditioned on the event's version when
+        ``expected_version`` is given, and a new capacity is checked against
+        the live registeredCount in the same condition, so concurrent
+        updates and registrations can neither be overwritten nor push the
+        capacity below the registered users. An update of only one of
+        status and date reads the event for the other to rebuild the listing
+        index key, and is conditioned on the version it read. Otherwise the
+        event item is only read again when the condition fails, to tell the
+        reasons apart.
+        
         Args:
             event_id: Event ID
             update_data: Dictionary of fields to update
+            expected_version: Version the event must still have, if any
             
         Returns:
             Updated Event object if found, None otherwise
+            
+        Raises:
+            VersionConflictError: If the event is no longer at expected_version
+            CapacityBelowRegisteredError: If the new capacity is below registeredCount
+            ConcurrentUpdateError: If the condition kept failing for no reason
+                that held when the event was read back
         """
         if not update_data:
-            return self.get_by_id(event_id)
+            current = self.get_by_id(event_id, consistent_read=True)
+            if current and expected_version is not None and current.version != expected_version:
+                raise VersionConflictError("Event", event_id, expected_version, current.version)
+            return current
         
-        update_expression = "SET " + ", ".join([f"#{k} = :{k}" for k in update_data.keys()])
-        expression_attribute_names = {f"#{k}": k for k in update_data.keys()}
-        expression_attribute_values = {f":{k}": v for k, v in update_data.items()}
+        # Keep the listing index key in step with status and date. When only
+        # one of them changes the other is read, and the write is conditioned
+        # on the version read so a concurrent change to it cannot slip in
+        reads_index_source = ('status' in update_data) != ('date' in update_data)
+        current = self.get_by_id(event_id, consistent_read=True) if reads_index_source else None
         
-        try:
-            response = self.table.update_item(
-                Key={
-                    'PK': f"EVENT#{event_id}",
-                    'SK': f"EVENT#{event_id}"
-                },
-                UpdateExpression=update_expression,
-                ExpressionAttributeNames=expression_attribute_names,
-                ExpressionAttributeValues=expression_attribute_values,
-                ConditionExpression='attribute_exists(PK)',
-                ReturnValues='ALL_NEW'
-            )
-            attributes = response.get('Attributes')
-            return Event(**attributes) if attributes else None
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+        for _ in range(self.MAX_UPDATE_ATTEMPTS):
+            item_data = dict(update_data)
+            conditions = ['attribute_exists(PK)']
+            expression_attribute_values: Dict[str, Any] = {}
+            if expected_version is not None:
+                expression_attribute_values[':expected_version'] = expected_version
+                conditions.append(
+                    'version = :expected_version' if expected_version
+                    else '(attribute_not_exists(version) OR version = :expected_version)'
+                )
+            if 'status' in update_data or 'date' in update_data:
+                index_source = update_data
+                if reads_index_source:
+                    if not current:
+                        return None
+                    if expected_version is not None and current.version != expected_version:
+                        raise VersionConflictError("Event", event_id, expected_version, current.version)
+                    index_source = {**current.model_dump(), **update_data}
+                    if expected_version is None:
+                        expression_attribute_values[':read_version'] = current.version
+                        conditions.append(
+                            'version = :read_version' if current.version
+                            else '(attribute_not_exists(version) OR version = :read_version)'
+                        )
+                item_data['GSI1SK'] = event_index_sort_key(index_source['status'], index_source['date'], event_id)
+            if 'capacity' in update_data:
+                # Events written before the counters existed have no registeredCount
+                conditions.append('(attribute_not_exists(registeredCount) OR registeredCount <= :capacity)')
+            
+            update_expression = "SET " + ", ".join([f"#{k} = :{k}" for k in item_data.keys()])
+            expression_attribute_names = {f"#{k}": k for k in item_data.keys()}
+            expression_attribute_values.update({f":{k}": v for k, v in item_data.items()})
+            try:
+                response = self.table.update_item(
+                    Key={
+                        'PK': f"EVENT#{event_id}",
+                        'SK': f"EVENT#{event_id}"
+                    },
+                    ExpressionAttributeNames=expression_attribute_names,
+                    ConditionExpression=' AND '.join(conditions),
+                    ReturnValues='ALL_NEW',
+                    **versioned({
+                        'UpdateExpression': update_expression,
+                        'ExpressionAttributeValues': expression_attribute_values
+                    })
+                )
+                attributes = response.get('Attributes')
+                return to_model(Event, attributes) if attributes else None
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+            current = self.get_by_id(event_id, consistent_read=True)
+            if not current:
                 return None
-            raise
+            if expected_version is not None and current.version != expected_version:
+                raise VersionConflictError("Event", event_id, expected_version, current.version)
+            if 'capacity' in update_data and update_data['capacity'] < current.registeredCount:
+                raise CapacityBelowRegisteredError(event_id, update_data['capacity'], current.registeredCount)
+            # Registrations were released or the event changed in between;
+            # the condition may hold now
+        raise ConcurrentUpdateError("Event", event_id, self.MAX_UPDATE_ATTEMPTS)
     
-    def delete(self, event_id: str) -> bool:
+    def invalidate(self, event_id: str) -> None:
         """
-        Delete an event.
+        Forget any locally held copy of an event.
+        
+        Called after writes that change the event item indirectly, such as
+        registration counter updates. The plain repository holds nothing.
         
         Args:
             event_id: Event ID
+        """
+    
+    def delete(self, deletion: EventDeletion) -> bool:
+        """
+        Delete an event item and record the start of its deletion.
+        
+        Both writes go in one transaction: the ID cannot be reused between
+        them, and a crash cannot leave the partition without a deletion
+        record to resume its cleanup from. Registrations can no longer be
+        written once the event item is gone; the rest of the partition is
+        removed by ``purge_partition``.
+        
+        Args:
+            deletion: Running deletion progress of the event
             
         Returns:
-            True if deleted, False if not found
+            True if deleted, False if not found (nothing was written)
         """
+        event_id = deletion.eventId
         try:
-            self.table.delete_item(
-                Key={
-                    'PK': f"EVENT#{event_id}",
-                    'SK': f"EVENT#{event_id}"
-                },
-                ConditionExpression='attribute_exists(PK)'
-            )
+            transact_write(self.config.dynamodb_resource, [
+                {'Delete': {
+                    'TableName': self.config.table_name,
+                    'Key': {
+                        'PK': f"EVENT#{event_id}",
+                        'SK': f"EVENT#{event_id}"
+                    },
+                    'ConditionExpression': 'attribute_exists(PK)'
+                }},
+                {'Put': {
+                    'TableName': self.config.table_name,
+                    'Item': {**deletion_key(event_id), **deletion.model_dump(exclude_none=True)}
+                }}
+            ])
             return True
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+        except TransactionCanceledError as e:
+            if e.failed(0):
                 return False
             raise
+    
+    def get_deletion(self, event_id: str) -> Optional[EventDeletion]:
+        """
+        Get the progress of an event deletion.
+        
+        Args:
+            event_id: Event ID
+            
+        Returns:
+            EventDeletion if a deletion was started, None otherwise
+        """
+        response = self.table.get_item(Key=deletion_key(event_id), ConsistentRead=True)
+        item = response.get('Item')
+        return to_model(EventDeletion, item) if item else None
+    
+    def save_deletion(self, deletion: EventDeletion) -> None:
+        """
+        Record the progress of an event deletion.
+        
+        Args:
+            deletion: Deletion progress
+        """
+        self.table.put_item(Item={**deletion_key(deletion.eventId), **deletion.model_dump(exclude_none=True)})
+    
+    def purge_partition(self, deletion: EventDeletion) -> EventDeletion:
+        """
+        Delete every item left in an event's partition.
+        
+        Registrations and waitlist entries are read a page of keys at a
+        time and deleted with BatchWriteItem; the deletion record is updated
+        after every page, then marked completed. Running it again after a
+        failure resumes where it stopped.
+        
+        Args:
+            deletion: Deletion progress to update
+            
+        Returns:
+            Completed deletion progress
+            
+        Raises:
+            UnprocessedItemsError: If deletes stay unprocessed after retries
+                (the deletion is recorded as failed)
+        """
+        deletion = deletion.model_copy(update={'status': 'running', 'error': None})
+        try:
+            while True:
+                # Deleted keys are gone from the next query, so every page
+                # starts from the beginning of the partition
+                response = self.table.query(
+                    KeyConditionExpression='PK = :pk',
+                    ExpressionAttributeValues={':pk': f"EVENT#{deletion.eventId}"},
+                    ProjectionExpression='PK, SK',
+                    ConsistentRead=True,
+                    Limit=DELETE_PAGE_SIZE
+                )
+                keys = response.get('Items', [])
+                if not keys:
+                    break
+                deleted = batch_delete_items(self.config.dynamodb_resource, self.config.table_name, keys)
+                deletion = deletion.model_copy(update={
+                    'deletedItems': deletion.deletedItems + deleted,
+                    'updatedAt': datetime.now(UTC).isoformat()
+                })
+                self.save_deletion(deletion)
+        except Exception as e:
+            self.save_deletion(deletion.model_copy(update={
+                'status': 'failed',
+                'error': str(e),
+                'updatedAt': datetime.now(UTC).isoformat()
+            }))
+            raise
+        deletion = deletion.model_copy(update={'status': 'completed', 'updatedAt': datetime.now(UTC).isoformat()})
+        self.save_deletion(deletion)
+        return deletion
+
+
+_event_cache: Optional[TTLCache] = None
+_event_cache_lock = threading.Lock()
+
+
+def get_event_cache(config: Config) -> TTLCache:
+    """
+    Get the process-wide event cache.
+    
+    Args:
+        config: Application configuration (read on first use only)
+        
+    Returns:
+        Shared TTLCache for Event objects
+    """
+    global _event_cache
+    if _event_cache is None:
+        with _event_cache_lock:
+            if _event_cache is None:
+                _event_cache = TTLCache(
+                    max_size=config.event_cache_max_size,
+                    ttl_seconds=config.event_cache_ttl_seconds
+                )
+    return _event_cache
+
+
+class CachedEventRepository(EventRepository):
+    """
+    EventRepository with a read-through cache in front of event lookups.
+    
+    Two layers are consulted: a per-instance memo, so one request never
+    fetches the same event twice, and a process-wide LRU+TTL cache shared
+    across warm invocations. Writes through this repository invalidate both.
+    Cached events may lag other processes by up to the TTL, so decisions
+    that must be exact rely on conditional writes or on
+    ``get_by_id(..., consistent_read=True)``, which always reads through.
+    """
+    
+    def __init__(self, config: Config, cache: Optional[TTLCache] = None):
+        """
+        Initialize CachedEventRepository.
+        
+        Args:
+            config: Application configuration
+            cache: Shared cache; defaults to the process-wide event cache
+        """
+        super().__init__(config)
+        self.cache = cache if cache is not None else get_event_cache(config)
+        self._memo: Dict[str, Optional[Event]] = {}
+    
+    def _remember(self, event_id: str, event: Optional[Event]) -> None:
+        """Store a lookup result in the memo and, if found, in the shared cache."""
+        self._memo[event_id] = event
+        if event is not None:
+            self.cache.set(event_id, event)
+    
+    def get_by_id(
+        self,
+        event_id: str,
+        consistent_read: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Event]:
+        """
+        Get a single event by ID, serving repeated lookups from the cache.
+        
+        Cached events are full, so they also serve projected lookups;
+        projected reads are not cached.
+        
+        Args:
+            event_id: Event ID
+            consistent_read: Bypass the cache and use a strongly consistent read
+            fields: Only read these Event fields when not cached
+            
+        Returns:
+            Event object if found, None otherwise
+        """
+        if not consistent_read:
+            if event_id in self._memo:
+                return self._memo[event_id]
+            found, event = self.cache.get(event_id)
+            if found:
+                self._memo[event_id] = event
+                return event
+        event = super().get_by_id(event_id, consistent_read, fields)
+        if fields is None:
+            self._remember(event_id, event)
+        return event
+    
+    def get_many(self, event_ids: List[str], fields: Optional[Sequence[str]] = None) -> List[Event]:
+        """
+        Get several events by ID, batch-reading only the ones not cached.
+        
+        Args:
+            event_ids: Event IDs (duplicates are allowed)
+            fields: Only read these Event fields for events not cached
+            
+        Returns:
+            Found Event objects in the order of event_ids; missing events
+            are skipped
+        """
+        events_by_id: Dict[str, Optional[Event]] = {}
+        missing = []
+        for event_id in dict.fromkeys(event_ids):
+            if event_id in self._memo:
+                events_by_id[event_id] = self._memo[event_id]
+                continue
+            found, event = self.cache.get(event_id)
+            if found:
+                events_by_id[event_id] = self._memo[event_id] = event
+            else:
+                missing.append(event_id)
+        if missing:
+            fetched = {event.eventId: event for event in super().get_many(missing, fields)}
+            for event_id in missing:
+                events_by_id[event_id] = fetched.get(event_id)
+                if fields is None:
+                    self._remember(event_id, events_by_id[event_id])
+        return [events_by_id[event_id] for event_id in event_ids if events_by_id.get(event_id)]
+    
+    def create(self, event_data: Dict[str, Any]) -> Event:
+        """
+        Create a new event and cache it.
+        
+        Args:
+            event_data: Event data dictionary
+            
+        Returns:
+            Created Event object
+            
+        Raises:
+            EntityAlreadyExistsError: If event with same ID already exists
+            DeletionInProgressError: If a deletion of the same ID is unfinished
+        """
+        event = super().create(event_data)
+        self._remember(event.eventId, event)
+        return event
+    
+    def update(
+        self,
+        event_id: str,
+        update_data: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[Event]:
+        """
+        Update an existing event and replace any cached copy.
+        
+        Args:
+            event_id: Event ID
+            update_data: Dictionary of fields to update
+            expected_version: Version the event must still have, if any
+            
+        Returns:
+            Updated Event object if found, None otherwise
+            
+        Raises:
+            VersionConflictError: If the event is no longer at expected_version
+            CapacityBelowRegisteredError: If the new capacity is below registeredCount
+            ConcurrentUpdateError: If concurrent writes kept the update from applying
+        """
+        self.invalidate(event_id)
+        event = super().update(event_id, update_data, expected_version)
+        self._remember(event_id, event)
+        return event
+    
+    def invalidate(self, event_id: str) -> None:
+        """
+        Drop an event from the memo and the shared cache.
+        
+        Args:
+            event_id: Event ID
+        """
+        self._memo.pop(event_id, None)
+        self.cache.invalidate(event_id)
+    
+    def delete(self, deletion: EventDeletion) -> bool:
+        """
+        Delete an event, record its deletion and drop any cached copy.
+        
+        Args:
+            deletion: Running deletion progress of the event
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        deleted = super().delete(deletion)
+        self.invalidate(deletion.eventId)
+        return deleted
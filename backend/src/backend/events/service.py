@@ -1,25 +1,33 @@
 """Event service for business logic."""
 
-from typing import List, Optional, Dict, Any
+from datetime import datetime, UTC
+from typing import Optional, Dict, Any
 
-from .repository import EventRepository
+from ..core.async_repository import AsyncRepository
 from ..core.exceptions import EntityNotFoundError
-from ..models.event import Event
+from ..models.event import Event, EventDeletion, EventPage
 
 
 class EventService:
     """Service for Event business logic."""
     
-    def __init__(self, event_repository: EventRepository):
+    def __init__(
+        self,
+        event_repository: AsyncRepository,
+        registration_repository: Optional[AsyncRepository] = None
+    ):
         """
         Initialize EventService.
         
         Args:
-            event_repository: Event repository instance
+            event_repository: Async Event repository
+            registration_repository: Async Registration repository, used to
+                promote waitlisted users when the capacity grows
         """
         self.event_repository = event_repository
+        self.registration_repository = registration_repository
     
-    def create_event(self, event_data: Dict[str, Any]) -> Event:
+    async def create_event(self, event_data: Dict[str, Any]) -> Event:
         """
         Create a new event.
         
@@ -31,10 +39,11 @@ class EventService:
             
         Raises:
             EntityAlreadyExistsError: If event with same ID already exists
+            DeletionInProgressError: If a deletion of the same ID is unfinished
         """
-        return self.event_repository.create(event_data)
+        return await self.event_repository.create(event_data)
     
-    def get_event(self, event_id: str) -> Event:
+    async def get_event(self, event_id: str) -> Event:
         """
         Get a specific event by ID.
         
@@ -47,52 +56,156 @@ class EventService:
         Raises:
             EntityNotFoundError: If event not found
         """
-        event = self.event_repository.get_by_id(event_id)
+        event = await self.event_repository.get_by_id(event_id)
         if not event:
             raise EntityNotFoundError("Event", event_id)
         return event
     
-    def list_events(self, status_filter: Optional[str] = None) -> List[Event]:
+    async def get_event_version(self, event_id: str) -> int:
         """
-        List all events, optionally filtered by status.
+        Get the version of an event without reading the whole event.
+        
+        Served from the event cache when it holds the event, otherwise by a
+        read projected to the version.
+        
+        Args:
+            event_id: Event ID
+            
+        Returns:
+            Event version
+            
+        Raises:
+            EntityNotFoundError: If event not found
+        """
+        event = await self.event_repository.get_by_id(event_id, fields=['version'])
+        if not event:
+            raise EntityNotFoundError("Event", event_id)
+        return event.version
+    
+    async def list_events(
+        self,
+        status_filter: Optional[str] = None,
+        limit: int = 50,
+        next_token: Optional[str] = None
+    ) -> EventPage:
+        """
+        List one page of events, optionally filtered by status.
         
         Args:
             status_filter: Optional status to filter by
+            limit: Maximum number of events to return
+            next_token: Pagination token from a previous page
             
         Returns:
-            List of Event objects
+            EventPage with the events and the token for the next page
+            
+        Raises:
+            InvalidCursorError: If next_token is malformed
         """
-        return self.event_repository.list_all(status_filter)
+        return await self.event_repository.list_all(status_filter, limit, next_token)
     
-    def update_event(self, event_id: str, update_data: Dict[str, Any]) -> Event:
+    async def update_event(
+        self,
+        event_id: str,
+        update_data: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> Event:
         """
         Update an existing event.
         
+        Raising the capacity promotes waitlisted users into the new seats,
+        in waitlist order, and the returned event reflects the promotions.
+        
         Args:
             event_id: Event ID
             update_data: Dictionary of fields to update
+            expected_version: Version the event must still have, if any
             
         Returns:
             Updated Event object
             
         Raises:
             EntityNotFoundError: If event not found
+            VersionConflictError: If the event is no longer at expected_version
+            CapacityBelowRegisteredError: If the new capacity is below registeredCount
+            ConcurrentUpdateError: If concurrent writes kept the update from applying
         """
-        updated_event = self.event_repository.update(event_id, update_data)
+        updated_event = await self.event_repository.update(event_id, update_data, expected_version)
         if not updated_event:
             raise EntityNotFoundError("Event", event_id)
+        if 'capacity' in update_data and self.registration_repository is not None:
+            free_seats = updated_event.capacity - updated_event.registeredCount
+            count = min(free_seats, updated_event.waitlistCount)
+            if count > 0:
+                promoted = await self.registration_repository.promote_many(
+                    event_id, updated_event.capacity, count
+                )
+                if promoted:
+                    await self.event_repository.invalidate(event_id)
+                    updated_event = await self.event_repository.get_by_id(
+                        event_id, consistent_read=True
+                    ) or updated_event
         return updated_event
     
-    def delete_event(self, event_id: str) -> None:
+    async def delete_event(self, event_id: str) -> EventDeletion:
         """
-        Delete an event.
+        Delete an event and start the cleanup of its registrations.
+        
+        The event item is deleted right away, in one transaction with the
+        record of the deletion; its registrations and waitlist entries are
+        removed by ``purge_event``. Deleting an event whose
+        cleanup did not complete starts the cleanup again.
         
         Args:
             event_id: Event ID
             
+        Returns:
+            Deletion progress, to pass to ``purge_event``
+            
         Raises:
             EntityNotFoundError: If event not found
         """
-        deleted = self.event_repository.delete(event_id)
-        if not deleted:
+        now = datetime.now(UTC).isoformat()
+        # A new deletion starts with the event item already deleted
+        deletion = EventDeletion(eventId=event_id, status='running', deletedItems=1, startedAt=now, updatedAt=now)
+        if await self.event_repository.delete(deletion):
+            return deletion
+        previous = await self.event_repository.get_deletion(event_id)
+        if previous is None or previous.status == 'completed':
             raise EntityNotFoundError("Event", event_id)
+        deletion = previous.model_copy(update={'status': 'running', 'error': None, 'updatedAt': now})
+        await self.event_repository.save_deletion(deletion)
+        return deletion
+    
+    async def purge_event(self, deletion: EventDeletion) -> EventDeletion:
+        """
+        Remove the registrations and waitlist entries of a deleted event.
+        
+        Args:
+            deletion: Deletion progress returned by ``delete_event``
+            
+        Returns:
+            Completed deletion progress
+            
+        Raises:
+            UnprocessedItemsError: If deletes stay unprocessed after retries
+        """
+        return await self.event_repository.purge_partition(deletion)
+    
+    async def get_deletion(self, event_id: str) -> EventDeletion:
+        """
+        Get the progress of an event deletion.
+        
+        Args:
+            event_id: Event ID
+            
+        Returns:
+            Deletion progress
+            
+        Raises:
+            EntityNotFoundError: If no deletion of the event was started
+        """
+        deletion = await self.event_repository.get_deletion(event_id)
+        if deletion is None:
+            raise EntityNotFoundError("Event deletion", event_id)
+        return deletion
@@ -0,0 +1 @@
+# Exports domain module
@@ -0,0 +1,60 @@
+"""
+Export all events and registrations as NDJSON.
+
+Run from the command line with:
+
+    python -m backend.exports --output export.ndjson.gz --gzip --segments 8
+
+An interrupted export is resumed by passing the value of the last ``cursor``
+line written; the output file is then appended to (concatenated gzip members
+are still a valid gzip file).
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from ..core.config import get_config
+from ..core.exceptions import InvalidCursorError
+from .repository import ExportRepository
+from .service import ExportService, DEFAULT_SEGMENTS, MAX_SEGMENTS, gzip_chunks
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Export events and registrations as NDJSON")
+    parser.add_argument('--output', help="File to write (default: standard output)")
+    parser.add_argument('--segments', type=int, default=DEFAULT_SEGMENTS,
+                        help=f"Parallel scan segments, 1 to {MAX_SEGMENTS}")
+    parser.add_argument('--cursor', help="Resume after this cursor, appending to the output")
+    parser.add_argument('--gzip', action='store_true', help="Gzip the output")
+    args = parser.parse_args(argv)
+    if not 1 <= args.segments <= MAX_SEGMENTS:
+        parser.error(f"--segments must be between 1 and {MAX_SEGMENTS}")
+
+    try:
+        chunks = ExportService(ExportRepository(get_config())).export(args.segments, args.cursor)
+    except InvalidCursorError:
+        parser.error("--cursor is not a valid export cursor")
+    data = gzip_chunks(chunks) if args.gzip else (chunk.encode('utf-8') for chunk in chunks)
+    if args.output:
+        with open(args.output, 'ab' if args.cursor else 'wb') as f:
+            for block in data:
+                f.write(block)
+    else:
+        for block in data:
+            sys.stdout.buffer.write(block)
+        sys.stdout.buffer.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
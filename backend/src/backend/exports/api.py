@@ -0,0 +1,51 @@
+"""Export API handlers."""
+
+from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+from .service import ExportService, DEFAULT_SEGMENTS, MAX_SEGMENTS, gzip_chunks
+from ..core.exceptions import InvalidCursorError
+
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def get_export_service() -> ExportService:
+    """Dependency to get ExportService instance."""
+    from ..core.config import get_config
+    from .repository import ExportRepository
+    
+    return ExportService(ExportRepository(get_config()))
+
+
+@router.get("", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
+def export_data(
+    segments: int = Query(DEFAULT_SEGMENTS, ge=1, le=MAX_SEGMENTS),
+    cursor: Optional[str] = Query(None),
+    gzip: bool = Query(False),
+    service: ExportService = Depends(get_export_service)
+):
+    """
+    Stream all events and registrations as NDJSON.
+    
+    Each page of the parallel scan is followed by a ``cursor`` line; to
+    resume an interrupted export, pass the last cursor received as
+    ``cursor``. With ``gzip=true`` the stream is gzip-encoded.
+    """
+    try:
+        chunks = service.export(segments, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if gzip:
+        return StreamingResponse(
+            gzip_chunks(chunks),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"Content-Encoding": "gzip"}
+        )
+    return StreamingResponse(chunks, media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,50 @@
+"""Export repository for full-table scans."""
+
+from typing import Iterator, List
+
+from ..core.config import Config
+from ..core.pagination import SegmentPosition
+from ..core.scan import ScanPage, parallel_scan
+
+
+# Event items (SK = EVENT#...) and registration items (SK = USER#...) live in
+# EVENT# partitions; user profiles and waitlist entries are not exported.
+EXPORT_FILTER = 'begins_with(PK, :event) AND (begins_with(SK, :event) OR begins_with(SK, :user))'
+
+# Items per Scan page; DynamoDB also ends a page at 1 MB
+DEFAULT_PAGE_SIZE = 1000
+
+
+class ExportRepository:
+    """Repository for scanning the exported items of the Events table."""
+    
+    def __init__(self, config: Config):
+        """
+        Initialize ExportRepository.
+        
+        Args:
+            config: Application configuration
+        """
+        self.config = config
+        self.table = config.get_table()
+    
+    def scan_pages(self, start_keys: List[SegmentPosition]) -> Iterator[ScanPage]:
+        """
+        Scan the exported items in parallel segments.
+        
+        Args:
+            start_keys: Per segment, None to scan from the start, the
+                LastEvaluatedKey to resume from, or SEGMENT_DONE to skip it;
+                the number of segments is their length
+        
+        Returns:
+            Iterator of pages, as they arrive from the segment workers
+        """
+        return parallel_scan(
+            self.table,
+            len(start_keys),
+            start_keys=start_keys,
+            Limit=DEFAULT_PAGE_SIZE,
+            FilterExpression=EXPORT_FILTER,
+            ExpressionAttributeValues={':event': 'EVENT#', ':user': 'USER#'}
+        )
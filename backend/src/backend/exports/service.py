@@ -0,0 +1,105 @@
+"""Export service for streaming NDJSON exports."""
+
+import json
+import zlib
+from typing import Iterator, Iterable, List, Optional, Dict, Any
+
+from .repository import ExportRepository
+from ..core.pagination import SEGMENT_DONE, SegmentPosition, encode_segment_cursor, decode_segment_cursor
+from ..core.rows import from_row
+from ..models.event import Event
+from ..models.registration import Registration
+
+
+DEFAULT_SEGMENTS = 4
+MAX_SEGMENTS = 64
+
+
+def _export_line(record: Dict[str, Any]) -> str:
+    """Serialize one NDJSON line."""
+    return json.dumps(record, separators=(',', ':')) + '\n'
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Gzip a stream of text chunks.
+    
+    Every chunk is flushed, so a reader can decompress everything up to the
+    last complete chunk of an interrupted download.
+    
+    Args:
+        chunks: Text chunks
+    
+    Yields:
+        Gzip-compressed bytes
+    """
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode('utf-8')) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+class ExportService:
+    """Service for exporting all events and registrations."""
+    
+    def __init__(self, export_repository: ExportRepository):
+        """
+        Initialize ExportService.
+        
+        The service is synchronous: exports are consumed as iterators, which
+        StreamingResponse drives from a worker thread.
+        
+        Args:
+            export_repository: Export repository
+        """
+        self.export_repository = export_repository
+    
+    def export(self, segments: int = DEFAULT_SEGMENTS, cursor: Optional[str] = None) -> Iterator[str]:
+        """
+        Export all events and registrations as NDJSON.
+        
+        The table is scanned in ``segments`` parallel segments. Every chunk
+        holds the lines of one scanned page, ``{"type": "event" |
+        "registration", "data": {...}}``, followed by a ``{"type": "cursor",
+        "cursor": "..."}`` line; passing that cursor back resumes the export
+        after the chunk. The export ends with ``{"type": "end", "count": n}``,
+        n being the items written by this call. At most ``segments`` pages
+        are buffered, so memory use does not depend on the table size.
+        
+        Args:
+            segments: Number of parallel scan segments (ignored when resuming)
+            cursor: Cursor line value of an interrupted export
+        
+        Returns:
+            Iterator of NDJSON chunks
+        
+        Raises:
+            InvalidCursorError: If the cursor is malformed or has more than
+                MAX_SEGMENTS segments
+            ValueError: If segments is out of range
+        """
+        if cursor:
+            positions = decode_segment_cursor(cursor, MAX_SEGMENTS)
+        else:
+            if not 1 <= segments <= MAX_SEGMENTS:
+                raise ValueError(f"segments must be between 1 and {MAX_SEGMENTS}")
+            positions = [None] * segments
+        return self._stream(positions)
+    
+    def _stream(self, positions: List[SegmentPosition]) -> Iterator[str]:
+        """Scan the unfinished segments in parallel and yield one chunk per page."""
+        count = 0
+        for page in self.export_repository.scan_pages(list(positions)):
+            lines = [self._item_line(item) for item in page.items]
+            count += len(lines)
+            positions[page.segment] = page.last_evaluated_key or SEGMENT_DONE
+            lines.append(_export_line({'type': 'cursor', 'cursor': encode_segment_cursor(positions)}))
+            yield ''.join(lines)
+        yield _export_line({'type': 'end', 'count': count})
+    
+    @staticmethod
+    def _item_line(item: Dict[str, Any]) -> str:
+        """Convert an event or registration item to its NDJSON line."""
+        if item['SK'].startswith('EVENT#'):
+            return _export_line({'type': 'event', 'data': from_row(Event, item).model_dump(mode='json')})
+        return _export_line({'type': 'registration', 'data': from_row(Registration, item).model_dump(mode='json')})
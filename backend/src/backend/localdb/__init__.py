@@ -0,0 +1,10 @@
+# Local DynamoDB engine - in-memory, DynamoDB-compatible backend for development and load tests
+
+from .engine import LocalDynamoDB, LocalTable
+from .expressions import ExpressionError
+
+__all__ = [
+    'LocalDynamoDB',
+    'LocalTable',
+    'ExpressionError',
+]
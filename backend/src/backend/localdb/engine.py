@@ -0,0 +1,1269 @@
+"""
+In-memory DynamoDB-compatible table engine.
+
+``LocalDynamoDB`` implements the subset of the boto3 DynamoDB *resource* API
+used by the application (``Table`` handles with put/get/update/delete item,
+query, scan and batch_writer; ``batch_get_item``; ``batch_write_item``; and
+``meta.client.transact_write_items``), so repositories run against it
+unchanged.
+
+Items are kept per partition in a sorted key list plus a dictionary, so a
+Query is a binary search followed by a walk over the matching range, i.e.
+O(log n + k). Global secondary indexes are maintained on every write and
+queried the same way. Partitions are ordered by a hash token, which gives
+DynamoDB-like scan order and cheap parallel scan segments. Expressions are
+evaluated with real DynamoDB semantics (see ``expressions``), errors are
+raised as botocore ``ClientError`` with the service's error codes, and a
+single engine-wide lock makes every call, including transactions, atomic.
+
+With a ``path`` the engine loads its tables from that file on start and
+writes them back on ``save()`` and at interpreter exit. ``operation_counts``
+counts the API calls made, e.g. for benchmarks.
+"""
+
+import atexit
+import bisect
+import collections
+import math
+import os
+import pickle
+import threading
+import zlib
+from decimal import Decimal
+from operator import itemgetter
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .expressions import (
+    MISSING,
+    CompiledExpression,
+    ExpressionError,
+    compile_condition,
+    compile_key_condition,
+    compile_projection,
+    compile_update,
+    project,
+    type_of,
+)
+
+
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+TRANSACTION_LIMIT = 100
+ITEM_SIZE_LIMIT = 400 * 1024
+
+# Query and Scan stop after reading this much data, like DynamoDB does
+PAGE_SIZE_LIMIT = 1024 * 1024
+
+_TOKEN_SPACE = 2 ** 32
+
+
+def client_error(code: str, message: str, operation: str, **extra: Any) -> Exception:
+    """
+    Build a botocore ClientError as the service would return it.
+
+    Args:
+        code: Error code, e.g. "ConditionalCheckFailedException"
+        message: Error message
+        operation: API operation name
+        **extra: Additional top-level response fields
+
+    Returns:
+        ClientError instance
+    """
+    from botocore.exceptions import ClientError
+
+    response = {
+        'Error': {'Code': code, 'Message': message},
+        'ResponseMetadata': {'HTTPStatusCode': 400},
+        **extra
+    }
+    return ClientError(response, operation)
+
+
+def _validation_error(message: str, operation: str) -> Exception:
+    return client_error('ValidationException', message, operation)
+
+
+def _compile(compile: Callable[..., CompiledExpression], operation: str, *args: Any) -> CompiledExpression:
+    """Compile an expression, reporting an invalid one as a ValidationException."""
+    try:
+        return compile(*args)
+    except ExpressionError as e:
+        raise _validation_error(str(e), operation)
+
+
+def normalize(value: Any) -> Any:
+    """
+    Convert a value to the form the boto3 resource layer stores and returns.
+
+    Integers become Decimal, tuples become lists and Binary becomes bytes.
+    Containers are copied, so the caller can keep mutating its own objects.
+
+    Args:
+        value: Python value
+
+    Returns:
+        Normalized copy
+
+    Raises:
+        TypeError: For floats and unsupported types, as boto3 does
+    """
+    if isinstance(value, (str, Decimal, bool)) or value is None:
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, dict):
+        return {key: normalize(element) for key, element in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(element) for element in value]
+    if isinstance(value, (set, frozenset)):
+        return {normalize(element) for element in value}
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if isinstance(value, float):
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    if isinstance(getattr(value, 'value', None), bytes):
+        return value.value
+    raise TypeError(f"Unsupported type \"{type(value)}\" for value \"{value}\"")
+
+
+def copy_value(value: Any) -> Any:
+    """Deep-copy a normalized value."""
+    if isinstance(value, dict):
+        return {key: copy_value(element) for key, element in value.items()}
+    if isinstance(value, list):
+        return [copy_value(element) for element in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def _value_size(value: Any) -> int:
+    """Approximate the stored size of a value in bytes."""
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, Decimal):
+        return (len(value.as_tuple().digits) + 1) // 2 + 1
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return 3 + sum(len(key.encode('utf-8')) + 1 + _value_size(element) for key, element in value.items())
+    if isinstance(value, list):
+        return 3 + sum(1 + _value_size(element) for element in value)
+    if isinstance(value, set):
+        return sum(_value_size(element) for element in value)
+    return 0
+
+
+def item_size(item: Optional[Dict[str, Any]]) -> int:
+    """
+    Approximate the size of an item as DynamoDB accounts for it.
+
+    Args:
+        item: Item or None
+
+    Returns:
+        Size in bytes (0 for None)
+    """
+    if not item:
+        return 0
+    return sum(len(name.encode('utf-8')) + _value_size(value) for name, value in item.items())
+
+
+def _token(value: Any) -> int:
+    """Hash a partition key value onto the token ring."""
+    if isinstance(value, str):
+        data = value.encode('utf-8')
+    elif isinstance(value, bytes):
+        data = value
+    else:
+        data = str(value.normalize()).encode('ascii')
+    return zlib.crc32(data)
+
+
+def _prefix_end(prefix: Any) -> Optional[Any]:
+    """Smallest value greater than every value starting with prefix."""
+    if isinstance(prefix, bytes):
+        stripped = prefix.rstrip(b'\xff')
+        return stripped[:-1] + bytes([stripped[-1] + 1]) if stripped else None
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _serialize_item(item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Serialize an item to the low-level attribute value format."""
+    if item is None:
+        return None
+    from boto3.dynamodb.types import TypeSerializer
+
+    serializer = TypeSerializer()
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+
+def _deserialize_item(item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Deserialize an item from the low-level attribute value format."""
+    if item is None:
+        return None
+    from boto3.dynamodb.types import TypeDeserializer
+
+    deserializer = TypeDeserializer()
+    return {key: deserializer.deserialize(value) for key, value in item.items()}
+
+
+class _Partition:
+    """Items sharing a partition key, ordered by sort key."""
+
+    __slots__ = ('keys', 'items')
+
+    def __init__(self):
+        self.keys: List[Any] = []
+        self.items: Dict[Any, Dict[str, Any]] = {}
+
+    def put(self, key: Any, item: Dict[str, Any]) -> None:
+        if key not in self.items:
+            bisect.insort(self.keys, key)
+        self.items[key] = item
+
+    def remove(self, key: Any) -> None:
+        if self.items.pop(key, None) is not None:
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+
+class _KeyedStore:
+    """
+    Partitioned, sorted storage for a table or a global secondary index.
+
+    Table entries are keyed by sort key value; index entries by the tuple
+    (index sort key, table partition key, table sort key), so index entries
+    with equal index keys stay unique and ordered.
+    """
+
+    def __init__(
+        self,
+        hash_key: str,
+        range_key: Optional[str],
+        table_hash_key: str,
+        table_range_key: Optional[str],
+        is_index: bool
+    ):
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.table_hash_key = table_hash_key
+        self.table_range_key = table_range_key
+        self.is_index = is_index
+        self.partitions: Dict[Any, _Partition] = {}
+        self.order: List[Tuple[int, Any]] = []
+        # Maps an entry to the value its sort key conditions apply to
+        self.sort_value: Optional[Callable[[Any], Any]] = itemgetter(0) if is_index else None
+
+    def entry_key(self, item: Dict[str, Any]) -> Tuple[Any, Any]:
+        """Partition value and entry key of an item."""
+        sort = item.get(self.range_key) if self.range_key else None
+        if self.is_index:
+            table_sort = item.get(self.table_range_key) if self.table_range_key else None
+            return item[self.hash_key], (sort, item[self.table_hash_key], table_sort)
+        return item[self.hash_key], sort
+
+    def covers(self, item: Dict[str, Any]) -> bool:
+        """Whether an item has this store's key attributes (indexes are sparse)."""
+        return self.hash_key in item and (self.range_key is None or self.range_key in item)
+
+    def put(self, item: Dict[str, Any]) -> None:
+        partition_value, key = self.entry_key(item)
+        partition = self.partitions.get(partition_value)
+        if partition is None:
+            partition = self.partitions[partition_value] = _Partition()
+            bisect.insort(self.order, (_token(partition_value), partition_value))
+        partition.put(key, item)
+
+    def remove(self, item: Dict[str, Any]) -> None:
+        partition_value, key = self.entry_key(item)
+        partition = self.partitions.get(partition_value)
+        if partition is None:
+            return
+        partition.remove(key)
+        if not partition.items:
+            del self.partitions[partition_value]
+            position = bisect.bisect_left(self.order, (_token(partition_value), partition_value))
+            del self.order[position]
+
+    def count(self) -> int:
+        return sum(len(partition.items) for partition in self.partitions.values())
+
+
+class _TableData:
+    """Schema and storage of one table."""
+
+    def __init__(self, definition: Dict[str, Any]):
+        self.definition = definition
+        self.name = definition['TableName']
+        key_schema = {element['KeyType']: element['AttributeName'] for element in definition['KeySchema']}
+        self.hash_key: str = key_schema['HASH']
+        self.range_key: Optional[str] = key_schema.get('RANGE')
+        self.attribute_types = {
+            attribute['AttributeName']: attribute['AttributeType']
+            for attribute in definition['AttributeDefinitions']
+        }
+        self.store = _KeyedStore(self.hash_key, self.range_key, self.hash_key, self.range_key, False)
+        self.indexes: Dict[str, _KeyedStore] = {}
+        self.index_projections: Dict[str, Optional[Tuple[str, ...]]] = {}
+        for index in definition.get('GlobalSecondaryIndexes') or []:
+            index_schema = {element['KeyType']: element['AttributeName'] for element in index['KeySchema']}
+            self.indexes[index['IndexName']] = _KeyedStore(
+                index_schema['HASH'], index_schema.get('RANGE'), self.hash_key, self.range_key, True
+            )
+            projection = index.get('Projection', {'ProjectionType': 'ALL'})
+            if projection['ProjectionType'] == 'ALL':
+                self.index_projections[index['IndexName']] = None
+            else:
+                attributes = {self.hash_key, index_schema['HASH']}
+                attributes.update(key for key in (self.range_key, index_schema.get('RANGE')) if key)
+                attributes.update(projection.get('NonKeyAttributes', []))
+                self.index_projections[index['IndexName']] = tuple(attributes)
+
+    @property
+    def key_names(self) -> Tuple[str, ...]:
+        return (self.hash_key, self.range_key) if self.range_key else (self.hash_key,)
+
+    def key_of(self, key: Dict[str, Any], operation: str, is_item: bool = False) -> Tuple[Any, Any]:
+        """Validate a key (or an item's key attributes) and return (partition, sort)."""
+        for name in self.key_names:
+            if name not in key:
+                raise _validation_error(
+                    f"One or more parameter values were invalid: Missing the key {name} in the item"
+                    if is_item else "The provided key element does not match the schema",
+                    operation
+                )
+            self.check_key_value(name, key[name], operation)
+        if not is_item and len(key) != len(self.key_names):
+            raise _validation_error("The provided key element does not match the schema", operation)
+        return key[self.hash_key], key.get(self.range_key) if self.range_key else None
+
+    def check_key_value(self, name: str, value: Any, operation: str) -> None:
+        """Check that a key attribute has the type declared for it."""
+        expected = self.attribute_types.get(name)
+        if expected and type_of(value) != expected:
+            raise _validation_error(
+                f"One or more parameter values were invalid: Type mismatch for key {name} "
+                f"expected: {expected} actual: {type_of(value)}",
+                operation
+            )
+        if value == '' or value == b'':
+            raise _validation_error(
+                f"One or more parameter values are not valid. The AttributeValue for a key attribute "
+                f"cannot contain an empty string value. Key: {name}",
+                operation
+            )
+
+    def get(self, key: Tuple[Any, Any]) -> Optional[Dict[str, Any]]:
+        partition = self.store.partitions.get(key[0])
+        return partition.items.get(key[1]) if partition else None
+
+    def write(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        """Replace ``old`` by ``new`` (either may be None) in the table and its indexes."""
+        if old is not None:
+            self.store.remove(old)
+            for index in self.indexes.values():
+                if index.covers(old):
+                    index.remove(old)
+        if new is not None:
+            self.store.put(new)
+            for index in self.indexes.values():
+                if index.covers(new):
+                    index.put(new)
+
+    def check_item(self, item: Dict[str, Any], operation: str) -> None:
+        """Validate index key types and the item size before a write."""
+        for index in self.indexes.values():
+            for name in (index.hash_key, index.range_key):
+                if name and name in item:
+                    self.check_key_value(name, item[name], operation)
+        if item_size(item) > ITEM_SIZE_LIMIT:
+            raise _validation_error("Item size has exceeded the maximum allowed size", operation)
+
+
+def _check_placeholders(
+    operation: str,
+    names: Optional[Dict[str, str]],
+    values: Optional[Dict[str, Any]],
+    compiled: Sequence[Optional[CompiledExpression]]
+) -> None:
+    """Reject unused ExpressionAttributeNames/Values like DynamoDB does."""
+    compiled = [expression for expression in compiled if expression is not None]
+    used_names = set().union(*(expression.used_names for expression in compiled)) if compiled else set()
+    used_values = set().union(*(expression.used_values for expression in compiled)) if compiled else set()
+    unused_names = set(names or {}) - used_names
+    if unused_names:
+        raise _validation_error(
+            f"Value provided in ExpressionAttributeNames unused in expressions: keys: {{{', '.join(sorted(unused_names))}}}",
+            operation
+        )
+    unused_values = set(values or {}) - used_values
+    if unused_values:
+        raise _validation_error(
+            f"Value provided in ExpressionAttributeValues unused in expressions: keys: {{{', '.join(sorted(unused_values))}}}",
+            operation
+        )
+
+
+def _capacity_units(size: int, unit: int) -> float:
+    return float(max(1, math.ceil(size / unit)))
+
+
+class LocalDynamoDB:
+    """In-memory DynamoDB service exposing the boto3 resource API."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize LocalDynamoDB.
+
+        Args:
+            path: Optional file to load tables from and save them to
+        """
+        self.path = path
+        self._tables: Dict[str, _TableData] = {}
+        self._lock = threading.RLock()
+        self.operation_counts: collections.Counter = collections.Counter()
+        self.meta = SimpleNamespace(client=LocalDynamoDBClient(self))
+        if path:
+            if os.path.exists(path):
+                self._load(path)
+            atexit.register(self.save)
+
+    # Persistence
+
+    def _load(self, path: str) -> None:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+        for definition, items in snapshot:
+            table = self._tables[definition['TableName']] = _TableData(definition)
+            for item in items:
+                table.write(None, item)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write all tables to disk atomically.
+
+        Args:
+            path: Target file; defaults to the path given at construction
+        """
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            snapshot = [
+                (table.definition, [
+                    item
+                    for _, partition_value in table.store.order
+                    for item in table.store.partitions[partition_value].items.values()
+                ])
+                for table in self._tables.values()
+            ]
+            temporary = f"{path}.tmp"
+            with open(temporary, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+
+    # Tables
+
+    def create_table(self, **definition: Any) -> 'LocalTable':
+        """
+        Create a table (CreateTable).
+
+        Args:
+            **definition: TableName, KeySchema, AttributeDefinitions and
+                optionally GlobalSecondaryIndexes; other arguments such as
+                BillingMode are accepted and ignored
+
+        Returns:
+            Table handle
+
+        Raises:
+            ClientError: ResourceInUseException if the table exists
+        """
+        with self._lock:
+            name = definition['TableName']
+            if name in self._tables:
+                raise client_error('ResourceInUseException', f"Table already exists: {name}", 'CreateTable')
+            self._tables[name] = _TableData(definition)
+        return LocalTable(self, name)
+
+    def ensure_table(self, **definition: Any) -> 'LocalTable':
+        """
+        Create a table unless it already exists.
+
+        Args:
+            **definition: Arguments for create_table
+
+        Returns:
+            Table handle
+        """
+        with self._lock:
+            if definition['TableName'] not in self._tables:
+                self.create_table(**definition)
+        return LocalTable(self, definition['TableName'])
+
+    def delete_table(self, name: str) -> None:
+        """
+        Delete a table and all its items.
+
+        Args:
+            name: Table name
+        """
+        with self._lock:
+            self._table(name, 'DeleteTable')
+            del self._tables[name]
+
+    def Table(self, name: str) -> 'LocalTable':
+        """
+        Get a table handle, like ``boto3.resource('dynamodb').Table``.
+
+        Args:
+            name: Table name
+
+        Returns:
+            Table handle (the table need not exist yet)
+        """
+        return LocalTable(self, name)
+
+    def _table(self, name: str, operation: str) -> _TableData:
+        table = self._tables.get(name)
+        if table is None:
+            raise client_error('ResourceNotFoundException', 'Requested resource not found', operation)
+        return table
+
+    # Batch operations
+
+    def batch_get_item(self, RequestItems: Dict[str, Dict[str, Any]], ReturnConsumedCapacity: str = 'NONE') -> Dict[str, Any]:
+        """
+        Read items from one or more tables (BatchGetItem).
+
+        Args:
+            RequestItems: Per-table Keys, ProjectionExpression,
+                ExpressionAttributeNames and ConsistentRead
+            ReturnConsumedCapacity: NONE, TOTAL or INDEXES
+
+        Returns:
+            Response with Responses and an always empty UnprocessedKeys
+        """
+        operation = 'BatchGetItem'
+        total_keys = sum(len(request.get('Keys', [])) for request in RequestItems.values())
+        if total_keys > BATCH_GET_LIMIT:
+            raise _validation_error(
+                "Too many items requested for the BatchGetItem call", operation
+            )
+        responses: Dict[str, List[Dict[str, Any]]] = {}
+        consumed = []
+        with self._lock:
+            self.operation_counts['BatchGetItem'] += 1
+            for name, request in RequestItems.items():
+                table = self._table(name, operation)
+                names = request.get('ExpressionAttributeNames')
+                projection = (
+                    _compile(compile_projection, operation, request['ProjectionExpression'], names)
+                    if request.get('ProjectionExpression') else None
+                )
+                _check_placeholders(operation, names, None, [projection])
+                seen = set()
+                items = []
+                size = 0
+                for key in request['Keys']:
+                    key = normalize(key)
+                    table_key = table.key_of(key, operation)
+                    if table_key in seen:
+                        raise _validation_error("Provided list of item keys contains duplicates", operation)
+                    seen.add(table_key)
+                    item = table.get(table_key)
+                    if item is not None:
+                        size += item_size(item)
+                        items.append(copy_value(project(item, projection.function) if projection else item))
+                responses[name] = items
+                units = _capacity_units(size, 4096) * (1.0 if request.get('ConsistentRead') else 0.5)
+                consumed.append({'TableName': name, 'CapacityUnits': units, 'ReadCapacityUnits': units})
+        response: Dict[str, Any] = {'Responses': responses, 'UnprocessedKeys': {}}
+        if ReturnConsumedCapacity in ('TOTAL', 'INDEXES'):
+            response['ConsumedCapacity'] = consumed
+        return response
+
+    def batch_write_item(self, RequestItems: Dict[str, List[Dict[str, Any]]], ReturnConsumedCapacity: str = 'NONE') -> Dict[str, Any]:
+        """
+        Put or delete items in one or more tables (BatchWriteItem).
+
+        Args:
+            RequestItems: Per-table lists of PutRequest/DeleteRequest entries
+            ReturnConsumedCapacity: NONE, TOTAL or INDEXES
+
+        Returns:
+            Response with an always empty UnprocessedItems
+        """
+        operation = 'BatchWriteItem'
+        total = sum(len(requests) for requests in RequestItems.values())
+        if total > BATCH_WRITE_LIMIT:
+            raise _validation_error(
+                "Too many items requested for the BatchWriteItem call", operation
+            )
+        consumed = []
+        with self._lock:
+            self.operation_counts['BatchWriteItem'] += 1
+            planned = []
+            seen = set()
+            for name, requests in RequestItems.items():
+                table = self._table(name, operation)
+                for request in requests:
+                    if 'PutRequest' in request:
+                        item = normalize(request['PutRequest']['Item'])
+                        key = table.key_of(item, operation, is_item=True)
+                        table.check_item(item, operation)
+                    else:
+                        item = None
+                        key = table.key_of(normalize(request['DeleteRequest']['Key']), operation)
+                    if (name, key) in seen:
+                        raise _validation_error("Provided list of item keys contains duplicates", operation)
+                    seen.add((name, key))
+                    planned.append((table, key, item))
+            units: Dict[str, float] = {}
+            for table, key, item in planned:
+                old = table.get(key)
+                table.write(old, item)
+                units[table.name] = units.get(table.name, 0.0) + _capacity_units(
+                    max(item_size(old), item_size(item)), 1024
+                )
+            consumed = [
+                {'TableName': name, 'CapacityUnits': value, 'WriteCapacityUnits': value}
+                for name, value in units.items()
+            ]
+        response: Dict[str, Any] = {'UnprocessedItems': {}}
+        if ReturnConsumedCapacity in ('TOTAL', 'INDEXES'):
+            response['ConsumedCapacity'] = consumed
+        return response
+
+    # Transactions
+
+    def transact_write(self, actions: List[Dict[str, Dict[str, Any]]], operation: str = 'TransactWriteItems') -> float:
+        """
+        Apply plain-valued transaction actions atomically.
+
+        Args:
+            actions: Put, Update, Delete and ConditionCheck actions with
+                plain (resource-style) values
+            operation: Operation name used in errors
+
+        Returns:
+            Write capacity units consumed
+
+        Raises:
+            ClientError: TransactionCanceledException if a condition fails
+        """
+        if len(actions) > TRANSACTION_LIMIT:
+            raise _validation_error(
+                f"Member must have length less than or equal to {TRANSACTION_LIMIT}", operation
+            )
+        with self._lock:
+            self.operation_counts[operation] += 1
+            planned = []
+            reasons = []
+            seen = set()
+            cancelled = False
+            for action in actions:
+                (kind, params), = action.items()
+                table = self._table(params['TableName'], operation)
+                values = normalize(params.get('ExpressionAttributeValues') or {})
+                names = params.get('ExpressionAttributeNames')
+                if kind == 'Put':
+                    item = normalize(params['Item'])
+                    key = table.key_of(item, operation, is_item=True)
+                else:
+                    key = table.key_of(normalize(params['Key']), operation)
+                if (table.name, key) in seen:
+                    raise _validation_error(
+                        "Transaction request cannot include multiple operations on one item", operation
+                    )
+                seen.add((table.name, key))
+                current = table.get(key)
+                condition = (
+                    _compile(compile_condition, operation, params['ConditionExpression'], names)
+                    if params.get('ConditionExpression') else None
+                )
+                update = _compile(compile_update, operation, params['UpdateExpression'], names) if kind == 'Update' else None
+                _check_placeholders(operation, names, values, [condition, update])
+                if kind == 'ConditionCheck' and condition is None:
+                    raise _validation_error("ConditionCheck requires a ConditionExpression", operation)
+                try:
+                    passed = condition is None or condition.function(current or {}, values)
+                    if kind == 'Put':
+                        new = item
+                    elif kind == 'Update':
+                        new = self._updated_item(table, key, current, update, values, operation)
+                    elif kind == 'Delete':
+                        new = None
+                    else:
+                        new = current
+                except ExpressionError as e:
+                    raise _validation_error(str(e), operation)
+                if new is not None:
+                    table.check_item(new, operation)
+                if passed:
+                    reasons.append({'Code': 'None'})
+                else:
+                    cancelled = True
+                    reason = {'Code': 'ConditionalCheckFailed', 'Message': 'The conditional request failed'}
+                    if params.get('ReturnValuesOnConditionCheckFailure') == 'ALL_OLD' and current is not None:
+                        reason['Item'] = _serialize_item(current)
+                    reasons.append(reason)
+                if kind != 'ConditionCheck':
+                    planned.append((table, key, current, new))
+            if cancelled:
+                raise client_error(
+                    'TransactionCanceledException',
+                    "Transaction cancelled, please refer cancellation reasons for specific reasons "
+                    f"[{', '.join(reason['Code'] for reason in reasons)}]",
+                    operation,
+                    CancellationReasons=reasons
+                )
+            units = 0.0
+            for table, key, current, new in planned:
+                table.write(current, new)
+                units += 2 * _capacity_units(max(item_size(current), item_size(new)), 1024)
+            return units
+
+    def _updated_item(
+        self,
+        table: _TableData,
+        key: Tuple[Any, Any],
+        current: Optional[Dict[str, Any]],
+        update: CompiledExpression,
+        values: Dict[str, Any],
+        operation: str
+    ) -> Dict[str, Any]:
+        """Apply a compiled update to the current item (or to a new one built from the key)."""
+        for path in update.function.paths:
+            if path[0] in table.key_names:
+                raise _validation_error(
+                    f"One or more parameter values were invalid: Cannot update attribute {path[0]}. "
+                    "This attribute is part of the key",
+                    operation
+                )
+        base = current
+        if base is None:
+            base = {table.hash_key: key[0]}
+            if table.range_key:
+                base[table.range_key] = key[1]
+        return update.function.apply(base, values, copy_value)
+
+
+class LocalDynamoDBClient:
+    """The low-level client operations the application uses (``resource.meta.client``)."""
+
+    def __init__(self, engine: LocalDynamoDB):
+        """
+        Initialize LocalDynamoDBClient.
+
+        Args:
+            engine: Engine to operate on
+        """
+        self.engine = engine
+
+    def transact_write_items(self, TransactItems: List[Dict[str, Dict[str, Any]]], ReturnConsumedCapacity: str = 'NONE', **kwargs: Any) -> Dict[str, Any]:
+        """
+        Execute a TransactWriteItems call with typed attribute values.
+
+        Args:
+            TransactItems: Actions in the low-level format
+            ReturnConsumedCapacity: NONE, TOTAL or INDEXES
+
+        Returns:
+            Response dictionary
+        """
+        actions = []
+        for action in TransactItems:
+            (kind, params), = action.items()
+            params = dict(params)
+            for field in ('Item', 'Key', 'ExpressionAttributeValues'):
+                if field in params:
+                    params[field] = _deserialize_item(params[field])
+            actions.append({kind: params})
+        units = self.engine.transact_write(actions)
+        response: Dict[str, Any] = {}
+        if ReturnConsumedCapacity in ('TOTAL', 'INDEXES'):
+            tables = {next(iter(action.values()))['TableName'] for action in actions}
+            response['ConsumedCapacity'] = [
+                {'TableName': name, 'CapacityUnits': units, 'WriteCapacityUnits': units} for name in tables
+            ]
+        return response
+
+
+def _expression_arguments(
+    condition: Any,
+    names: Optional[Dict[str, str]],
+    values: Optional[Dict[str, Any]],
+    is_key_condition: bool = False
+) -> Tuple[Optional[str], Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
+    """Turn boto3 condition objects (Key/Attr) into expression strings."""
+    if condition is None or isinstance(condition, str):
+        return condition, names, values
+    from boto3.dynamodb.conditions import ConditionExpressionBuilder
+
+    built = ConditionExpressionBuilder().build_expression(condition, is_key_condition=is_key_condition)
+    return (
+        built.condition_expression,
+        {**(names or {}), **built.attribute_name_placeholders},
+        {**(values or {}), **built.attribute_value_placeholders}
+    )
+
+
+class LocalTable:
+    """Table handle with the boto3 ``Table`` resource methods."""
+
+    def __init__(self, engine: LocalDynamoDB, name: str):
+        """
+        Initialize LocalTable.
+
+        Args:
+            engine: Engine holding the table
+            name: Table name
+        """
+        self.engine = engine
+        self.name = name
+        self.table_name = name
+
+    def _data(self, operation: str) -> _TableData:
+        return self.engine._table(self.name, operation)
+
+    @property
+    def key_schema(self) -> List[Dict[str, str]]:
+        """KeySchema of the table."""
+        return self._data('DescribeTable').definition['KeySchema']
+
+    @property
+    def item_count(self) -> int:
+        """Number of items in the table."""
+        with self.engine._lock:
+            return self._data('DescribeTable').store.count()
+
+    def _consumed(self, units: float, kind: str, requested: Optional[str]) -> Dict[str, Any]:
+        if requested not in ('TOTAL', 'INDEXES'):
+            return {}
+        return {'ConsumedCapacity': {'TableName': self.name, 'CapacityUnits': units, kind: units}}
+
+    def _conditional_failure(self, current: Optional[Dict[str, Any]], return_values: Optional[str], operation: str) -> Exception:
+        extra = {}
+        if return_values == 'ALL_OLD' and current is not None:
+            extra['Item'] = _serialize_item(current)
+        return client_error('ConditionalCheckFailedException', 'The conditional request failed', operation, **extra)
+
+    def put_item(
+        self,
+        Item: Dict[str, Any],
+        ConditionExpression: Any = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        ReturnValues: str = 'NONE',
+        ReturnValuesOnConditionCheckFailure: str = 'NONE',
+        ReturnConsumedCapacity: str = 'NONE'
+    ) -> Dict[str, Any]:
+        """Create or replace an item (PutItem)."""
+        operation = 'PutItem'
+        ConditionExpression, names, values = _expression_arguments(
+            ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues
+        )
+        item = normalize(Item)
+        values = normalize(values or {})
+        with self.engine._lock:
+            self.engine.operation_counts[operation] += 1
+            table = self._data(operation)
+            key = table.key_of(item, operation, is_item=True)
+            table.check_item(item, operation)
+            condition = _compile(compile_condition, operation, ConditionExpression, names) if ConditionExpression else None
+            _check_placeholders(operation, names, values, [condition])
+            current = table.get(key)
+            try:
+                if condition and not condition.function(current or {}, values):
+                    raise self._conditional_failure(current, ReturnValuesOnConditionCheckFailure, operation)
+            except ExpressionError as e:
+                raise _validation_error(str(e), operation)
+            table.write(current, item)
+            response: Dict[str, Any] = {}
+            if ReturnValues == 'ALL_OLD' and current is not None:
+                response['Attributes'] = copy_value(current)
+            response.update(self._consumed(
+                _capacity_units(max(item_size(current), item_size(item)), 1024), 'WriteCapacityUnits', ReturnConsumedCapacity
+            ))
+            return response
+
+    def get_item(
+        self,
+        Key: Dict[str, Any],
+        ConsistentRead: bool = False,
+        ProjectionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ReturnConsumedCapacity: str = 'NONE'
+    ) -> Dict[str, Any]:
+        """Read one item by key (GetItem)."""
+        operation = 'GetItem'
+        with self.engine._lock:
+            self.engine.operation_counts[operation] += 1
+            table = self._data(operation)
+            key = table.key_of(normalize(Key), operation)
+            projection = (
+                _compile(compile_projection, operation, ProjectionExpression, ExpressionAttributeNames) if ProjectionExpression else None
+            )
+            _check_placeholders(operation, ExpressionAttributeNames, None, [projection])
+            item = table.get(key)
+            response: Dict[str, Any] = {}
+            if item is not None:
+                response['Item'] = copy_value(project(item, projection.function) if projection else item)
+            response.update(self._consumed(
+                _capacity_units(item_size(item), 4096) * (1.0 if ConsistentRead else 0.5),
+                'ReadCapacityUnits',
+                ReturnConsumedCapacity
+            ))
+            return response
+
+    def update_item(
+        self,
+        Key: Dict[str, Any],
+        UpdateExpression: Optional[str] = None,
+        ConditionExpression: Any = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        ReturnValues: str = 'NONE',
+        ReturnValuesOnConditionCheckFailure: str = 'NONE',
+        ReturnConsumedCapacity: str = 'NONE'
+    ) -> Dict[str, Any]:
+        """Update or create an item with an UpdateExpression (UpdateItem)."""
+        operation = 'UpdateItem'
+        if not UpdateExpression:
+            raise _validation_error("UpdateExpression is required by the local engine", operation)
+        ConditionExpression, names, values = _expression_arguments(
+            ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues
+        )
+        values = normalize(values or {})
+        with self.engine._lock:
+            self.engine.operation_counts[operation] += 1
+            table = self._data(operation)
+            key = table.key_of(normalize(Key), operation)
+            condition = _compile(compile_condition, operation, ConditionExpression, names) if ConditionExpression else None
+            update = _compile(compile_update, operation, UpdateExpression, names)
+            _check_placeholders(operation, names, values, [condition, update])
+            current = table.get(key)
+            try:
+                if condition and not condition.function(current or {}, values):
+                    raise self._conditional_failure(current, ReturnValuesOnConditionCheckFailure, operation)
+                new = self.engine._updated_item(table, key, current, update, values, operation)
+            except ExpressionError as e:
+                raise _validation_error(str(e), operation)
+            table.check_item(new, operation)
+            table.write(current, new)
+
+            response: Dict[str, Any] = {}
+            updated_names = {path[0] for path in update.function.paths}
+            if ReturnValues == 'ALL_NEW':
+                response['Attributes'] = copy_value(new)
+            elif ReturnValues == 'ALL_OLD' and current is not None:
+                response['Attributes'] = copy_value(current)
+            elif ReturnValues == 'UPDATED_NEW':
+                response['Attributes'] = {name: copy_value(new[name]) for name in updated_names if name in new}
+            elif ReturnValues == 'UPDATED_OLD' and current is not None:
+                response['Attributes'] = {name: copy_value(current[name]) for name in updated_names if name in current}
+            response.update(self._consumed(
+                _capacity_units(max(item_size(current), item_size(new)), 1024), 'WriteCapacityUnits', ReturnConsumedCapacity
+            ))
+            return response
+
+    def delete_item(
+        self,
+        Key: Dict[str, Any],
+        ConditionExpression: Any = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        ReturnValues: str = 'NONE',
+        ReturnValuesOnConditionCheckFailure: str = 'NONE',
+        ReturnConsumedCapacity: str = 'NONE'
+    ) -> Dict[str, Any]:
+        """Delete an item by key (DeleteItem)."""
+        operation = 'DeleteItem'
+        ConditionExpression, names, values = _expression_arguments(
+            ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues
+        )
+        values = normalize(values or {})
+        with self.engine._lock:
+            self.engine.operation_counts[operation] += 1
+            table = self._data(operation)
+            key = table.key_of(normalize(Key), operation)
+            condition = _compile(compile_condition, operation, ConditionExpression, names) if ConditionExpression else None
+            _check_placeholders(operation, names, values, [condition])
+            current = table.get(key)
+            try:
+                if condition and not condition.function(current or {}, values):
+                    raise self._conditional_failure(current, ReturnValuesOnConditionCheckFailure, operation)
+            except ExpressionError as e:
+                raise _validation_error(str(e), operation)
+            response: Dict[str, Any] = {}
+            if current is not None:
+                table.write(current, None)
+                if ReturnValues == 'ALL_OLD':
+                    response['Attributes'] = copy_value(current)
+            response.update(self._consumed(
+                _capacity_units(item_size(current), 1024), 'WriteCapacityUnits', ReturnConsumedCapacity
+            ))
+            return response
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        """Read the items of one partition in sort key order (Query)."""
+        return self._read('Query', kwargs)
+
+    def scan(self, **kwargs: Any) -> Dict[str, Any]:
+        """Read all items, optionally one segment of a parallel scan (Scan)."""
+        return self._read('Scan', kwargs)
+
+    def batch_writer(self, overwrite_by_pkeys: Optional[List[str]] = None) -> '_BatchWriter':
+        """
+        Get a context manager that buffers writes into BatchWriteItem calls.
+
+        Args:
+            overwrite_by_pkeys: Key attribute names used to de-duplicate
+                buffered requests
+
+        Returns:
+            Batch writer
+        """
+        return _BatchWriter(self, overwrite_by_pkeys)
+
+    def _read(self, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Shared implementation of Query and Scan."""
+        names = params.get('ExpressionAttributeNames')
+        values = params.get('ExpressionAttributeValues')
+        key_expression, names, values = _expression_arguments(
+            params.get('KeyConditionExpression'), names, values, is_key_condition=True
+        )
+        filter_expression, names, values = _expression_arguments(params.get('FilterExpression'), names, values)
+        values = normalize(values or {})
+        index_name = params.get('IndexName')
+        limit = params.get('Limit')
+        forward = params.get('ScanIndexForward', True)
+        select = params.get('Select', 'ALL_ATTRIBUTES')
+        if limit is not None and limit < 1:
+            raise _validation_error("Limit must be greater than or equal to 1", operation)
+
+        with self.engine._lock:
+            self.engine.operation_counts[operation] += 1
+            table = self._data(operation)
+            store = table.store
+            if index_name:
+                store = table.indexes.get(index_name)
+                if store is None:
+                    raise _validation_error(
+                        "The table does not have the specified index: " + index_name, operation
+                    )
+                if params.get('ConsistentRead'):
+                    raise _validation_error(
+                        "Consistent reads are not supported on global secondary indexes", operation
+                    )
+            try:
+                compiled_filter = compile_condition(filter_expression, names, 'FilterExpression') if filter_expression else None
+                projection = (
+                    compile_projection(params['ProjectionExpression'], names)
+                    if params.get('ProjectionExpression') else None
+                )
+                compiled = [compiled_filter, projection]
+                if operation == 'Query':
+                    if not key_expression:
+                        raise ExpressionError("Either the KeyConditions or KeyConditionExpression parameter must be specified")
+                    key_condition, used_names, used_values = compile_key_condition(
+                        key_expression, names, values, store.hash_key, store.range_key
+                    )
+                    compiled.append(CompiledExpression(None, used_names, used_values))
+                    entries = self._query_entries(table, store, key_condition, forward, params.get('ExclusiveStartKey'), operation)
+                else:
+                    entries = self._scan_entries(
+                        table, store, params.get('Segment'), params.get('TotalSegments'), params.get('ExclusiveStartKey'), operation
+                    )
+                _check_placeholders(operation, names, values, compiled)
+
+                items = []
+                scanned = 0
+                read_bytes = 0
+                last_item = None
+                has_more = False
+                for item in entries:
+                    if (limit is not None and scanned >= limit) or read_bytes >= PAGE_SIZE_LIMIT:
+                        has_more = True
+                        break
+                    scanned += 1
+                    read_bytes += item_size(item)
+                    last_item = item
+                    if compiled_filter and not compiled_filter.function(item, values):
+                        continue
+                    if select != 'COUNT':
+                        visible = item
+                        if index_name and table.index_projections[index_name] is not None:
+                            visible = {k: v for k, v in item.items() if k in table.index_projections[index_name]}
+                        items.append(copy_value(project(visible, projection.function) if projection else visible))
+                    else:
+                        items.append(None)
+            except ExpressionError as e:
+                raise _validation_error(str(e), operation)
+
+            response: Dict[str, Any] = {'Count': len(items), 'ScannedCount': scanned}
+            if select != 'COUNT':
+                response['Items'] = items
+            if has_more and last_item is not None:
+                key_names = list(table.key_names)
+                if index_name:
+                    key_names += [name for name in (store.hash_key, store.range_key) if name and name not in key_names]
+                response['LastEvaluatedKey'] = {name: copy_value(last_item[name]) for name in key_names}
+            response.update(self._consumed(
+                _capacity_units(read_bytes, 4096) * (1.0 if params.get('ConsistentRead') else 0.5),
+                'ReadCapacityUnits',
+                params.get('ReturnConsumedCapacity')
+            ))
+            return response
+
+    def _start_entry(self, table: _TableData, store: _KeyedStore, start_key: Dict[str, Any], operation: str) -> Tuple[Any, Any]:
+        """Partition value and entry key of an ExclusiveStartKey."""
+        start_key = normalize(start_key)
+        try:
+            return store.entry_key(start_key)
+        except KeyError:
+            raise _validation_error("The provided starting key is invalid", operation)
+
+    def _query_entries(
+        self,
+        table: _TableData,
+        store: _KeyedStore,
+        condition: Any,
+        forward: bool,
+        start_key: Optional[Dict[str, Any]],
+        operation: str
+    ) -> Iterable[Dict[str, Any]]:
+        """Items matching a key condition, in sort order."""
+        partition = store.partitions.get(condition.partition_value)
+        if partition is None:
+            return []
+        keys = partition.keys
+        sort_value = store.sort_value
+        operator = condition.operator
+        operands = condition.operands
+        if operator is not None and store.range_key:
+            expected = table.attribute_types.get(store.range_key)
+            for operand in operands:
+                if expected and type_of(operand) != expected:
+                    raise ExpressionError(f"Condition parameter type does not match schema type for {store.range_key}")
+        low, high = 0, len(keys)
+        if operator == '=':
+            low = bisect.bisect_left(keys, operands[0], key=sort_value)
+            high = bisect.bisect_right(keys, operands[0], key=sort_value)
+        elif operator == '<':
+            high = bisect.bisect_left(keys, operands[0], key=sort_value)
+        elif operator == '<=':
+            high = bisect.bisect_right(keys, operands[0], key=sort_value)
+        elif operator == '>':
+            low = bisect.bisect_right(keys, operands[0], key=sort_value)
+        elif operator == '>=':
+            low = bisect.bisect_left(keys, operands[0], key=sort_value)
+        elif operator == 'BETWEEN':
+            low = bisect.bisect_left(keys, operands[0], key=sort_value)
+            high = bisect.bisect_right(keys, operands[1], key=sort_value)
+        elif operator == 'begins_with':
+            prefix = operands[0]
+            if not isinstance(prefix, (str, bytes)):
+                raise ExpressionError("Invalid operand type for begins_with")
+            low = bisect.bisect_left(keys, prefix, key=sort_value)
+            end = _prefix_end(prefix)
+            if end is not None:
+                high = bisect.bisect_left(keys, end, key=sort_value)
+        if start_key is not None:
+            start_partition, start_entry = self._start_entry(table, store, start_key, 'Query')
+            if start_partition != condition.partition_value:
+                raise ExpressionError("The provided starting key is outside query boundaries based on provided conditions")
+            if forward:
+                low = max(low, bisect.bisect_right(keys, start_entry))
+            else:
+                high = min(high, bisect.bisect_left(keys, start_entry))
+        positions = range(low, high) if forward else range(high - 1, low - 1, -1)
+        items = partition.items
+        return (items[keys[position]] for position in positions)
+
+    def _scan_entries(
+        self,
+        table: _TableData,
+        store: _KeyedStore,
+        segment: Optional[int],
+        total_segments: Optional[int],
+        start_key: Optional[Dict[str, Any]],
+        operation: str
+    ) -> Iterable[Dict[str, Any]]:
+        """Items of the whole table or index, or of one parallel scan segment."""
+        order = store.order
+        low, high = 0, len(order)
+        if total_segments is not None or segment is not None:
+            if total_segments is None or segment is None or not 0 <= segment < total_segments:
+                raise ExpressionError("Segment and TotalSegments must be given together, with 0 <= Segment < TotalSegments")
+            low = bisect.bisect_left(order, (segment * _TOKEN_SPACE // total_segments,))
+            high = bisect.bisect_left(order, ((segment + 1) * _TOKEN_SPACE // total_segments,))
+        first_entry_position = None
+        if start_key is not None:
+            start_partition, start_entry = self._start_entry(table, store, start_key, operation)
+            position = bisect.bisect_left(order, (_token(start_partition), start_partition))
+            if position < len(order) and order[position][1] == start_partition:
+                low = max(low, position)
+                first_entry_position = (start_partition, start_entry)
+            else:
+                low = max(low, position)
+
+        def entries():
+            for position in range(low, high):
+                partition_value = order[position][1]
+                partition = store.partitions[partition_value]
+                keys = partition.keys
+                start = 0
+                if first_entry_position and first_entry_position[0] == partition_value:
+                    start = bisect.bisect_right(keys, first_entry_position[1])
+                for index in range(start, len(keys)):
+                    yield partition.items[keys[index]]
+        return entries()
+
+
+class _BatchWriter:
+    """Buffers puts and deletes into BatchWriteItem calls of up to 25 requests."""
+
+    def __init__(self, table: LocalTable, overwrite_by_pkeys: Optional[List[str]] = None):
+        self.table = table
+        self.overwrite_by_pkeys = overwrite_by_pkeys
+        self._requests: List[Dict[str, Any]] = []
+
+    def _add(self, request: Dict[str, Any]) -> None:
+        if self.overwrite_by_pkeys:
+            body = request.get('PutRequest', {}).get('Item') or request['DeleteRequest']['Key']
+            key = tuple(body.get(name) for name in self.overwrite_by_pkeys)
+            self._requests = [
+                existing for existing in self._requests
+                if tuple(
+                    (existing.get('PutRequest', {}).get('Item') or existing['DeleteRequest']['Key']).get(name)
+                    for name in self.overwrite_by_pkeys
+                ) != key
+            ]
+        self._requests.append(request)
+        if len(self._requests) >= BATCH_WRITE_LIMIT:
+            self._flush()
+
+    def put_item(self, Item: Dict[str, Any]) -> None:
+        self._add({'PutRequest': {'Item': Item}})
+
+    def delete_item(self, Key: Dict[str, Any]) -> None:
+        self._add({'DeleteRequest': {'Key': Key}})
+
+    def _flush(self) -> None:
+        if self._requests:
+            self.table.engine.batch_write_item(RequestItems={self.table.name: self._requests})
+            self._requests = []
+
+    def __enter__(self) -> '_BatchWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._flush()
@@ -0,0 +1,802 @@
+"""
+DynamoDB expression support for the local table engine.
+
+Condition, filter, key condition, update and projection expressions are
+parsed once into small Python closures and cached, so evaluating an
+expression against an item is a handful of function calls. Semantics follow
+DynamoDB: comparisons between different types are false, ``<>`` is true for
+a missing attribute, arithmetic and ``ADD`` only accept numbers (``ADD``
+also accepts sets), all right-hand sides of an update are evaluated
+against the item as it was before the update, and reserved words used as
+attribute names are rejected.
+"""
+
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+
+class ExpressionError(ValueError):
+    """Raised for invalid expressions or operands (a ValidationException)."""
+    pass
+
+
+# Sentinel for attributes that do not exist in the item
+MISSING = object()
+
+PathElement = Union[str, int]
+Path = Tuple[PathElement, ...]
+Values = Dict[str, Any]
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<op><>|<=|>=|=|<|>|\(|\)|,|\.|\[|\]|\+|-)
+      | (?P<name>\#[A-Za-z0-9_]+)
+      | (?P<value>:[A-Za-z0-9_]+)
+      | (?P<number>[0-9]+)
+      | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+    )
+""", re.VERBOSE)
+
+# Reserved words of DynamoDB expressions; attribute names that are one
+# of them must be written through an ExpressionAttributeNames placeholder
+RESERVED_WORDS = frozenset("""
+ABORT ABSOLUTE ACTION ADD AFTER AGENT AGGREGATE ALL ALLOCATE ALTER ANALYZE AND ANY ARCHIVE ARE ARRAY
+AS ASC ASCII ASENSITIVE ASSERTION ASYMMETRIC AT ATOMIC ATTACH ATTRIBUTE AUTH AUTHORIZATION AUTHORIZE
+AUTO AVG BACK BACKUP BASE BATCH BEFORE BEGIN BETWEEN BIGINT BINARY BIT BLOB BLOCK BOOLEAN BOTH
+BREADTH BUCKET BULK BY BYTE CALL CALLED CALLING CAPACITY CASCADE CASCADED CASE CAST CATALOG CHAR
+CHARACTER CHECK CLASS CLOB CLOSE CLUSTER CLUSTERED CLUSTERING CLUSTERS COALESCE COLLATE COLLATION
+COLLECTION COLUMN COLUMNS COMBINE COMMENT COMMIT COMPACT COMPILE COMPRESS CONDITION CONFLICT CONNECT
+CONNECTION CONSISTENCY CONSISTENT CONSTRAINT CONSTRAINTS CONSTRUCTOR CONSUMED CONTINUE CONVERT COPY
+CORRESPONDING COUNT COUNTER CREATE CROSS CUBE CURRENT CURSOR CYCLE DATA DATABASE DATE DATETIME DAY
+DEALLOCATE DEC DECIMAL DECLARE DEFAULT DEFERRABLE DEFERRED DEFINE DEFINED DEFINITION DELETE
+DELIMITED DEPTH DEREF DESC DESCRIBE DESCRIPTOR DETACH DETERMINISTIC DIAGNOSTICS DIRECTORIES DISABLE
+DISCONNECT DISTINCT DISTRIBUTE DO DOMAIN DOUBLE DROP DUMP DURATION DYNAMIC EACH ELEMENT ELSE ELSEIF
+EMPTY ENABLE END EQUAL EQUALS ERROR ESCAPE ESCAPED EVAL EVALUATE EXCEEDED EXCEPT EXCEPTION
+EXCEPTIONS EXCLUSIVE EXEC EXECUTE EXISTS EXIT EXPLAIN EXPLODE EXPORT EXPRESSION EXTENDED EXTERNAL
+EXTRACT FAIL FALSE FAMILY FETCH FIELDS FILE FILTER FILTERING FINAL FINISH FIRST FIXED FLATTERN FLOAT
+FOR FORCE FOREIGN FORMAT FORWARD FOUND FREE FROM FULL FUNCTION FUNCTIONS GENERAL GENERATE GET GLOB
+GLOBAL GO GOTO GRANT GREATER GROUP GROUPING HANDLER HASH HAVE HAVING HEAP HIDDEN HOLD HOUR
+IDENTIFIED IDENTITY IF IGNORE IMMEDIATE IMPORT IN INCLUDING INCLUSIVE INCREMENT INCREMENTAL INDEX
+INDEXED INDEXES INDICATOR INFINITE INITIALLY INLINE INNER INNTER INOUT INPUT INSENSITIVE INSERT
+INSTEAD INT INTEGER INTERSECT INTERVAL INTO INVALIDATE IS ISOLATION ITEM ITEMS ITERATE JOIN KEY KEYS
+LAG LANGUAGE LARGE LAST LATERAL LEAD LEADING LEAVE LEFT LENGTH LESS LEVEL LIKE LIMIT LIMITED LINES
+LIST LOAD LOCAL LOCALTIME LOCALTIMESTAMP LOCATION LOCATOR LOCK LOCKS LOG LOGED LONG LOOP LOWER MAP
+MATCH MATERIALIZED MAX MAXLEN MEMBER MERGE METHOD METRICS MIN MINUS MINUTE MISSING MOD MODE MODIFIES
+MODIFY MODULE MONTH MULTI MULTISET NAME NAMES NATIONAL NATURAL NCHAR NCLOB NEW NEXT NO NONE NOT NULL
+NULLIF NUMBER NUMERIC OBJECT OF OFFLINE OFFSET OLD ON ONLINE ONLY OPAQUE OPEN OPERATOR OPTION OR
+ORDER ORDINALITY OTHER OTHERS OUT OUTER OUTPUT OVER OVERLAPS OVERRIDE OWNER PAD PARALLEL PARAMETER
+PARAMETERS PARTIAL PARTITION PARTITIONED PARTITIONS PATH PERCENT PERCENTILE PERMISSION PERMISSIONS
+PIPE PIPELINED PLAN POOL POSITION PRECISION PREPARE PRESERVE PRIMARY PRIOR PRIVATE PRIVILEGES
+PROCEDURE PROCESSED PROJECT PROJECTION PROPERTY PROVISIONING PUBLIC PUT QUERY QUIT QUORUM RAISE
+RANDOM RANGE RANK RAW READ READS REAL REBUILD RECORD RECURSIVE REDUCE REF REFERENCE REFERENCES
+REFERENCING REGEXP REGION REINDEX RELATIVE RELEASE REMAINDER RENAME REPEAT REPLACE REQUEST RESET
+RESIGNAL RESOURCE RESPONSE RESTORE RESTRICT RESULT RETURN RETURNING RETURNS REVERSE REVOKE RIGHT
+ROLE ROLES ROLLBACK ROLLUP ROUTINE ROW ROWS RULE RULES SAMPLE SATISFIES SAVE SAVEPOINT SCAN SCHEMA
+SCOPE SCROLL SEARCH SECOND SECTION SEGMENT SEGMENTS SELECT SELF SEMI SENSITIVE SEPARATE SEQUENCE
+SERIALIZABLE SESSION SET SETS SHARD SHARE SHARED SHORT SHOW SIGNAL SIMILAR SIZE SKEWED SMALLINT
+SNAPSHOT SOME SOURCE SPACE SPACES SPARSE SPECIFIC SPECIFICTYPE SPLIT SQL SQLCODE SQLERROR
+SQLEXCEPTION SQLSTATE SQLWARNING START STATE STATIC STATUS STORAGE STORE STORED STREAM STRING STRUCT
+STYLE SUB SUBMULTISET SUBPARTITION SUBSTRING SUBTYPE SUM SUPER SYMMETRIC SYNONYM SYSTEM TABLE
+TABLESAMPLE TEMP TEMPORARY TERMINATED TEXT THAN THEN THROUGHPUT TIME TIMESTAMP TIMEZONE TINYINT TO
+TOKEN TOTAL TOUCH TRAILING TRANSACTION TRANSFORM TRANSLATE TRANSLATION TREAT TRIGGER TRIM TRUE
+TRUNCATE TTL TUPLE TYPE UNDER UNDO UNION UNIQUE UNIT UNKNOWN UNLOGGED UNNEST UNPROCESSED UNSIGNED
+UNTIL UPDATE UPPER URL USAGE USE USER USERS USING UUID VACUUM VALUE VALUED VALUES VARCHAR VARIABLE
+VARIANCE VARINT VARYING VIEW VIEWS VIRTUAL VOID WAIT WHEN WHENEVER WHERE WHILE WINDOW WITH WITHIN
+WITHOUT WORK WRAPPED WRITE YEAR ZONE
+""".split())
+
+_CONDITION_FUNCTIONS = ('attribute_exists', 'attribute_not_exists', 'attribute_type', 'begins_with', 'contains')
+_COMPARATORS = ('=', '<>', '<', '<=', '>', '>=')
+
+
+def type_of(value: Any) -> str:
+    """
+    Get the DynamoDB type descriptor of a Python value.
+
+    Args:
+        value: Value as stored by the engine
+
+    Returns:
+        One of S, N, B, BOOL, NULL, M, L, SS, NS, BS
+    """
+    if isinstance(value, str):
+        return 'S'
+    if isinstance(value, bool):
+        return 'BOOL'
+    if isinstance(value, (Decimal, int)):
+        return 'N'
+    if isinstance(value, (bytes, bytearray)):
+        return 'B'
+    if value is None:
+        return 'NULL'
+    if isinstance(value, dict):
+        return 'M'
+    if isinstance(value, list):
+        return 'L'
+    if isinstance(value, (set, frozenset)):
+        element = next(iter(value), '')
+        return {'S': 'SS', 'N': 'NS', 'B': 'BS'}.get(type_of(element), 'SS')
+    raise ExpressionError(f"Unsupported type: {type(value).__name__}")
+
+
+def get_path(item: Dict[str, Any], path: Path) -> Any:
+    """
+    Resolve a document path in an item.
+
+    Args:
+        item: Item to read from
+        path: Attribute names and list indexes
+
+    Returns:
+        The value at the path, or MISSING
+    """
+    value: Any = item
+    for element in path:
+        if isinstance(element, int):
+            if not isinstance(value, list) or element >= len(value):
+                return MISSING
+        elif not isinstance(value, dict) or element not in value:
+            return MISSING
+        value = value[element]
+    return value
+
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    """Compare two operands with DynamoDB semantics."""
+    if left is MISSING or right is MISSING:
+        return operator == '<>'
+    left_type, right_type = type_of(left), type_of(right)
+    if operator == '=':
+        return left_type == right_type and left == right
+    if operator == '<>':
+        return left_type != right_type or left != right
+    if left_type != right_type or left_type not in ('S', 'N', 'B'):
+        return False
+    if operator == '<':
+        return left < right
+    if operator == '<=':
+        return left <= right
+    if operator == '>':
+        return left > right
+    return left >= right
+
+
+class _Parser:
+    """Recursive-descent parser producing closures."""
+
+    def __init__(self, expression: str, names: Dict[str, str], kind: str = 'ConditionExpression'):
+        self.expression = expression
+        self.names = names
+        self.kind = kind
+        self.tokens = self._tokenize(expression)
+        self.position = 0
+        self.used_names: set = set()
+        self.used_values: set = set()
+
+    def _tokenize(self, expression: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN_RE.match(expression, position)
+            if not match or match.end() == position:
+                raise ExpressionError(
+                    f"Invalid expression: syntax error near \"{expression[position:position + 10].strip()}\""
+                )
+            kind = match.lastgroup
+            tokens.append((kind, match.group(kind)))
+            position = match.end()
+        return tokens
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self) -> Tuple[Optional[str], Optional[str]]:
+        token = self.peek()
+        if token[0] is None:
+            raise ExpressionError(f"Invalid expression: unexpected end of input: {self.expression}")
+        self.position += 1
+        return token
+
+    def at_end(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    def accept(self, text: str) -> bool:
+        kind, value = self.peek()
+        if kind == 'op' and value == text:
+            self.position += 1
+            return True
+        return False
+
+    def accept_keyword(self, keyword: str) -> bool:
+        kind, value = self.peek()
+        if kind == 'ident' and value.upper() == keyword:
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, text: str) -> None:
+        if not self.accept(text):
+            raise ExpressionError(f"Invalid expression: expected \"{text}\" in: {self.expression}")
+
+    def finish(self) -> None:
+        if not self.at_end():
+            raise ExpressionError(f"Invalid expression: unexpected token \"{self.peek()[1]}\" in: {self.expression}")
+
+    # Operands
+
+    def _name(self) -> str:
+        kind, value = self.next()
+        if kind == 'name':
+            if value not in self.names:
+                raise ExpressionError(
+                    f"An expression attribute name used in the document path is not defined; attribute name: {value}"
+                )
+            self.used_names.add(value)
+            return self.names[value]
+        if kind == 'ident':
+            if value.upper() in RESERVED_WORDS:
+                raise ExpressionError(
+                    f"Invalid {self.kind}: Attribute name is a reserved keyword; reserved keyword: {value}"
+                )
+            return value
+        raise ExpressionError(f"Invalid expression: expected an attribute name in: {self.expression}")
+
+    def path(self) -> Path:
+        elements: List[PathElement] = [self._name()]
+        while True:
+            if self.accept('.'):
+                elements.append(self._name())
+            elif self.accept('['):
+                kind, value = self.next()
+                if kind != 'number':
+                    raise ExpressionError(f"Invalid expression: expected a list index in: {self.expression}")
+                elements.append(int(value))
+                self.expect(']')
+            else:
+                return tuple(elements)
+
+    def _value(self) -> Callable[[Dict[str, Any], Values], Any]:
+        _, placeholder = self.next()
+        self.used_values.add(placeholder)
+
+        def value(item: Dict[str, Any], values: Values) -> Any:
+            try:
+                return values[placeholder]
+            except KeyError:
+                raise ExpressionError(
+                    f"An expression attribute value used in expression is not defined; attribute value: {placeholder}"
+                )
+        return value
+
+    def operand(self) -> Callable[[Dict[str, Any], Values], Any]:
+        kind, value = self.peek()
+        if kind == 'value':
+            return self._value()
+        if kind == 'ident' and value == 'size' and self.peek(1) == ('op', '('):
+            self.position += 2
+            target = self.operand()
+            self.expect(')')
+
+            def size(item: Dict[str, Any], values: Values) -> Any:
+                resolved = target(item, values)
+                if isinstance(resolved, (str, bytes, bytearray, list, dict, set, frozenset)):
+                    return Decimal(len(resolved))
+                return MISSING
+            return size
+        path = self.path()
+        return lambda item, values: get_path(item, path)
+
+    # Conditions
+
+    def condition(self) -> Callable[[Dict[str, Any], Values], bool]:
+        left = self._and()
+        while self.accept_keyword('OR'):
+            right = self._and()
+            left = (lambda a, b: lambda item, values: a(item, values) or b(item, values))(left, right)
+        return left
+
+    def _and(self) -> Callable[[Dict[str, Any], Values], bool]:
+        left = self._not()
+        while self.accept_keyword('AND'):
+            right = self._not()
+            left = (lambda a, b: lambda item, values: a(item, values) and b(item, values))(left, right)
+        return left
+
+    def _not(self) -> Callable[[Dict[str, Any], Values], bool]:
+        if self.accept_keyword('NOT'):
+            inner = self._not()
+            return lambda item, values: not inner(item, values)
+        return self._primary()
+
+    def _primary(self) -> Callable[[Dict[str, Any], Values], bool]:
+        if self.accept('('):
+            inner = self.condition()
+            self.expect(')')
+            return inner
+        kind, value = self.peek()
+        if kind == 'ident' and value in _CONDITION_FUNCTIONS and self.peek(1) == ('op', '('):
+            return self._function()
+        left = self.operand()
+        if self.accept_keyword('BETWEEN'):
+            low = self.operand()
+            if not self.accept_keyword('AND'):
+                raise ExpressionError(f"Invalid expression: BETWEEN requires AND in: {self.expression}")
+            high = self.operand()
+            return lambda item, values: (
+                _compare('>=', left(item, values), low(item, values))
+                and _compare('<=', left(item, values), high(item, values))
+            )
+        if self.accept_keyword('IN'):
+            self.expect('(')
+            candidates = [self.operand()]
+            while self.accept(','):
+                candidates.append(self.operand())
+            self.expect(')')
+            return lambda item, values: any(
+                _compare('=', left(item, values), candidate(item, values)) for candidate in candidates
+            )
+        kind, operator = self.next()
+        if kind != 'op' or operator not in _COMPARATORS:
+            raise ExpressionError(f"Invalid expression: expected a comparator in: {self.expression}")
+        right = self.operand()
+        return lambda item, values: _compare(operator, left(item, values), right(item, values))
+
+    def _function(self) -> Callable[[Dict[str, Any], Values], bool]:
+        _, function = self.next()
+        self.expect('(')
+        if function in ('attribute_exists', 'attribute_not_exists'):
+            path = self.path()
+            self.expect(')')
+            if function == 'attribute_exists':
+                return lambda item, values: get_path(item, path) is not MISSING
+            return lambda item, values: get_path(item, path) is MISSING
+        path = self.path()
+        self.expect(',')
+        argument = self.operand()
+        self.expect(')')
+        if function == 'attribute_type':
+            return lambda item, values: (
+                get_path(item, path) is not MISSING and type_of(get_path(item, path)) == argument(item, values)
+            )
+        if function == 'begins_with':
+            def begins_with(item: Dict[str, Any], values: Values) -> bool:
+                value, prefix = get_path(item, path), argument(item, values)
+                if isinstance(value, str) and isinstance(prefix, str):
+                    return value.startswith(prefix)
+                if isinstance(value, (bytes, bytearray)) and isinstance(prefix, (bytes, bytearray)):
+                    return value.startswith(prefix)
+                return False
+            return begins_with
+
+        def contains(item: Dict[str, Any], values: Values) -> bool:
+            value, operand = get_path(item, path), argument(item, values)
+            if isinstance(value, str):
+                return isinstance(operand, str) and operand in value
+            if isinstance(value, (bytes, bytearray)):
+                return isinstance(operand, (bytes, bytearray)) and operand in value
+            if isinstance(value, (set, frozenset, list)):
+                return operand in value
+            return False
+        return contains
+
+
+class CompiledExpression:
+    """A parsed expression together with the placeholders it references."""
+
+    def __init__(self, function: Any, used_names: FrozenSet[str], used_values: FrozenSet[str]):
+        self.function = function
+        self.used_names = used_names
+        self.used_values = used_values
+
+
+def _names_key(names: Optional[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((names or {}).items()))
+
+
+@lru_cache(maxsize=2048)
+def _compile_condition(expression: str, names: Tuple[Tuple[str, str], ...], kind: str) -> CompiledExpression:
+    parser = _Parser(expression, dict(names), kind)
+    function = parser.condition()
+    parser.finish()
+    return CompiledExpression(function, frozenset(parser.used_names), frozenset(parser.used_values))
+
+
+def compile_condition(
+    expression: str,
+    names: Optional[Dict[str, str]] = None,
+    kind: str = 'ConditionExpression'
+) -> CompiledExpression:
+    """
+    Compile a condition or filter expression.
+
+    Args:
+        expression: ConditionExpression or FilterExpression
+        names: ExpressionAttributeNames
+        kind: Parameter the expression was given in, for error messages
+
+    Returns:
+        CompiledExpression whose function maps (item, values) to a bool
+
+    Raises:
+        ExpressionError: If the expression is invalid
+    """
+    return _compile_condition(expression, _names_key(names), kind)
+
+
+@lru_cache(maxsize=1024)
+def _compile_projection(expression: str, names: Tuple[Tuple[str, str], ...]) -> CompiledExpression:
+    parser = _Parser(expression, dict(names), 'ProjectionExpression')
+    paths = [parser.path()]
+    while parser.accept(','):
+        paths.append(parser.path())
+    parser.finish()
+    return CompiledExpression(tuple(paths), frozenset(parser.used_names), frozenset())
+
+
+def compile_projection(expression: str, names: Optional[Dict[str, str]] = None) -> CompiledExpression:
+    """
+    Compile a projection expression.
+
+    Args:
+        expression: ProjectionExpression
+        names: ExpressionAttributeNames
+
+    Returns:
+        CompiledExpression whose function is the tuple of projected paths
+
+    Raises:
+        ExpressionError: If the expression is invalid
+    """
+    return _compile_projection(expression, _names_key(names))
+
+
+def project(item: Dict[str, Any], paths: Sequence[Path]) -> Dict[str, Any]:
+    """
+    Keep only the given document paths of an item.
+
+    Args:
+        item: Item to project
+        paths: Paths from compile_projection
+
+    Returns:
+        New item with the projected attributes
+    """
+    result: Dict[str, Any] = {}
+    for path in paths:
+        value = get_path(item, path)
+        if value is MISSING:
+            continue
+        target: Any = result
+        for element, next_element in zip(path, path[1:]):
+            container: Any = [] if isinstance(next_element, int) else {}
+            if isinstance(target, list):
+                target.append(container)
+                target = container
+            else:
+                target = target.setdefault(element, container)
+        if isinstance(target, list):
+            target.append(value)
+        else:
+            target[path[-1]] = value
+    return result
+
+
+class KeyCondition:
+    """Partition key value and sort key range extracted from a KeyConditionExpression."""
+
+    def __init__(self, partition_value: Any, operator: Optional[str] = None, operands: Tuple[Any, ...] = ()):
+        """
+        Initialize KeyCondition.
+
+        Args:
+            partition_value: Required value of the partition key
+            operator: Sort key operator (=, <, <=, >, >=, BETWEEN, begins_with) or None
+            operands: Operand values of the sort key condition
+        """
+        self.partition_value = partition_value
+        self.operator = operator
+        self.operands = operands
+
+
+@lru_cache(maxsize=1024)
+def _parse_key_condition(
+    expression: str,
+    names: Tuple[Tuple[str, str], ...],
+    hash_key: str,
+    range_key: Optional[str]
+) -> Tuple[Tuple[Any, ...], Optional[Tuple[Any, ...]], FrozenSet[str], FrozenSet[str]]:
+    parser = _Parser(expression, dict(names), 'KeyConditionExpression')
+    conditions = []
+    while True:
+        parenthesized = parser.accept('(')
+        kind, value = parser.peek()
+        if kind == 'ident' and value == 'begins_with' and parser.peek(1) == ('op', '('):
+            parser.position += 2
+            path = parser.path()
+            parser.expect(',')
+            _, placeholder = parser.next()
+            parser.expect(')')
+            conditions.append((path, 'begins_with', (placeholder,)))
+        else:
+            path = parser.path()
+            if parser.accept_keyword('BETWEEN'):
+                _, low = parser.next()
+                if not parser.accept_keyword('AND'):
+                    raise ExpressionError(f"Invalid KeyConditionExpression: {expression}")
+                _, high = parser.next()
+                conditions.append((path, 'BETWEEN', (low, high)))
+            else:
+                kind, operator = parser.next()
+                if kind != 'op' or operator not in ('=', '<', '<=', '>', '>='):
+                    raise ExpressionError(f"Invalid KeyConditionExpression: unsupported operator in {expression}")
+                _, placeholder = parser.next()
+                conditions.append((path, operator, (placeholder,)))
+        if parenthesized:
+            parser.expect(')')
+        if not parser.accept_keyword('AND'):
+            break
+    parser.finish()
+
+    partition = None
+    sort = None
+    for path, operator, placeholders in conditions:
+        for placeholder in placeholders:
+            if not placeholder.startswith(':'):
+                raise ExpressionError(f"Invalid KeyConditionExpression: operands must be values in {expression}")
+            parser.used_values.add(placeholder)
+        if len(path) != 1:
+            raise ExpressionError(f"Invalid KeyConditionExpression: nested paths are not allowed in {expression}")
+        if path[0] == hash_key and operator == '=' and partition is None:
+            partition = placeholders
+        elif path[0] == range_key and sort is None:
+            sort = (operator,) + placeholders
+        else:
+            raise ExpressionError(f"Query condition missed key schema element or has an invalid operator: {expression}")
+    if partition is None:
+        raise ExpressionError(f"Query condition missed key schema element: {hash_key}")
+    return partition, sort, frozenset(parser.used_names), frozenset(parser.used_values)
+
+
+def compile_key_condition(
+    expression: str,
+    names: Optional[Dict[str, str]],
+    values: Values,
+    hash_key: str,
+    range_key: Optional[str]
+) -> Tuple[KeyCondition, FrozenSet[str], FrozenSet[str]]:
+    """
+    Parse a KeyConditionExpression against a key schema.
+
+    Args:
+        expression: KeyConditionExpression
+        names: ExpressionAttributeNames
+        values: ExpressionAttributeValues
+        hash_key: Partition key attribute of the table or index
+        range_key: Sort key attribute of the table or index, if any
+
+    Returns:
+        Tuple of (KeyCondition, used names, used values)
+
+    Raises:
+        ExpressionError: If the expression is invalid for the key schema
+    """
+    partition, sort, used_names, used_values = _parse_key_condition(
+        expression, _names_key(names), hash_key, range_key
+    )
+    missing = [placeholder for placeholder in used_values if placeholder not in values]
+    if missing:
+        raise ExpressionError(
+            f"An expression attribute value used in expression is not defined; attribute value: {missing[0]}"
+        )
+    condition = KeyCondition(values[partition[0]])
+    if sort:
+        condition.operator = sort[0]
+        condition.operands = tuple(values[placeholder] for placeholder in sort[1:])
+    return condition, used_names, used_values
+
+
+class _UpdateParser(_Parser):
+    """Parser for UpdateExpression clauses."""
+
+    def set_value(self) -> Callable[[Dict[str, Any], Values], Any]:
+        left = self._set_operand()
+        if self.accept('+'):
+            right = self._set_operand()
+            return lambda item, values: _arithmetic('+', left(item, values), right(item, values))
+        if self.accept('-'):
+            right = self._set_operand()
+            return lambda item, values: _arithmetic('-', left(item, values), right(item, values))
+        return left
+
+    def _set_operand(self) -> Callable[[Dict[str, Any], Values], Any]:
+        kind, value = self.peek()
+        if kind == 'ident' and value == 'if_not_exists' and self.peek(1) == ('op', '('):
+            self.position += 2
+            path = self.path()
+            self.expect(',')
+            default = self._set_operand()
+            self.expect(')')
+
+            def if_not_exists(item: Dict[str, Any], values: Values) -> Any:
+                current = get_path(item, path)
+                return default(item, values) if current is MISSING else current
+            return if_not_exists
+        if kind == 'ident' and value == 'list_append' and self.peek(1) == ('op', '('):
+            self.position += 2
+            first = self._set_operand()
+            self.expect(',')
+            second = self._set_operand()
+            self.expect(')')
+
+            def list_append(item: Dict[str, Any], values: Values) -> Any:
+                a, b = first(item, values), second(item, values)
+                if not isinstance(a, list) or not isinstance(b, list):
+                    raise ExpressionError("An operand in the update expression has an incorrect data type")
+                return a + b
+            return list_append
+        return self.operand()
+
+
+def _arithmetic(operator: str, left: Any, right: Any) -> Decimal:
+    """Add or subtract two numbers in an update expression."""
+    if left is MISSING or right is MISSING:
+        raise ExpressionError("The provided expression refers to an attribute that does not exist in the item")
+    if type_of(left) != 'N' or type_of(right) != 'N':
+        raise ExpressionError("An operand in the update expression has an incorrect data type")
+    return Decimal(left) + Decimal(right) if operator == '+' else Decimal(left) - Decimal(right)
+
+
+class UpdatePlan:
+    """Compiled UpdateExpression."""
+
+    def __init__(self):
+        self.sets: List[Tuple[Path, Callable]] = []
+        self.removes: List[Path] = []
+        self.adds: List[Tuple[Path, Callable]] = []
+        self.deletes: List[Tuple[Path, Callable]] = []
+
+    @property
+    def paths(self) -> List[Path]:
+        """All document paths written by the update."""
+        return (
+            [path for path, _ in self.sets] + self.removes
+            + [path for path, _ in self.adds] + [path for path, _ in self.deletes]
+        )
+
+    def apply(self, item: Dict[str, Any], values: Values, copy: Callable[[Any], Any]) -> Dict[str, Any]:
+        """
+        Apply the update to an item.
+
+        Args:
+            item: Current item (or key attributes only if it does not exist)
+            values: ExpressionAttributeValues
+            copy: Function deep-copying an item
+
+        Returns:
+            The updated item; ``item`` itself is left unchanged
+
+        Raises:
+            ExpressionError: If an operand is missing or has the wrong type
+        """
+        assignments = [(path, function(item, values)) for path, function in self.sets]
+        additions = [(path, function(item, values)) for path, function in self.adds]
+        deletions = [(path, function(item, values)) for path, function in self.deletes]
+        updated = copy(item)
+        for path, value in assignments:
+            if value is MISSING:
+                raise ExpressionError("The provided expression refers to an attribute that does not exist in the item")
+            _set_path(updated, path, value)
+        for path in self.removes:
+            _remove_path(updated, path)
+        for path, value in additions:
+            current = get_path(item, path)
+            value_type = type_of(value)
+            if value_type == 'N':
+                if current is not MISSING and type_of(current) != 'N':
+                    raise ExpressionError("An operand in the update expression has an incorrect data type")
+                _set_path(updated, path, (Decimal(0) if current is MISSING else current) + value)
+            elif value_type in ('SS', 'NS', 'BS'):
+                if current is not MISSING and type_of(current) != value_type:
+                    raise ExpressionError("An operand in the update expression has an incorrect data type")
+                _set_path(updated, path, (set() if current is MISSING else set(current)) | set(value))
+            else:
+                raise ExpressionError("Incorrect operand type for operator or function; operator: ADD")
+        for path, value in deletions:
+            current = get_path(item, path)
+            if current is MISSING:
+                continue
+            if type_of(value) not in ('SS', 'NS', 'BS') or type_of(current) != type_of(value):
+                raise ExpressionError("Incorrect operand type for operator or function; operator: DELETE")
+            remaining = set(current) - set(value)
+            if remaining:
+                _set_path(updated, path, remaining)
+            else:
+                _remove_path(updated, path)
+        return updated
+
+
+def _set_path(item: Dict[str, Any], path: Path, value: Any) -> None:
+    """Assign a value at a document path; the parent must exist."""
+    parent = get_path(item, path[:-1]) if len(path) > 1 else item
+    last = path[-1]
+    if isinstance(last, int):
+        if not isinstance(parent, list):
+            raise ExpressionError("The document path provided in the update expression is invalid for update")
+        if last >= len(parent):
+            parent.append(value)
+        else:
+            parent[last] = value
+    else:
+        if not isinstance(parent, dict):
+            raise ExpressionError("The document path provided in the update expression is invalid for update")
+        parent[last] = value
+
+
+def _remove_path(item: Dict[str, Any], path: Path) -> None:
+    """Remove the value at a document path if present."""
+    parent = get_path(item, path[:-1]) if len(path) > 1 else item
+    last = path[-1]
+    if isinstance(last, int):
+        if isinstance(parent, list) and last < len(parent):
+            del parent[last]
+    elif isinstance(parent, dict):
+        parent.pop(last, None)
+
+
+@lru_cache(maxsize=1024)
+def _compile_update(expression: str, names: Tuple[Tuple[str, str], ...]) -> CompiledExpression:
+    parser = _UpdateParser(expression, dict(names), 'UpdateExpression')
+    plan = UpdatePlan()
+    seen_clauses = set()
+    while not parser.at_end():
+        kind, clause = parser.next()
+        clause = clause.upper() if kind == 'ident' else clause
+        if clause not in ('SET', 'REMOVE', 'ADD', 'DELETE') or clause in seen_clauses:
+            raise ExpressionError(f"Invalid UpdateExpression: syntax error near \"{clause}\"")
+        seen_clauses.add(clause)
+        while True:
+            path = parser.path()
+            if clause == 'SET':
+                parser.expect('=')
+                plan.sets.append((path, parser.set_value()))
+            elif clause == 'REMOVE':
+                plan.removes.append(path)
+            elif clause == 'ADD':
+                plan.adds.append((path, parser.operand()))
+            else:
+                plan.deletes.append((path, parser.operand()))
+            if not parser.accept(','):
+                break
+    if not seen_clauses:
+        raise ExpressionError("Invalid UpdateExpression: the expression can not be empty")
+    paths = plan.paths
+    for index, path in enumerate(paths):
+        for other in paths[index + 1:]:
+            shorter = min(len(path), len(other))
+            if path[:shorter] == other[:shorter]:
+                raise ExpressionError(
+                    f"Invalid UpdateExpression: Two document paths overlap with each other; "
+                    f"[{'.'.join(map(str, path))}, {'.'.join(map(str, other))}]"
+                )
+    return CompiledExpression(plan, frozenset(parser.used_names), frozenset(parser.used_values))
+
+
+def compile_update(expression: str, names: Optional[Dict[str, str]] = None) -> CompiledExpression:
+    """
+    Compile an update expression.
+
+    Args:
+        expression: UpdateExpression
+        names: ExpressionAttributeNames
+
+    Returns:
+        CompiledExpression whose function is an UpdatePlan
+
+    Raises:
+        ExpressionError: If the expression is invalid
+    """
+    return _compile_update(expression, _names_key(names))
@@ -2,15 +2,69 @@
 Events API - Main application entry point.
 
 This module initializes the FastAPI application and registers all API routers.
+
+With ``LAZY_ROUTERS`` enabled the routers (and, through them, the services
+and models) are imported on the first request instead of at module load,
+which keeps Lambda cold-start import time down.
 """
 
+import asyncio
+import importlib
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from mangum import Mangum
 
-from .events.api import router as events_router
-from .users.api import router as users_router
-from .registrations.api import router as registrations_router
+from .core.config import get_config
+
+
+# Modules providing an APIRouter named ``router``, in registration order
+ROUTER_MODULES = (
+    ".events.api",
+    ".users.api",
+    ".registrations.api",
+    ".exports.api",
+)
+
+
+def include_routers(app: FastAPI) -> None:
+    """
+    Import the API modules and register their routers.
+
+    Args:
+        app: FastAPI application
+    """
+    for module_name in ROUTER_MODULES:
+        module = importlib.import_module(module_name, __package__)
+        app.include_router(module.router)
+
+
+class LazyRoutersMiddleware:
+    """ASGI middleware that registers the API routers on the first request."""
+
+    def __init__(self, app, fastapi_app: FastAPI):
+        """
+        Initialize LazyRoutersMiddleware.
+
+        Args:
+            app: Next ASGI application in the middleware stack
+            fastapi_app: Application to register the routers on
+        """
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self._loaded = False
+        # Requests arriving during the one-off import wait without blocking
+        # the event loop on a thread lock
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if not self._loaded and scope["type"] in ("http", "websocket"):
+            async with self._lock:
+                if not self._loaded:
+                    include_routers(self.fastapi_app)
+                    self._loaded = True
+        await self.app(scope, receive, send)
+
 
 app = FastAPI(
     title="Events API",
@@ -25,12 +79,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Token", "Server-Timing", "ETag"],
 )
 
+# Per-request DynamoDB call accounting
+if get_config().dynamodb_metrics:
+    from .core.metrics import MetricsMiddleware
+
+    app.add_middleware(MetricsMiddleware)
+
 # Register API routers
-app.include_router(events_router)
-app.include_router(users_router)
-app.include_router(registrations_router)
+if get_config().lazy_routers:
+    app.add_middleware(LazyRoutersMiddleware, fastapi_app=app)
+else:
+    include_routers(app)
 
 # Lambda handler
 handler = Mangum(app)
@@ -0,0 +1,250 @@
+"""
+Data migrations for the Events table.
+
+Each migration is idempotent and only touches items that still need it, so
+it is safe to re-run after a partial failure. Run from the command line with:
+
+    python -m backend.migrations <migration-name>
+"""
+
+import argparse
+import sys
+from typing import Callable, Dict, Optional, List, Any
+
+from botocore.exceptions import ClientError
+
+from .core.config import Config, get_config
+from .core.exceptions import TransactionCanceledError
+from .core.scan import parallel_scan
+from .core.transactions import transact_write
+from .events.repository import EVENT_INDEX_PARTITION, event_index_sort_key
+from .registrations.repository import RegistrationRepository, user_index_keys, waitlist_sort_key
+
+
+def _set_attributes(table, item: Dict[str, Any], attributes: Dict[str, Any]) -> bool:
+    """
+    Set attributes on an existing item without resurrecting deleted ones.
+
+    Args:
+        table: DynamoDB Table resource
+        item: Item (at least PK and SK) to update
+        attributes: Attribute names and values to set
+
+    Returns:
+        True if updated, False if the item was deleted in the meantime
+    """
+    try:
+        table.update_item(
+            Key={'PK': item['PK'], 'SK': item['SK']},
+            UpdateExpression='SET ' + ', '.join(f"{name} = :{name}" for name in attributes),
+            ConditionExpression='attribute_exists(PK)',
+            ExpressionAttributeValues={f":{name}": value for name, value in attributes.items()}
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+
+def backfill_event_index(config: Config, segments: int = 1) -> int:
+    """
+    Populate the listing index keys (GSI1PK/GSI1SK) on existing event items.
+
+    Args:
+        config: Application configuration
+        segments: Parallel scan segments
+
+    Returns:
+        Number of event items updated
+    """
+    table = config.get_table()
+    scan_kwargs = {
+        'FilterExpression': 'begins_with(PK, :pk) AND begins_with(SK, :sk) AND attribute_not_exists(GSI1SK)',
+        'ProjectionExpression': 'PK, SK, eventId, #status, #date',
+        'ExpressionAttributeNames': {'#status': 'status', '#date': 'date'},
+        'ExpressionAttributeValues': {':pk': 'EVENT#', ':sk': 'EVENT#'},
+    }
+    updated = 0
+    for page in parallel_scan(table, segments, **scan_kwargs):
+        for item in page.items:
+            attributes = {
+                'GSI1PK': EVENT_INDEX_PARTITION,
+                'GSI1SK': event_index_sort_key(item['status'], item['date'], item['eventId'])
+            }
+            if _set_attributes(table, item, attributes):
+                updated += 1
+    return updated
+
+
+def backfill_registration_index(config: Config, segments: int = 1) -> int:
+    """
+    Populate the user index keys (GSI2PK/GSI2SK) on existing registration items.
+
+    Args:
+        config: Application configuration
+        segments: Parallel scan segments
+
+    Returns:
+        Number of registration items updated
+    """
+    table = config.get_table()
+    scan_kwargs = {
+        'FilterExpression': 'begins_with(PK, :pk) AND begins_with(SK, :sk) AND attribute_not_exists(GSI2PK)',
+        'ProjectionExpression': 'PK, SK, userId, eventId',
+        'ExpressionAttributeValues': {':pk': 'EVENT#', ':sk': 'USER#'},
+    }
+    updated = 0
+    for page in parallel_scan(table, segments, **scan_kwargs):
+        for item in page.items:
+            if _set_attributes(table, item, user_index_keys(item['userId'], item['eventId'])):
+                updated += 1
+    return updated
+
+
+def backfill_registration_counters(config: Config, segments: int = 1) -> int:
+    """
+    Materialize registeredCount/waitlistCount on events that predate them.
+
+    Args:
+        config: Application configuration
+        segments: Parallel scan segments
+
+    Returns:
+        Number of event items updated
+    """
+    table = config.get_table()
+    scan_kwargs = {
+        'FilterExpression': 'begins_with(PK, :pk) AND begins_with(SK, :sk) AND attribute_not_exists(registeredCount)',
+        'ProjectionExpression': 'PK, SK',
+        'ExpressionAttributeValues': {':pk': 'EVENT#', ':sk': 'EVENT#'},
+    }
+    registrations = RegistrationRepository(config)
+    updated = 0
+    for page in parallel_scan(table, segments, **scan_kwargs):
+        for item in page.items:
+            counts = registrations.count_by_event(item['PK'][len('EVENT#'):])
+            attributes = {'registeredCount': counts['registered'], 'waitlistCount': counts['waitlisted']}
+            if _set_attributes(table, item, attributes):
+                updated += 1
+    return updated
+
+
+def backfill_waitlist_entries(config: Config, segments: int = 1) -> int:
+    """
+    Create sequence-keyed WAIT# entries for waitlisted registrations that predate them.
+
+    Existing waitlists keep their order: registrations are sequenced by
+    their old waitlistPosition and then by registeredAt. Each registration
+    gets its sequence number and its entry in one transaction, so a crash
+    never leaves a sequenced registration without an entry.
+
+    Run it before the new code takes traffic. The block of sequence numbers
+    is reserved after any handed out to users who joined since the deploy,
+    so legacy waiters would otherwise queue behind them.
+
+    Args:
+        config: Application configuration
+        segments: Parallel scan segments
+
+    Returns:
+        Number of registrations given a waitlist entry
+    """
+    table = config.get_table()
+    scan_kwargs = {
+        'FilterExpression': (
+            'begins_with(PK, :pk) AND begins_with(SK, :sk) AND #status = :waitlisted '
+            'AND attribute_not_exists(waitlistSeq)'
+        ),
+        'ProjectionExpression': 'PK, SK, userId, eventId, waitlistPosition, registeredAt',
+        'ExpressionAttributeNames': {'#status': 'status'},
+        'ExpressionAttributeValues': {':pk': 'EVENT#', ':sk': 'USER#', ':waitlisted': 'waitlisted'},
+    }
+    by_event: Dict[str, List[Dict[str, Any]]] = {}
+    for page in parallel_scan(table, segments, **scan_kwargs):
+        for item in page.items:
+            by_event.setdefault(item['eventId'], []).append(item)
+
+    updated = 0
+    for event_id, registrations in by_event.items():
+        registrations.sort(key=lambda r: (
+            r.get('waitlistPosition') is None, r.get('waitlistPosition') or 0, r.get('registeredAt', '')
+        ))
+        # Reserve a contiguous block of sequence numbers for this event
+        try:
+            response = table.update_item(
+                Key={'PK': f"EVENT#{event_id}", 'SK': f"EVENT#{event_id}"},
+                UpdateExpression='ADD waitlistSeq :count',
+                ConditionExpression='attribute_exists(PK)',
+                ExpressionAttributeValues={':count': len(registrations)},
+                ReturnValues='UPDATED_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                continue  # Orphaned registrations of a deleted event
+            raise
+        first_seq = int(response['Attributes']['waitlistSeq']) - len(registrations) + 1
+        for offset, registration in enumerate(registrations):
+            waitlist_seq = first_seq + offset
+            try:
+                transact_write(config.dynamodb_resource, [
+                    {'Update': {
+                        'TableName': config.table_name,
+                        'Key': {'PK': registration['PK'], 'SK': registration['SK']},
+                        'UpdateExpression': 'SET waitlistSeq = :seq',
+                        'ConditionExpression': (
+                            'attribute_exists(PK) AND attribute_not_exists(waitlistSeq) '
+                            'AND #status = :waitlisted'
+                        ),
+                        'ExpressionAttributeNames': {'#status': 'status'},
+                        'ExpressionAttributeValues': {':seq': waitlist_seq, ':waitlisted': 'waitlisted'}
+                    }},
+                    {'Put': {
+                        'TableName': config.table_name,
+                        'Item': {
+                            'PK': registration['PK'],
+                            'SK': waitlist_sort_key(waitlist_seq, registration['userId']),
+                            'eventId': event_id,
+                            'userId': registration['userId'],
+                            'waitlistSeq': waitlist_seq
+                        }
+                    }}
+                ])
+            except TransactionCanceledError:
+                continue  # Deleted, promoted or sequenced in the meantime
+            updated += 1
+    return updated
+
+
+MIGRATIONS: Dict[str, Callable[[Config, int], int]] = {
+    'event-index': backfill_event_index,
+    'registration-index': backfill_registration_index,
+    'registration-counters': backfill_registration_counters,
+    'waitlist-entries': backfill_waitlist_entries,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Run Events table data migrations")
+    parser.add_argument('migrations', nargs='+', choices=sorted(MIGRATIONS))
+    parser.add_argument('--segments', type=int, default=4, help="Parallel scan segments")
+    args = parser.parse_args(argv)
+
+    config = get_config()
+    for name in args.migrations:
+        count = MIGRATIONS[name](config, args.segments)
+        print(f"{name}: updated {count} items")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,31 @@
 # Models module - exports all domain models
 
-from .event import Event, EventBase, EventCreate, EventUpdate
+from .event import Event, EventBase, EventCreate, EventUpdate, EventPage, EventDeletion
 from .user import User, UserCreate
-from .registration import Registration, RegistrationRequest, RegistrationStatus
+from .registration import (
+    Registration,
+    RegistrationRequest,
+    RegistrationStatus,
+    RosterPage,
+    BatchRegistrationRequest,
+    BatchRegistrationItem,
+    BatchRegistrationResult,
+)
 
 __all__ = [
     'Event',
     'EventBase',
     'EventCreate',
     'EventUpdate',
+    'EventPage',
+    'EventDeletion',
     'User',
     'UserCreate',
     'Registration',
     'RegistrationRequest',
     'RegistrationStatus',
+    'RosterPage',
+    'BatchRegistrationRequest',
+    'BatchRegistrationItem',
+    'BatchRegistrationResult',
 ]
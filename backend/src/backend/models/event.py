@@ -1,7 +1,7 @@
 """Event domain models."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 
 
 class EventBase(BaseModel):
@@ -37,3 +37,23 @@ class Event(EventBase):
     """Complete event model."""
     eventId: str
     hasWaitlist: bool = False
+    registeredCount: int = 0
+    waitlistCount: int = 0
+    # Incremented on every change to the event or its registrations
+    version: int = 0
+
+
+class EventPage(BaseModel):
+    """A page of events with an opaque cursor for the next page."""
+    items: List[Event] = []
+    nextToken: Optional[str] = None
+
+
+class EventDeletion(BaseModel):
+    """Progress of the deletion of an event and the items of its partition."""
+    eventId: str
+    status: str  # "running", "completed" or "failed"
+    deletedItems: int = 0
+    startedAt: str
+    updatedAt: str
+    error: Optional[str] = None
@@ -1,7 +1,7 @@
 """Registration domain models."""
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Annotated, Optional, List
 
 
 class RegistrationRequest(BaseModel):
@@ -9,6 +9,13 @@ class RegistrationRequest(BaseModel):
     userId: str = Field(..., min_length=1, max_length=100)
 
 
+class BatchRegistrationRequest(BaseModel):
+    """Model for a bulk registration request."""
+    userIds: List[Annotated[str, Field(min_length=1, max_length=100)]] = Field(
+        ..., min_length=1, max_length=1000
+    )
+
+
 class Registration(BaseModel):
     """Complete registration model."""
     userId: str
@@ -16,6 +23,8 @@ class Registration(BaseModel):
     registeredAt: str
     status: str  # "registered" or "waitlisted"
     waitlistPosition: Optional[int] = None
+    # Sequence number of the WAIT# entry; internal, never serialized
+    waitlistSeq: Optional[int] = Field(None, exclude=True)
 
 
 class RegistrationStatus(BaseModel):
@@ -25,3 +34,31 @@ class RegistrationStatus(BaseModel):
     waitlistCount: int
     registeredUsers: List[str] = []
     waitlistUsers: List[str] = []
+    # Token for the next page of the roster, if any
+    nextToken: Optional[str] = None
+    # Version of the event the counts were read from; sent as the ETag
+    version: int = Field(0, exclude=True)
+
+
+class RosterPage(BaseModel):
+    """One page of an event's roster: registered users, then the waitlist in order."""
+    registeredUsers: List[str] = []
+    waitlistUsers: List[str] = []
+    nextToken: Optional[str] = None
+    # Phase nextToken starts at, when the page filled up exactly at its start
+    nextPhase: Optional[str] = Field(None, exclude=True)
+
+
+class BatchRegistrationItem(BaseModel):
+    """Outcome of one user in a bulk registration."""
+    userId: str
+    # "registered", "waitlisted", "already_registered", "already_waitlisted",
+    # "user_not_found", "capacity_exceeded" or "conflict"
+    status: str
+    waitlistPosition: Optional[int] = None
+
+
+class BatchRegistrationResult(BaseModel):
+    """Model for the result of a bulk registration."""
+    eventId: str
+    results: List[BatchRegistrationItem] = []
@@ -1,13 +1,22 @@
 """Registration API handlers."""
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Header, Query, Depends, Response
+from typing import Optional
 
 from .service import RegistrationService
-from ..models.registration import Registration, RegistrationRequest, RegistrationStatus
+from ..models.registration import (
+    Registration,
+    RegistrationRequest,
+    RegistrationStatus,
+    BatchRegistrationRequest,
+    BatchRegistrationResult
+)
+from ..core.responses import entity_tag, etag_matches, fast_responses_enabled, json_response, not_modified
 from ..core.exceptions import (
     EntityNotFoundError,
     AlreadyRegisteredError,
     CapacityExceededError,
+    InvalidCursorError,
     BusinessRuleViolationError
 )
 
@@ -17,15 +26,16 @@ router = APIRouter(tags=["registrations"])
 
 def get_registration_service() -> RegistrationService:
     """Dependency to get RegistrationService instance."""
-    from ..core.config import Config
+    from ..core.async_repository import AsyncRepository
+    from ..core.config import get_config
     from .repository import RegistrationRepository
-    from ..events.repository import EventRepository
+    from ..events.repository import CachedEventRepository
     from ..users.repository import UserRepository
     
-    config = Config()
-    registration_repo = RegistrationRepository(config)
-    event_repo = EventRepository(config)
-    user_repo = UserRepository(config)
+    config = get_config()
+    registration_repo = AsyncRepository(RegistrationRepository(config))
+    event_repo = AsyncRepository(CachedEventRepository(config))
+    user_repo = AsyncRepository(UserRepository(config))
     return RegistrationService(registration_repo, event_repo, user_repo)
 
 
@@ -39,7 +49,7 @@ async def register_for_event(
     Register a user for an event.
     """
     try:
-        registration = service.register_user(request.userId, event_id)
+        registration = await service.register_user(request.userId, event_id)
         return registration
     except EntityNotFoundError as e:
         raise HTTPException(
@@ -68,6 +78,32 @@ async def register_for_event(
         )
 
 
+@router.post("/events/{event_id}/registrations:batch", response_model=BatchRegistrationResult, status_code=status.HTTP_200_OK)
+async def register_batch_for_event(
+    event_id: str,
+    request: BatchRegistrationRequest,
+    service: RegistrationService = Depends(get_registration_service)
+):
+    """
+    Register many users for an event at once.
+    
+    Returns a per-user outcome; users that cannot be registered do not fail
+    the whole request.
+    """
+    try:
+        return await service.register_users(request.userIds, event_id)
+    except EntityNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to register users: {str(e)}"
+        )
+
+
 @router.delete("/events/{event_id}/registrations/{user_id}", status_code=status.HTTP_200_OK)
 async def unregister_from_event(
     event_id: str,
@@ -78,7 +114,7 @@ async def unregister_from_event(
     Unregister a user from an event.
     """
     try:
-        service.unregister_user(user_id, event_id)
+        await service.unregister_user(user_id, event_id)
         return {"message": f"User {user_id} unregistered from event {event_id} successfully"}
     except BusinessRuleViolationError as e:
         raise HTTPException(
@@ -95,19 +131,48 @@ async def unregister_from_event(
 @router.get("/events/{event_id}/registrations", response_model=RegistrationStatus, status_code=status.HTTP_200_OK)
 async def get_event_registrations(
     event_id: str,
+    response: Response,
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(registered|waitlisted)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    next_token: Optional[str] = Query(None),
+    counts_only: bool = Query(False),
+    if_none_match: Optional[str] = Header(None),
     service: RegistrationService = Depends(get_registration_service)
 ):
     """
-    Get registration status for an event.
+    Get registration counts and one page of the roster for an event.
+    
+    Registered users are listed first, then the waitlist in order. When
+    more users are available, pass ``nextToken`` back as ``next_token``.
+    With ``counts_only`` only the counts are returned.
+    
+    The response carries the event version as ETag; every registration
+    change bumps it. With a matching ``If-None-Match`` only the version is
+    read and 304 is returned.
     """
     try:
-        registration_status = service.get_event_registrations(event_id)
+        if if_none_match:
+            etag = entity_tag(await service.get_event_version(event_id))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        registration_status = await service.get_event_registrations(
+            event_id, status_filter, limit, next_token, counts_only
+        )
+        etag = entity_tag(registration_status.version)
+        if fast_responses_enabled():
+            return json_response(registration_status, RegistrationStatus, headers={"ETag": etag})
+        response.headers["ETag"] = etag
         return registration_status
     except EntityNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,15 +1,77 @@
 """Registration repository for database operations."""
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from botocore.exceptions import ClientError
 
+from ..core.batch import batch_get_items, chunked
 from ..core.config import Config
-from ..models.registration import Registration
+from ..core.exceptions import (
+    EntityNotFoundError,
+    AlreadyRegisteredError,
+    CapacityExceededError,
+    InvalidCursorError,
+    TransactionCanceledError
+)
+from ..core.pagination import encode_cursor, decode_cursor
+from ..core.projection import projection, to_model
+from ..core.transactions import transact_write
+from ..events.repository import versioned
+from ..models.event import Event
+from ..models.registration import Registration, RosterPage
+
+
+# Sparse global secondary index that inverts the registration key. Only
+# registration items carry GSI2PK = "USER#<userId>" and GSI2SK =
+# "EVENT#<eventId>", so a user's registrations are a single Query.
+USER_INDEX_NAME = 'GSI2'
+
+# Roster order: registered users (registration items), then the waitlist
+# (WAIT# entries, in queue order)
+ROSTER_PHASES = (('registered', 'USER#'), ('waitlisted', 'WAIT#'))
+
+
+def waitlist_sort_key(waitlist_seq: int, user_id: str) -> str:
+    """
+    Build the sort key of a waitlist entry.
+    
+    Waitlist entries live in the event partition under a zero-padded,
+    monotonically increasing sequence number, so the head of the waitlist
+    is the first item of a begins_with(SK, "WAIT#") Query.
+    
+    Args:
+        waitlist_seq: Sequence number allocated from the event's waitlistSeq
+        user_id: User ID
+        
+    Returns:
+        Sort key, e.g. "WAIT#000000000123#user-1"
+    """
+    return f"WAIT#{waitlist_seq:012d}#{user_id}"
+
+
+def user_index_keys(user_id: str, event_id: str) -> Dict[str, str]:
+    """
+    Build the user index keys for a registration item.
+    
+    Args:
+        user_id: User ID
+        event_id: Event ID
+        
+    Returns:
+        Dictionary with GSI2PK and GSI2SK
+    """
+    return {'GSI2PK': f"USER#{user_id}", 'GSI2SK': f"EVENT#{event_id}"}
 
 
 class RegistrationRepository:
     """Repository for Registration entity database operations."""
     
+    # Waitlist heads to try before giving up on a contended promotion
+    MAX_PROMOTION_ATTEMPTS = 5
+    
+    # Users promoted per transaction by promote_many: two actions each plus
+    # the event update, within the 100 actions of a transaction
+    PROMOTION_CHUNK = 49
+    
     def __init__(self, config: Config):
         """
         Initialize RegistrationRepository.
@@ -20,144 +82,850 @@ class RegistrationRepository:
         self.config = config
         self.table = config.get_table()
     
-    def create(self, registration_data: Dict[str, Any]) -> Registration:
+    def _event_key(self, event_id: str) -> Dict[str, str]:
+        """Build the primary key of an event item."""
+        return {'PK': f"EVENT#{event_id}", 'SK': f"EVENT#{event_id}"}
+    
+    def _put_new_action(self, registration_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a transaction action that puts a registration unless one exists."""
+        registration_data.update(
+            user_index_keys(registration_data['userId'], registration_data['eventId'])
+        )
+        return {'Put': {
+            'TableName': self.config.table_name,
+            'Item': registration_data,
+            'ConditionExpression': 'attribute_not_exists(PK)',
+            'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+        }}
+    
+    def _raise_if_exists(self, error: TransactionCanceledError, index: int, registration_data: Dict[str, Any]) -> None:
+        """Raise AlreadyRegisteredError if the registration put at index failed."""
+        if error.failed(index):
+            existing = error.item(index) or {}
+            raise AlreadyRegisteredError(
+                registration_data['userId'],
+                registration_data['eventId'],
+                existing.get('status', 'registered')
+            )
+    
+    def create_registered(self, registration_data: Dict[str, Any]) -> Registration:
         """
-        Create a new registration.
+        Create a registered registration and take a seat in one transaction.
+        
+        The event's registeredCount is incremented only while it is below
+        capacity, so concurrent signups can never oversell the event.
         
         Args:
-            registration_data: Registration data dictionary
+            registration_data: Registration data dictionary with status "registered"
             
         Returns:
             Created Registration object
+            
+        Raises:
+            EntityNotFoundError: If the event does not exist
+            AlreadyRegisteredError: If the user already has a registration
+            CapacityExceededError: If the event is at capacity
+        """
+        event_id = registration_data['eventId']
+        try:
+            transact_write(self.config.dynamodb_resource, [
+                {'Update': versioned({
+                    'TableName': self.config.table_name,
+                    'Key': self._event_key(event_id),
+                    'UpdateExpression': 'SET registeredCount = registeredCount + :one',
+                    'ConditionExpression': 'attribute_exists(PK) AND registeredCount < #capacity',
+                    'ExpressionAttributeNames': {'#capacity': 'capacity'},
+                    'ExpressionAttributeValues': {':one': 1},
+                    'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+                })},
+                self._put_new_action(registration_data)
+            ])
+        except TransactionCanceledError as e:
+            self._raise_if_exists(e, 1, registration_data)
+            if e.failed(0):
+                if e.item(0) is None:
+                    raise EntityNotFoundError("Event", event_id)
+                raise CapacityExceededError(event_id)
+            raise
+        return Registration(**registration_data)
+    
+    def create_waitlisted(self, registration_data: Dict[str, Any]) -> Optional[Registration]:
+        """
+        Create a waitlisted registration and its waitlist entry.
+        
+        A sequence number is first allocated from the event's waitlistSeq
+        counter; the registration, the WAIT# entry and the waitlistCount
+        increment are then written in one transaction that only succeeds
+        while the event is at capacity, so nobody is waitlisted while a seat
+        is free. The registration's waitlistSeq and waitlistPosition are set
+        from the allocation.
+        
+        Args:
+            registration_data: Registration data dictionary with status "waitlisted"
+            
+        Returns:
+            Created Registration object, or None if a seat became free and
+            the caller should register the user instead
+            
+        Raises:
+            EntityNotFoundError: If the event does not exist
+            AlreadyRegisteredError: If the user already has a registration
         """
-        self.table.put_item(Item=registration_data)
+        event_id = registration_data['eventId']
+        user_id = registration_data['userId']
+        try:
+            response = self.table.update_item(
+                Key=self._event_key(event_id),
+                UpdateExpression='ADD waitlistSeq :one',
+                ConditionExpression='attribute_exists(PK)',
+                ExpressionAttributeValues={':one': 1},
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                raise EntityNotFoundError("Event", event_id)
+            raise
+        event_item = response['Attributes']
+        waitlist_seq = int(event_item['waitlistSeq'])
+        registration_data['waitlistSeq'] = waitlist_seq
+        registration_data['waitlistPosition'] = int(event_item.get('waitlistCount', 0)) + 1
+        
+        try:
+            transact_write(self.config.dynamodb_resource, [
+                {'Update': versioned({
+                    'TableName': self.config.table_name,
+                    'Key': self._event_key(event_id),
+                    'UpdateExpression': 'SET waitlistCount = waitlistCount + :one',
+                    'ConditionExpression': 'attribute_exists(PK) AND registeredCount >= #capacity',
+                    'ExpressionAttributeNames': {'#capacity': 'capacity'},
+                    'ExpressionAttributeValues': {':one': 1},
+                    'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+                })},
+                self._put_new_action(registration_data),
+                {'Put': {
+                    'TableName': self.config.table_name,
+                    'Item': {
+                        'PK': f"EVENT#{event_id}",
+                        'SK': waitlist_sort_key(waitlist_seq, user_id),
+                        'eventId': event_id,
+                        'userId': user_id,
+                        'waitlistSeq': waitlist_seq
+                    }
+                }}
+            ])
+        except TransactionCanceledError as e:
+            self._raise_if_exists(e, 1, registration_data)
+            if e.failed(0):
+                if e.item(0) is None:
+                    raise EntityNotFoundError("Event", event_id)
+                return None
+            raise
         return Registration(**registration_data)
     
-    def get(self, event_id: str, user_id: str) -> Optional[Registration]:
+    def create_many(
+        self,
+        event_id: str,
+        registrations_data: List[Dict[str, Any]],
+        status: str,
+        expected_registered_count: Optional[int] = None
+    ) -> Dict[str, str]:
+        """
+        Create several registrations with the same status in one transaction.
+        
+        Registered batches are conditioned on registeredCount still being
+        expected_registered_count, so the caller can size the batch to the
+        free seats it saw. Waitlisted batches allocate a block of waitlist
+        sequence numbers first and are conditioned on the event being at
+        capacity. Batches must fit one transaction: at most 99 registered
+        or 49 waitlisted registrations.
+        
+        Args:
+            event_id: Event ID
+            registrations_data: Registration data dictionaries
+            status: "registered" or "waitlisted"
+            expected_registered_count: registeredCount the batch was planned against
+                (required for registered batches)
+            
+        Returns:
+            Empty dict on success. Otherwise nothing was written and the dict
+            maps the user IDs that already had a registration to its status.
+            
+        Raises:
+            EntityNotFoundError: If the event does not exist
+            CapacityExceededError: If the event counters no longer match the plan
+        """
+        count = len(registrations_data)
+        actions = []
+        if status == 'registered':
+            event_update = {
+                'UpdateExpression': 'SET registeredCount = registeredCount + :count',
+                'ConditionExpression': 'attribute_exists(PK) AND registeredCount = :expected',
+                'ExpressionAttributeValues': {':count': count, ':expected': expected_registered_count}
+            }
+            for registration_data in registrations_data:
+                actions.append(self._put_new_action(registration_data))
+        else:
+            try:
+                response = self.table.update_item(
+                    Key=self._event_key(event_id),
+                    UpdateExpression='ADD waitlistSeq :count',
+                    ConditionExpression='attribute_exists(PK)',
+                    ExpressionAttributeValues={':count': count},
+                    ReturnValues='ALL_NEW'
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                    raise EntityNotFoundError("Event", event_id)
+                raise
+            event_item = response['Attributes']
+            first_seq = int(event_item['waitlistSeq']) - count + 1
+            first_position = int(event_item.get('waitlistCount', 0)) + 1
+            event_update = {
+                'UpdateExpression': 'SET waitlistCount = waitlistCount + :count',
+                'ConditionExpression': 'attribute_exists(PK) AND registeredCount >= #capacity',
+                'ExpressionAttributeNames': {'#capacity': 'capacity'},
+                'ExpressionAttributeValues': {':count': count}
+            }
+            for offset, registration_data in enumerate(registrations_data):
+                registration_data['waitlistSeq'] = first_seq + offset
+                registration_data['waitlistPosition'] = first_position + offset
+                actions.append(self._put_new_action(registration_data))
+                actions.append({'Put': {
+                    'TableName': self.config.table_name,
+                    'Item': {
+                        'PK': f"EVENT#{event_id}",
+                        'SK': waitlist_sort_key(first_seq + offset, registration_data['userId']),
+                        'eventId': event_id,
+                        'userId': registration_data['userId'],
+                        'waitlistSeq': first_seq + offset
+                    }
+                }})
+        event_action = {'Update': {
+            'TableName': self.config.table_name,
+            'Key': self._event_key(event_id),
+            'ReturnValuesOnConditionCheckFailure': 'ALL_OLD',
+            **versioned(event_update)
+        }}
+        
+        try:
+            transact_write(self.config.dynamodb_resource, [event_action] + actions)
+        except TransactionCanceledError as e:
+            conflicts = {}
+            for index in range(1, len(e.reasons)):
+                if e.failed(index):
+                    existing = e.item(index) or {}
+                    if 'userId' in existing:
+                        conflicts[existing['userId']] = existing.get('status', 'registered')
+            if conflicts:
+                return conflicts
+            if e.failed(0):
+                if e.item(0) is None:
+                    raise EntityNotFoundError("Event", event_id)
+                raise CapacityExceededError(event_id)
+            raise
+        return {}
+    
+    def get_statuses(self, event_id: str, user_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the registration status of several users for an event, with batched reads.
+        
+        Args:
+            event_id: Event ID
+            user_ids: User IDs (duplicates are allowed)
+            
+        Returns:
+            Mapping of user ID to status for the users that have a registration
+            
+        Raises:
+            UnprocessedItemsError: If DynamoDB keeps throttling the batch
+        """
+        keys = [
+            {'PK': f"EVENT#{event_id}", 'SK': f"USER#{user_id}"}
+            for user_id in dict.fromkeys(user_ids)
+        ]
+        if not keys:
+            return {}
+        items = batch_get_items(
+            self.config.dynamodb_resource,
+            self.config.table_name,
+            keys,
+            projection_expression='userId, #status',
+            expression_attribute_names={'#status': 'status'}
+        )
+        return {item['userId']: item['status'] for item in items}
+    
+    def get(self, event_id: str, user_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Registration]:
         """
         Get a specific registration.
         
         Args:
             event_id: Event ID
             user_id: User ID
+            fields: Only read these Registration fields (partial model)
             
         Returns:
             Registration object if found, None otherwise
         """
+        get_kwargs: Dict[str, Any] = projection(Registration, fields) if fields else {}
         try:
             response = self.table.get_item(
                 Key={
                     'PK': f"EVENT#{event_id}",
                     'SK': f"USER#{user_id}"
-                }
+                },
+                **get_kwargs
             )
             item = response.get('Item')
-            return Registration(**item) if item else None
+            return to_model(Registration, item, fields) if item else None
         except ClientError:
             return None
     
-    def delete(self, event_id: str, user_id: str) -> bool:
+    def get_signup_context(
+        self,
+        event_id: str,
+        user_id: str
+    ) -> Tuple[Optional[Event], bool, Optional[Registration]]:
         """
-        Delete a registration.
+        Read everything a signup is validated against in one round trip.
+        
+        The event, the user and any existing registration are fetched with a
+        single BatchGetItem instead of three GetItem calls.
         
         Args:
             event_id: Event ID
             user_id: User ID
-            
+        
         Returns:
-            True if deleted successfully
+            Tuple of (event if found, whether the user exists, existing
+            registration if any)
+        
+        Raises:
+            UnprocessedItemsError: If DynamoDB keeps throttling the batch
         """
-        self.table.delete_item(
-            Key={
-                'PK': f"EVENT#{event_id}",
-                'SK': f"USER#{user_id}"
-            }
+        event_key = f"EVENT#{event_id}"
+        user_key = f"USER#{user_id}"
+        items = batch_get_items(
+            self.config.dynamodb_resource,
+            self.config.table_name,
+            [
+                {'PK': event_key, 'SK': event_key},
+                {'PK': user_key, 'SK': user_key},
+                {'PK': event_key, 'SK': user_key}
+            ]
+        )
+        items_by_key = {(item['PK'], item['SK']): item for item in items}
+        event_item = items_by_key.get((event_key, event_key))
+        registration_item = items_by_key.get((event_key, user_key))
+        return (
+            to_model(Event, event_item) if event_item else None,
+            (user_key, user_key) in items_by_key,
+            to_model(Registration, registration_item) if registration_item else None
         )
-        return True
     
-    def list_by_event(self, event_id: str) -> List[Registration]:
+    def delete_and_release(
+        self,
+        event_id: str,
+        user_id: str,
+        status: str,
+        waitlist_seq: Optional[int] = None
+    ) -> bool:
         """
-        Get all registrations for an event.
+        Delete a registration and release its seat or waitlist place in one transaction.
         
         Args:
             event_id: Event ID
+            user_id: User ID
+            status: The registration's current status ("registered" or "waitlisted")
+            waitlist_seq: The registration's waitlist sequence number, if waitlisted
             
         Returns:
-            List of Registration objects
+            True if deleted, False if the registration no longer has that status
         """
+        deletes = [{'Delete': {
+            'TableName': self.config.table_name,
+            'Key': {'PK': f"EVENT#{event_id}", 'SK': f"USER#{user_id}"},
+            'ConditionExpression': '#status = :status',
+            'ExpressionAttributeNames': {'#status': 'status'},
+            'ExpressionAttributeValues': {':status': status}
+        }}]
+        if status == 'waitlisted' and waitlist_seq is not None:
+            deletes.append({'Delete': {
+                'TableName': self.config.table_name,
+                'Key': {'PK': f"EVENT#{event_id}", 'SK': waitlist_sort_key(waitlist_seq, user_id)}
+            }})
+        counter = 'registeredCount' if status == 'registered' else 'waitlistCount'
+        release = {'Update': versioned({
+            'TableName': self.config.table_name,
+            'Key': self._event_key(event_id),
+            'UpdateExpression': f'SET {counter} = {counter} - :one',
+            'ConditionExpression': 'attribute_exists(PK)',
+            'ExpressionAttributeValues': {':one': 1}
+        })}
         try:
-            response = self.table.query(
-                KeyConditionExpression='PK = :pk AND begins_with(SK, :sk)',
-                ExpressionAttributeValues={
-                    ':pk': f"EVENT#{event_id}",
-                    ':sk': 'USER#'
-                }
-            )
-            items = response.get('Items', [])
-            return [Registration(**item) for item in items]
-        except ClientError:
-            return []
+            transact_write(self.config.dynamodb_resource, deletes + [release])
+            return True
+        except TransactionCanceledError as e:
+            if e.failed(0):
+                return False
+            if not e.failed(len(deletes)):
+                raise
+        
+        # The event itself is gone; just drop the orphaned items
+        try:
+            transact_write(self.config.dynamodb_resource, deletes)
+            return True
+        except TransactionCanceledError as e:
+            if e.failed(0):
+                return False
+            raise
     
-    def list_by_user(self, user_id: str) -> List[Registration]:
+    def get_waitlist_head(self, event_id: str) -> Optional[Dict[str, Any]]:
         """
-        Get all registrations for a user.
+        Get the first entry of an event's waitlist.
         
         Args:
-            user_id: User ID
+            event_id: Event ID
             
         Returns:
-            List of Registration objects
+            The WAIT# item with the lowest sequence number, or None if the
+            waitlist is empty
         """
-        try:
-            response = self.table.scan(
-                FilterExpression='SK = :sk',
-                ExpressionAttributeValues={
-                    ':sk': f"USER#{user_id}"
-                }
-            )
-            items = response.get('Items', [])
-            # Filter to only include registration items (not user profile)
-            registration_items = [item for item in items if item.get('PK', '').startswith('EVENT#')]
-            return [Registration(**item) for item in registration_items]
-        except ClientError:
-            return []
+        response = self.table.query(
+            KeyConditionExpression='PK = :pk AND begins_with(SK, :sk)',
+            ExpressionAttributeValues={
+                ':pk': f"EVENT#{event_id}",
+                ':sk': 'WAIT#'
+            },
+            Limit=1
+        )
+        items = response.get('Items', [])
+        return items[0] if items else None
     
-    def update_status(self, event_id: str, user_id: str, status: str, waitlist_position: Optional[int] = None) -> None:
+    def _promotion_actions(self, event_id: str, head: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Update registration status.
+        Build the actions moving a waitlist head to "registered".
+        
+        Removes the WAIT# entry and flips the registration; the caller adds
+        the matching update of the event counters.
         
         Args:
             event_id: Event ID
-            user_id: User ID
-            status: New status
-            waitlist_position: New waitlist position (optional)
+            head: WAIT# item at the head of the waitlist
+            
+        Returns:
+            Entry delete and registration update actions
         """
         from datetime import datetime, UTC
         
-        if waitlist_position is None:
-            self.table.update_item(
-                Key={
-                    'PK': f"EVENT#{event_id}",
-                    'SK': f"USER#{user_id}"
-                },
-                UpdateExpression='SET #status = :status, waitlistPosition = :null, promotedAt = :promoted',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':status': status,
+        return [
+            {'Delete': {
+                'TableName': self.config.table_name,
+                'Key': {'PK': head['PK'], 'SK': head['SK']},
+                'ConditionExpression': 'attribute_exists(PK)'
+            }},
+            {'Update': {
+                'TableName': self.config.table_name,
+                'Key': {'PK': f"EVENT#{event_id}", 'SK': f"USER#{head['userId']}"},
+                'UpdateExpression': (
+                    'SET #status = :registered, waitlistPosition = :null, '
+                    'waitlistSeq = :null, promotedAt = :promoted'
+                ),
+                'ConditionExpression': '#status = :waitlisted',
+                'ExpressionAttributeNames': {'#status': 'status'},
+                'ExpressionAttributeValues': {
+                    ':registered': 'registered',
+                    ':waitlisted': 'waitlisted',
                     ':null': None,
                     ':promoted': datetime.now(UTC).isoformat()
                 }
-            )
-        else:
-            self.table.update_item(
-                Key={
-                    'PK': f"EVENT#{event_id}",
-                    'SK': f"USER#{user_id}"
-                },
-                UpdateExpression='SET #status = :status, waitlistPosition = :position',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':status': status,
-                    ':position': waitlist_position
+            }}
+        ]
+    
+    def promote_next(self, event_id: str) -> Optional[str]:
+        """
+        Move the head of the waitlist into a free seat.
+        
+        Reads the waitlist head with a Limit=1 Query and then, in one
+        transaction, removes the WAIT# entry, flips the registration to
+        "registered" and moves one unit from waitlistCount to
+        registeredCount, conditioned on a seat still being free.
+        
+        Args:
+            event_id: Event ID
+            
+        Returns:
+            User ID of the promoted user, or None if the waitlist is empty
+            or the event has no free seat
+        """
+        for _ in range(self.MAX_PROMOTION_ATTEMPTS):
+            head = self.get_waitlist_head(event_id)
+            if not head:
+                return None
+            entry_delete, registration_update = self._promotion_actions(event_id, head)
+            try:
+                transact_write(self.config.dynamodb_resource, [
+                    entry_delete,
+                    registration_update,
+                    {'Update': versioned({
+                        'TableName': self.config.table_name,
+                        'Key': self._event_key(event_id),
+                        'UpdateExpression': 'SET registeredCount = registeredCount + :one, waitlistCount = waitlistCount - :one',
+                        'ConditionExpression': 'attribute_exists(PK) AND registeredCount < #capacity',
+                        'ExpressionAttributeNames': {'#capacity': 'capacity'},
+                        'ExpressionAttributeValues': {':one': 1}
+                    })}
+                ])
+                return head['userId']
+            except TransactionCanceledError as e:
+                if e.failed(2):
+                    return None
+                if e.failed(1):
+                    # Stale entry whose registration is gone; drop it and retry
+                    try:
+                        transact_write(self.config.dynamodb_resource, [entry_delete])
+                    except TransactionCanceledError:
+                        pass
+                elif not e.failed(0):
+                    raise
+                # Otherwise a concurrent promotion took this entry; retry
+        return None
+    
+    def promote_many(self, event_id: str, capacity: int, count: int) -> List[str]:
+        """
+        Move up to ``count`` users from the head of the waitlist into free seats.
+        
+        The first ``count`` waitlist entries are read with one Query (paged
+        only past 1 MB) and promoted in transactions of PROMOTION_CHUNK
+        users. Each transaction moves its users from waitlistCount
+        to registeredCount, on the condition that the capacity is still
+        ``capacity`` and the seats are still free. If a chunk meets stale or
+        concurrently promoted entries, the remaining seats are filled one
+        user at a time with ``promote_next``.
+        
+        Args:
+            event_id: Event ID
+            capacity: Capacity the seats were counted against
+            count: Maximum number of users to promote
+            
+        Returns:
+            User IDs of the promoted users, in waitlist order
+        """
+        entries: List[Dict[str, Any]] = []
+        query = {
+            'KeyConditionExpression': 'PK = :pk AND begins_with(SK, :sk)',
+            'ExpressionAttributeValues': {':pk': f"EVENT#{event_id}", ':sk': 'WAIT#'},
+            'ProjectionExpression': 'PK, SK, userId',
+        }
+        while len(entries) < count:
+            response = self.table.query(Limit=count - len(entries), **query)
+            entries.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                break
+            query['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        promoted: List[str] = []
+        for chunk in chunked(entries, self.PROMOTION_CHUNK):
+            actions = [action for head in chunk for action in self._promotion_actions(event_id, head)]
+            actions.append({'Update': versioned({
+                'TableName': self.config.table_name,
+                'Key': self._event_key(event_id),
+                'UpdateExpression': 'SET registeredCount = registeredCount + :count, waitlistCount = waitlistCount - :count',
+                'ConditionExpression': 'attribute_exists(PK) AND #capacity = :capacity AND registeredCount <= :max_registered',
+                'ExpressionAttributeNames': {'#capacity': 'capacity'},
+                'ExpressionAttributeValues': {
+                    ':count': len(chunk),
+                    ':capacity': capacity,
+                    ':max_registered': capacity - len(chunk)
                 }
+            })})
+            try:
+                transact_write(self.config.dynamodb_resource, actions)
+                promoted.extend(head['userId'] for head in chunk)
+            except TransactionCanceledError as e:
+                if e.failed(len(actions) - 1):
+                    # The capacity changed or the seats were taken meanwhile
+                    break
+                if not any(e.failed(index) for index in range(len(actions) - 1)):
+                    raise
+                for _ in range(count - len(promoted)):
+                    user_id = self.promote_next(event_id)
+                    if not user_id:
+                        break
+                    promoted.append(user_id)
+                break
+        return promoted
+    
+    def unregister(self, event_id: str, user_id: str) -> Optional[str]:
+        """
+        Delete a registration, release its place and promote from the waitlist.
+        
+        The waitlist head is read first (a Limit=1 Query). One transaction
+        then deletes the registration on the condition that it is
+        "registered" and, in the same write, either promotes the head into
+        the released seat (registeredCount is unchanged, waitlistCount drops
+        by one) or decrements registeredCount. When the condition fails,
+        the cancellation returns the old registration (ALL_OLD), which tells
+        whether it existed and whether it was waitlisted, so no read of the
+        registration is needed. Waitlisted users and concurrent changes to
+        the waitlist fall back to ``delete_and_release`` and
+        ``promote_next``.
+        
+        Args:
+            event_id: Event ID
+            user_id: User ID
+            
+        Returns:
+            Status the registration had ("registered" or "waitlisted"), or
+            None if the user had no registration
+        """
+        head = self.get_waitlist_head(event_id)
+        if head and head['userId'] == user_id:
+            # The user is waitlisted, so the registered path cannot apply
+            head = None
+        actions = [{'Delete': {
+            'TableName': self.config.table_name,
+            'Key': {'PK': f"EVENT#{event_id}", 'SK': f"USER#{user_id}"},
+            'ConditionExpression': '#status = :status',
+            'ExpressionAttributeNames': {'#status': 'status'},
+            'ExpressionAttributeValues': {':status': 'registered'},
+            'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+        }}]
+        if head:
+            actions += self._promotion_actions(event_id, head)
+            actions.append({'Update': versioned({
+                'TableName': self.config.table_name,
+                'Key': self._event_key(event_id),
+                'UpdateExpression': 'SET waitlistCount = waitlistCount - :one',
+                'ConditionExpression': 'attribute_exists(PK) AND registeredCount <= #capacity',
+                'ExpressionAttributeNames': {'#capacity': 'capacity'},
+                'ExpressionAttributeValues': {':one': 1}
+            })})
+        else:
+            actions.append({'Update': versioned({
+                'TableName': self.config.table_name,
+                'Key': self._event_key(event_id),
+                'UpdateExpression': 'SET registeredCount = registeredCount - :one',
+                'ConditionExpression': 'attribute_exists(PK)',
+                'ExpressionAttributeValues': {':one': 1}
+            })})
+        try:
+            transact_write(self.config.dynamodb_resource, actions)
+            return 'registered'
+        except TransactionCanceledError as e:
+            if e.failed(0):
+                old = e.item(0)
+                if not old:
+                    return None
+                registration = to_model(Registration, old)
+                status, waitlist_seq = registration.status, registration.waitlistSeq
+            elif any(e.failed(index) for index in range(1, len(actions))):
+                # Still registered, but the head was taken or stale, the
+                # event is over capacity or gone
+                status, waitlist_seq = 'registered', None
+            else:
+                raise
+        
+        if not self.delete_and_release(event_id, user_id, status, waitlist_seq):
+            return None
+        if status == 'registered':
+            self.promote_next(event_id)
+        return status
+    
+    def list_by_event(self, event_id: str, fields: Optional[Sequence[str]] = None) -> List[Registration]:
+        """
+        Get all registrations for an event.
+        
+        Follows pagination until the event's registrations are exhausted;
+        prefer list_roster for anything user-facing.
+        
+        Args:
+            event_id: Event ID
+            fields: Only read these Registration fields (partial models)
+            
+        Returns:
+            List of Registration objects
+            
+        Raises:
+            ClientError: If a query fails
+        """
+        query_kwargs: Dict[str, Any] = {
+            'KeyConditionExpression': 'PK = :pk AND begins_with(SK, :sk)',
+            'ExpressionAttributeValues': {
+                ':pk': f"EVENT#{event_id}",
+                ':sk': 'USER#'
+            }
+        }
+        if fields:
+            query_kwargs.update(projection(Registration, fields))
+        # Errors propagate: a failed page must not look like a short listing
+        registrations = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            registrations.extend(to_model(Registration, item, fields) for item in response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return registrations
+            query_kwargs['ExclusiveStartKey'] = last_key
+    
+    def count_by_event(self, event_id: str) -> Dict[str, int]:
+        """
+        Count an event's registrations by status from its registration items.
+        
+        Only the status attribute is read. Serving paths use the event's
+        materialized counters instead; this recounts them from scratch.
+        Errors propagate, so a failed read is never mistaken for zero.
+        
+        Args:
+            event_id: Event ID
+            
+        Returns:
+            Mapping with the "registered" and "waitlisted" counts
+        """
+        query_kwargs: Dict[str, Any] = {
+            'KeyConditionExpression': 'PK = :pk AND begins_with(SK, :sk)',
+            'ExpressionAttributeValues': {
+                ':pk': f"EVENT#{event_id}",
+                ':sk': 'USER#'
+            },
+            **projection(Registration, ['status'])
+        }
+        counts = {'registered': 0, 'waitlisted': 0}
+        while True:
+            response = self.table.query(**query_kwargs)
+            for item in response.get('Items', []):
+                if item.get('status') in counts:
+                    counts[item['status']] += 1
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return counts
+            query_kwargs['ExclusiveStartKey'] = last_key
+    
+    def list_roster(
+        self,
+        event_id: str,
+        status: Optional[str] = None,
+        limit: int = 100,
+        next_token: Optional[str] = None
+    ) -> RosterPage:
+        """
+        Get one page of an event's roster.
+        
+        Registered users come first, ordered by user ID (registration items
+        filtered on status), then waitlisted users in waitlist order (the
+        WAIT# entries). Only the sort key and user ID are read.
+        
+        Args:
+            event_id: Event ID
+            status: Only list "registered" or "waitlisted" users
+            limit: Maximum number of users on the page
+            next_token: Token from the previous page, if any
+            
+        Returns:
+            RosterPage with the token for the next page, if any. A page that
+            fills up exactly at the end of the registered users carries a
+            token to the waitlist with nextPhase set, as the roster alone
+            cannot tell whether the waitlist is empty.
+            
+        Raises:
+            InvalidCursorError: If next_token is malformed or belongs to
+                another event or status filter
+        """
+        partition = f"EVENT#{event_id}"
+        phases = [
+            (phase, prefix) for phase, prefix in ROSTER_PHASES
+            if status is None or status == phase
+        ]
+        start_key = decode_cursor(next_token)
+        if start_key:
+            # Resume in the phase the token points into
+            resume_at = next(
+                (i for i, (_, prefix) in enumerate(phases) if start_key.get('SK', '').startswith(prefix)),
+                None
             )
+            if start_key.get('PK') != partition or set(start_key) != {'PK', 'SK'} or resume_at is None:
+                raise InvalidCursorError(next_token)
+            phases = phases[resume_at:]
+        
+        users: Dict[str, List[str]] = {phase: [] for phase, _ in ROSTER_PHASES}
+        count = 0
+        next_key = None
+        next_phase = None
+        for phase, prefix in phases:
+            if count == limit:
+                # The page filled up exactly at the end of the previous phase
+                next_key = {'PK': partition, 'SK': prefix}
+                next_phase = phase
+                break
+            query_kwargs: Dict[str, Any] = {
+                'KeyConditionExpression': 'PK = :pk AND begins_with(SK, :sk)',
+                'ProjectionExpression': 'SK, userId',
+                'ExpressionAttributeValues': {':pk': partition, ':sk': prefix}
+            }
+            if phase == 'registered':
+                query_kwargs['FilterExpression'] = '#status = :status'
+                query_kwargs['ExpressionAttributeNames'] = {'#status': 'status'}
+                query_kwargs['ExpressionAttributeValues'][':status'] = 'registered'
+            if start_key and start_key['SK'].startswith(prefix):
+                query_kwargs['ExclusiveStartKey'] = start_key
+            while True:
+                query_kwargs['Limit'] = limit
+                response = self.table.query(**query_kwargs)
+                items = response.get('Items', [])
+                taken = items[:limit - count]
+                users[phase].extend(item['userId'] for item in taken)
+                count += len(taken)
+                last_key = response.get('LastEvaluatedKey')
+                if len(taken) < len(items):
+                    # Resume right after the last user on this page
+                    next_key = {'PK': partition, 'SK': taken[-1]['SK']}
+                elif count == limit and last_key:
+                    next_key = last_key
+                if next_key or not last_key:
+                    break
+                query_kwargs['ExclusiveStartKey'] = last_key
+            if next_key:
+                break
+        
+        return RosterPage(
+            registeredUsers=users['registered'],
+            waitlistUsers=users['waitlisted'],
+            nextToken=encode_cursor(next_key),
+            nextPhase=next_phase
+        )
+    
+    def list_by_user(self, user_id: str, fields: Optional[Sequence[str]] = None) -> List[Registration]:
+        """
+        Get all registrations for a user.
+        
+        Queries the inverted user index, following pagination until the
+        user's registrations are exhausted.
+        
+        Args:
+            user_id: User ID
+            fields: Only read these Registration fields (partial models)
+            
+        Returns:
+            List of Registration objects
+            
+        Raises:
+            ClientError: If a query fails
+        """
+        query_kwargs: Dict[str, Any] = {
+            'IndexName': USER_INDEX_NAME,
+            'KeyConditionExpression': 'GSI2PK = :pk AND begins_with(GSI2SK, :sk)',
+            'ExpressionAttributeValues': {
+                ':pk': f"USER#{user_id}",
+                ':sk': 'EVENT#'
+            }
+        }
+        if fields:
+            query_kwargs.update(projection(Registration, fields))
+        # Errors propagate: a failed page must not look like a short listing
+        registrations = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            registrations.extend(to_model(Registration, item, fields) for item in response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return registrations
+            query_kwargs['ExclusiveStartKey'] = last_key
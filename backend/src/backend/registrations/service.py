@@ -1,42 +1,55 @@
 """Registration service for business logic."""
 
+import asyncio
 from datetime import datetime, UTC
-from typing import List
+from typing import List, Optional
 
-from .repository import RegistrationRepository
-from ..events.repository import EventRepository
-from ..users.repository import UserRepository
+from ..core.async_repository import AsyncRepository
 from ..core.exceptions import (
     EntityNotFoundError,
     AlreadyRegisteredError,
     CapacityExceededError,
     BusinessRuleViolationError
 )
-from ..models.registration import Registration, RegistrationStatus
+from ..models.registration import (
+    Registration,
+    RegistrationStatus,
+    RosterPage,
+    BatchRegistrationItem,
+    BatchRegistrationResult
+)
 
 
 class RegistrationService:
     """Service for Registration business logic."""
     
+    # Attempts to allocate a seat or waitlist place before giving up
+    MAX_ALLOCATION_ATTEMPTS = 3
+    
+    # Registrations per bulk transaction (100 actions minus the event update;
+    # waitlisted users need a registration and a WAIT# entry each)
+    BATCH_REGISTERED_CHUNK = 99
+    BATCH_WAITLISTED_CHUNK = 49
+    
     def __init__(
         self,
-        registration_repository: RegistrationRepository,
-        event_repository: EventRepository,
-        user_repository: UserRepository
+        registration_repository: AsyncRepository,
+        event_repository: AsyncRepository,
+        user_repository: AsyncRepository
     ):
         """
         Initialize RegistrationService.
         
         Args:
-            registration_repository: Registration repository instance
-            event_repository: Event repository instance
-            user_repository: User repository instance
+            registration_repository: Async Registration repository
+            event_repository: Async Event repository
+            user_repository: Async User repository
         """
         self.registration_repository = registration_repository
         self.event_repository = event_repository
         self.user_repository = user_repository
     
-    def register_user(self, user_id: str, event_id: str) -> Registration:
+    async def register_user(self, user_id: str, event_id: str) -> Registration:
         """
         Register a user for an event.
         
@@ -52,54 +65,180 @@ class RegistrationService:
             AlreadyRegisteredError: If user already registered or waitlisted
             CapacityExceededError: If event is full and has no waitlist
         """
-        # Get event to check capacity and waitlist
-        event = self.event_repository.get_by_id(event_id)
+        # The event, the user and an existing registration are independent
+        # point reads, so fetch them in a single round trip
+        event, user_exists, existing = await self.registration_repository.get_signup_context(
+            event_id, user_id
+        )
         if not event:
             raise EntityNotFoundError("Event", event_id)
-        
-        # Check if user exists
-        if not self.user_repository.exists(user_id):
+        if not user_exists:
             raise EntityNotFoundError("User", user_id)
         
         # Check if already registered or waitlisted
-        existing = self.registration_repository.get(event_id, user_id)
         if existing:
             if existing.status == 'registered':
                 raise AlreadyRegisteredError(user_id, event_id, 'registered')
             elif existing.status == 'waitlisted':
                 raise AlreadyRegisteredError(user_id, event_id, 'waitlisted')
         
-        # Get current registration count
-        registrations = self.registration_repository.list_by_event(event_id)
-        registered_count = len([r for r in registrations if r.status == 'registered'])
-        capacity = event.capacity
-        has_waitlist = event.hasWaitlist
-        
-        # Determine status
-        if registered_count < capacity:
-            status = 'registered'
-            waitlist_position = None
-        elif has_waitlist:
-            status = 'waitlisted'
-            waitlist_count = len([r for r in registrations if r.status == 'waitlisted'])
-            waitlist_position = waitlist_count + 1
-        else:
-            raise CapacityExceededError(event_id)
-        
-        # Create registration
-        registration_data = {
-            'PK': f"EVENT#{event_id}",
-            'SK': f"USER#{user_id}",
-            'userId': user_id,
-            'eventId': event_id,
-            'status': status,
-            'registeredAt': datetime.now(UTC).isoformat(),
-            'waitlistPosition': waitlist_position
-        }
-        
-        return self.registration_repository.create(registration_data)
+        # Take a seat or a waitlist place atomically against the event's
+        # materialized counters. A retry is only needed when the event flips
+        # between full and not full while we are writing.
+        for _ in range(self.MAX_ALLOCATION_ATTEMPTS):
+            registration_data = {
+                'PK': f"EVENT#{event_id}",
+                'SK': f"USER#{user_id}",
+                'userId': user_id,
+                'eventId': event_id,
+                'registeredAt': datetime.now(UTC).isoformat()
+            }
+            
+            # The event may be a cached snapshot, so only the conditional
+            # writes decide whether a seat is really free
+            if event.registeredCount < event.capacity or not event.hasWaitlist:
+                try:
+                    registration = await self.registration_repository.create_registered({
+                        **registration_data,
+                        'status': 'registered',
+                        'waitlistPosition': None
+                    })
+                    await self.event_repository.invalidate(event_id)
+                    return registration
+                except CapacityExceededError:
+                    if not event.hasWaitlist:
+                        raise
+            
+            registration = await self.registration_repository.create_waitlisted({
+                **registration_data,
+                'status': 'waitlisted'
+            })
+            if registration:
+                await self.event_repository.invalidate(event_id)
+                return registration
+            
+            # A seat was freed in the meantime; re-read the counters
+            event = await self.event_repository.get_by_id(event_id, consistent_read=True)
+            if not event:
+                raise EntityNotFoundError("Event", event_id)
+        
+        raise BusinessRuleViolationError(
+            f"Could not register user {user_id} for event {event_id} due to concurrent updates, please retry"
+        )
     
-    def unregister_user(self, user_id: str, event_id: str) -> None:
+    async def register_users(self, user_ids: List[str], event_id: str) -> BatchRegistrationResult:
+        """
+        Register many users for an event at once.
+        
+        Users and existing registrations are checked with batched reads,
+        free seats and waitlist places are allocated in one pass in request
+        order, and registrations are written in chunked transactions against
+        the event counters.
+        
+        Args:
+            user_ids: User IDs in priority order (duplicates are ignored)
+            event_id: Event ID
+            
+        Returns:
+            BatchRegistrationResult with one entry per distinct user
+            
+        Raises:
+            EntityNotFoundError: If event not found
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+        event, existing_users, existing_statuses = await asyncio.gather(
+            self.event_repository.get_by_id(event_id),
+            self.user_repository.existing_ids(unique_ids),
+            self.registration_repository.get_statuses(event_id, unique_ids)
+        )
+        if not event:
+            raise EntityNotFoundError("Event", event_id)
+        
+        results = {}
+        pending = []
+        for user_id in unique_ids:
+            if user_id not in existing_users:
+                results[user_id] = BatchRegistrationItem(userId=user_id, status='user_not_found')
+            elif user_id in existing_statuses:
+                results[user_id] = BatchRegistrationItem(
+                    userId=user_id, status=f"already_{existing_statuses[user_id]}"
+                )
+            else:
+                pending.append(user_id)
+        
+        # Consecutive failed attempts at the current chunk; a chunk that is
+        # written resets it, so retries are bounded per chunk, not per batch
+        retries = 0
+        while pending:
+            free_seats = event.capacity - event.registeredCount
+            if free_seats > 0:
+                status = 'registered'
+                chunk = pending[:min(free_seats, self.BATCH_REGISTERED_CHUNK)]
+            elif event.hasWaitlist:
+                status = 'waitlisted'
+                chunk = pending[:self.BATCH_WAITLISTED_CHUNK]
+            else:
+                for user_id in pending:
+                    results[user_id] = BatchRegistrationItem(userId=user_id, status='capacity_exceeded')
+                break
+            
+            registered_at = datetime.now(UTC).isoformat()
+            registrations_data = [
+                {
+                    'PK': f"EVENT#{event_id}",
+                    'SK': f"USER#{user_id}",
+                    'userId': user_id,
+                    'eventId': event_id,
+                    'registeredAt': registered_at,
+                    'status': status,
+                    'waitlistPosition': None
+                }
+                for user_id in chunk
+            ]
+            try:
+                conflicts = await self.registration_repository.create_many(
+                    event_id, registrations_data, status, event.registeredCount
+                )
+            except CapacityExceededError:
+                # Counters moved under us; re-plan against fresh counters
+                retries += 1
+                event = await self.event_repository.get_by_id(event_id, consistent_read=True)
+                if not event:
+                    raise EntityNotFoundError("Event", event_id)
+                if retries >= self.MAX_ALLOCATION_ATTEMPTS:
+                    for user_id in pending:
+                        results[user_id] = BatchRegistrationItem(userId=user_id, status='conflict')
+                    break
+                continue
+            
+            if conflicts:
+                for user_id, existing_status in conflicts.items():
+                    results[user_id] = BatchRegistrationItem(
+                        userId=user_id, status=f"already_{existing_status}"
+                    )
+                pending = [user_id for user_id in pending if user_id not in conflicts]
+                continue
+            
+            retries = 0
+            for registration_data in registrations_data:
+                results[registration_data['userId']] = BatchRegistrationItem(
+                    userId=registration_data['userId'],
+                    status=status,
+                    waitlistPosition=registration_data['waitlistPosition']
+                )
+            if status == 'registered':
+                event = event.model_copy(update={'registeredCount': event.registeredCount + len(chunk)})
+            else:
+                event = event.model_copy(update={'waitlistCount': event.waitlistCount + len(chunk)})
+            pending = pending[len(chunk):]
+        
+        await self.event_repository.invalidate(event_id)
+        return BatchRegistrationResult(
+            eventId=event_id,
+            results=[results[user_id] for user_id in unique_ids]
+        )
+    
+    async def unregister_user(self, user_id: str, event_id: str) -> None:
         """
         Unregister a user from an event.
         
@@ -110,78 +249,91 @@ class RegistrationService:
         Raises:
             BusinessRuleViolationError: If user is not registered or waitlisted
         """
-        # Check if registration exists
-        registration = self.registration_repository.get(event_id, user_id)
-        if not registration:
+        # One transaction deletes the registration, releases its place and
+        # promotes the head of the waitlist into a released seat
+        released = await self.registration_repository.unregister(event_id, user_id)
+        if not released:
             raise BusinessRuleViolationError(
                 f"User {user_id} is not registered or waitlisted for event {event_id}"
             )
-        
-        was_registered = registration.status == 'registered'
-        
-        # Delete the registration
-        self.registration_repository.delete(event_id, user_id)
-        
-        # If user was registered and event has waitlist, promote first waitlisted user
-        if was_registered:
-            event = self.event_repository.get_by_id(event_id)
-            if event and event.hasWaitlist:
-                self.promote_from_waitlist(event_id)
+        await self.event_repository.invalidate(event_id)
     
-    def get_event_registrations(self, event_id: str) -> RegistrationStatus:
+    async def get_event_registrations(
+        self,
+        event_id: str,
+        status_filter: Optional[str] = None,
+        limit: int = 100,
+        next_token: Optional[str] = None,
+        counts_only: bool = False
+    ) -> RegistrationStatus:
         """
-        Get registration status for an event.
+        Get registration status for an event with one page of its roster.
+        
+        The counts come from the event's materialized counters. With
+        counts_only the roster is not read at all.
         
         Args:
             event_id: Event ID
+            status_filter: Only list "registered" or "waitlisted" users
+            limit: Maximum number of users on the page
+            next_token: Token from the previous page, if any
+            counts_only: Return the counts without any users
             
         Returns:
             RegistrationStatus object
             
         Raises:
             EntityNotFoundError: If event not found
+            InvalidCursorError: If next_token is malformed
         """
-        # Check if event exists
-        event = self.event_repository.get_by_id(event_id)
+        if counts_only:
+            event = await self.event_repository.get_by_id(event_id)
+            page = RosterPage()
+        else:
+            event, page = await asyncio.gather(
+                self.event_repository.get_by_id(event_id),
+                self.registration_repository.list_roster(event_id, status_filter, limit, next_token)
+            )
         if not event:
             raise EntityNotFoundError("Event", event_id)
-        
-        registrations = self.registration_repository.list_by_event(event_id)
-        
-        registered_users = [r.userId for r in registrations if r.status == 'registered']
-        waitlisted = [r for r in registrations if r.status == 'waitlisted']
-        waitlisted.sort(key=lambda x: (x.waitlistPosition or 999, x.registeredAt))
-        waitlist_users = [r.userId for r in waitlisted]
+        if page.nextPhase == 'waitlisted' and event.waitlistCount == 0:
+            # The page ended with the last registered user and nothing follows
+            page.nextToken = None
         
         return RegistrationStatus(
             eventId=event_id,
-            registeredCount=len(registered_users),
-            waitlistCount=len(waitlist_users),
-            registeredUsers=registered_users,
-            waitlistUsers=waitlist_users
+            registeredCount=event.registeredCount,
+            waitlistCount=event.waitlistCount,
+            registeredUsers=page.registeredUsers,
+            waitlistUsers=page.waitlistUsers,
+            nextToken=page.nextToken,
+            version=event.version
         )
     
-    def promote_from_waitlist(self, event_id: str) -> None:
+    async def get_event_version(self, event_id: str) -> int:
+        """
+        Get the version of an event, which changes with every registration change.
+        
+        Args:
+            event_id: Event ID
+            
+        Returns:
+            Event version
+            
+        Raises:
+            EntityNotFoundError: If event not found
+        """
+        event = await self.event_repository.get_by_id(event_id, fields=['version'])
+        if not event:
+            raise EntityNotFoundError("Event", event_id)
+        return event.version
+    
+    async def promote_from_waitlist(self, event_id: str) -> None:
         """
         Promote the first user from waitlist to registered.
         
         Args:
             event_id: Event ID
         """
-        registrations = self.registration_repository.list_by_event(event_id)
-        waitlisted = [r for r in registrations if r.status == 'waitlisted']
-        
-        if not waitlisted:
-            return
-        
-        # Sort by waitlist position or registeredAt
-        waitlisted.sort(key=lambda x: (x.waitlistPosition or 999, x.registeredAt))
-        first_waitlisted = waitlisted[0]
-        
-        # Update status to registered
-        self.registration_repository.update_status(
-            event_id,
-            first_waitlisted.userId,
-            'registered',
-            None
-        )
+        if await self.registration_repository.promote_next(event_id):
+            await self.event_repository.invalidate(event_id)
@@ -1,11 +1,14 @@
 """User API handlers."""
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import List
 
 from .service import UserService
 from ..models.user import User, UserCreate
 from ..models.event import Event
+from ..core.responses import fast_responses_enabled, json_response
 from ..core.exceptions import (
     EntityNotFoundError,
     EntityAlreadyExistsError
@@ -17,11 +20,11 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 def get_user_service() -> UserService:
     """Dependency to get UserService instance."""
-    from ..core.config import Config
+    from ..core.async_repository import AsyncRepository
+    from ..core.config import get_config
     from .repository import UserRepository
     
-    config = Config()
-    repository = UserRepository(config)
+    repository = AsyncRepository(UserRepository(get_config()))
     return UserService(repository)
 
 
@@ -35,7 +38,7 @@ async def create_user(
     """
     try:
         user_data = user.model_dump()
-        created_user = service.create_user(user_data)
+        created_user = await service.create_user(user_data)
         return created_user
     except EntityAlreadyExistsError as e:
         raise HTTPException(
@@ -58,7 +61,7 @@ async def get_user(
     Get a specific user by ID.
     """
     try:
-        user = service.get_user(user_id)
+        user = await service.get_user(user_id)
         return user
     except EntityNotFoundError as e:
         raise HTTPException(
@@ -81,35 +84,34 @@ async def get_user_registrations(user_id: str):
     """
     try:
         # Import here to avoid circular dependencies
-        from ..core.config import Config
+        from ..core.async_repository import AsyncRepository
+        from ..core.config import get_config
         from .repository import UserRepository
         from ..registrations.repository import RegistrationRepository
-        from ..events.repository import EventRepository
+        from ..events.repository import CachedEventRepository
         
-        config = Config()
-        user_repo = UserRepository(config)
-        registration_repo = RegistrationRepository(config)
-        event_repo = EventRepository(config)
+        config = get_config()
+        user_repo = AsyncRepository(UserRepository(config))
+        registration_repo = AsyncRepository(RegistrationRepository(config))
+        event_repo = AsyncRepository(CachedEventRepository(config))
         
-        # Check if user exists
-        user = user_repo.get_by_id(user_id)
+        # Check that the user exists while fetching their registrations;
+        # only the attributes used below are read
+        user, registrations = await asyncio.gather(
+            user_repo.get_by_id(user_id, fields=['userId']),
+            registration_repo.list_by_user(user_id, fields=['eventId', 'status'])
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with ID {user_id} not found"
             )
         
-        # Get user's registrations
-        registrations = registration_repo.list_by_user(user_id)
-        
-        # Get full event details for each registration
-        events = []
-        for reg in registrations:
-            if reg.status == 'registered':
-                event = event_repo.get_by_id(reg.eventId)
-                if event:
-                    events.append(event)
-        
+        # Get full event details for all registered events in batched reads
+        event_ids = [reg.eventId for reg in registrations if reg.status == 'registered']
+        events = await event_repo.get_many(event_ids)
+        if fast_responses_enabled():
+            return json_response(events, List[Event])
         return events
     except HTTPException:
         raise
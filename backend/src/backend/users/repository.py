@@ -1,11 +1,13 @@
 """User repository for database operations."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence, Set
 from datetime import datetime, UTC
 from botocore.exceptions import ClientError
 
+from ..core.batch import batch_get_items
 from ..core.config import Config
 from ..core.exceptions import EntityAlreadyExistsError
+from ..core.projection import projection, to_model
 from ..models.user import User
 
 
@@ -50,25 +52,28 @@ class UserRepository:
                 raise EntityAlreadyExistsError("User", user_data['userId'])
             raise
     
-    def get_by_id(self, user_id: str) -> Optional[User]:
+    def get_by_id(self, user_id: str, fields: Optional[Sequence[str]] = None) -> Optional[User]:
         """
         Get a user by ID.
         
         Args:
             user_id: User ID
+            fields: Only read these User fields (partial model)
             
         Returns:
             User object if found, None otherwise
         """
+        get_kwargs: Dict[str, Any] = projection(User, fields) if fields else {}
         try:
             response = self.table.get_item(
                 Key={
                     'PK': f"USER#{user_id}",
                     'SK': f"USER#{user_id}"
-                }
+                },
+                **get_kwargs
             )
             item = response.get('Item')
-            return User(**item) if item else None
+            return to_model(User, item, fields) if item else None
         except ClientError:
             return None
     
@@ -82,4 +87,31 @@ class UserRepository:
         Returns:
             True if user exists, False otherwise
         """
-        return self.get_by_id(user_id) is not None
+        return self.get_by_id(user_id, fields=['userId']) is not None
+    
+    def existing_ids(self, user_ids: List[str]) -> Set[str]:
+        """
+        Check which of several users exist, with batched reads.
+        
+        Args:
+            user_ids: User IDs to check (duplicates are allowed)
+            
+        Returns:
+            The subset of user_ids that exist
+            
+        Raises:
+            UnprocessedItemsError: If DynamoDB keeps throttling the batch
+        """
+        keys = [
+            {'PK': f"USER#{user_id}", 'SK': f"USER#{user_id}"}
+            for user_id in dict.fromkeys(user_ids)
+        ]
+        if not keys:
+            return set()
+        items = batch_get_items(
+            self.config.dynamodb_resource,
+            self.config.table_name,
+            keys,
+            projection_expression='userId'
+        )
+        return {item['userId'] for item in items}
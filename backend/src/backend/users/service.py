@@ -2,7 +2,7 @@
 
 from typing import Dict, Any, List
 
-from .repository import UserRepository
+from ..core.async_repository import AsyncRepository
 from ..core.exceptions import EntityNotFoundError
 from ..models.user import User
 from ..models.event import Event
@@ -11,16 +11,16 @@ from ..models.event import Event
 class UserService:
     """Service for User business logic."""
     
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: AsyncRepository):
         """
         Initialize UserService.
         
         Args:
-            user_repository: User repository instance
+            user_repository: Async User repository
         """
         self.user_repository = user_repository
     
-    def create_user(self, user_data: Dict[str, Any]) -> User:
+    async def create_user(self, user_data: Dict[str, Any]) -> User:
         """
         Create a new user.
         
@@ -33,9 +33,9 @@ class UserService:
         Raises:
             EntityAlreadyExistsError: If user with same ID already exists
         """
-        return self.user_repository.create(user_data)
+        return await self.user_repository.create(user_data)
     
-    def get_user(self, user_id: str) -> User:
+    async def get_user(self, user_id: str) -> User:
         """
         Get a specific user by ID.
         
@@ -48,12 +48,12 @@ class UserService:
         Raises:
             EntityNotFoundError: If user not found
         """
-        user = self.user_repository.get_by_id(user_id)
+        user = await self.user_repository.get_by_id(user_id)
         if not user:
             raise EntityNotFoundError("User", user_id)
         return user
     
-    def get_user_registrations(self, user_id: str) -> List[Event]:
+    async def get_user_registrations(self, user_id: str) -> List[Event]:
         """
         Get all events a user is registered for.
         
@@ -70,7 +70,7 @@ class UserService:
             EntityNotFoundError: If user not found
         """
         # Verify user exists
-        user = self.get_user(user_id)
+        user = await self.get_user(user_id)
         
         # This will be implemented by injecting registration repository
         # For now, return empty list as placeholder
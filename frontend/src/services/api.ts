@@ -2,6 +2,9 @@ import { Event, EventCreate, User, UserCreate, Registration, RegistrationStatus
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 
+// Largest page GET /events serves
+const EVENTS_PAGE_SIZE = 100;
+
 async function handleResponse<T>(response: Response): Promise<T> {
   if (!response.ok) {
     const error = await response.json().catch(() => ({ detail: 'An error occurred' }));
@@ -12,12 +15,19 @@ async function handleResponse<T>(response: Response): Promise<T> {
 
 // Events API
 export const eventsApi = {
+  // Follows the X-Next-Token header until every page has been read
   list: async (statusFilter?: string): Promise<Event[]> => {
-    const url = statusFilter 
-      ? `${API_BASE_URL}/events?status=${statusFilter}`
-      : `${API_BASE_URL}/events`;
-    const response = await fetch(url);
-    return handleResponse<Event[]>(response);
+    const events: Event[] = [];
+    let nextToken: string | null = null;
+    do {
+      const params = new URLSearchParams({ limit: String(EVENTS_PAGE_SIZE) });
+      if (statusFilter) params.set('status', statusFilter);
+      if (nextToken) params.set('next_token', nextToken);
+      const response = await fetch(`${API_BASE_URL}/events?${params}`);
+      events.push(...await handleResponse<Event[]>(response));
+      nextToken = response.headers.get('X-Next-Token');
+    } while (nextToken);
+    return events;
   },
 
   get: async (eventId: string): Promise<Event> => {